@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.tracker'
+
+    def ready(self):
+        # Register the AthleteSession -> AthleteWorkload signal handlers
+        from . import signals  # noqa: F401
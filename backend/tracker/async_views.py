@@ -0,0 +1,157 @@
+"""
+Async (ASGI) versions of the hot prediction endpoints.
+
+They mirror ``create_prediction``, ``latest_session`` and
+``latest_prediction`` in views.py and build the same payloads, but use the
+async ORM and await inference on ``ml_predictor.inference_pool`` (or the
+micro-batcher), so a single ASGI worker can keep many requests in flight
+while the model runs. Under WSGI they still work, one event loop per request.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import (
+    WORKLOAD_MODELS,
+    AthleteData,
+    AthleteSession,
+    InjuryPrediction,
+)
+from .prediction_cache import prediction_cache
+from .views import (
+    athlete_acwr,
+    extract_features,
+    fuse_prediction,
+    fused_cache_key,
+    latest_prediction_payload,
+    latest_session_payload,
+    prediction_payload,
+    resolve_workload_model,
+)
+
+
+def payload_response(payload):
+    # DRF's encoder, so datetimes match the sync views to the microsecond
+    return JsonResponse(payload, encoder=JSONEncoder)
+
+
+def not_found(detail):
+    return JsonResponse({"detail": detail}, status=404)
+
+
+def invalid_workload_model():
+    return JsonResponse(
+        {"error": f"model must be one of: {', '.join(WORKLOAD_MODELS)}"},
+        status=400)
+
+
+# An API endpoint like its DRF twin, which is CSRF-exempt via @api_view
+@csrf_exempt
+@require_POST
+async def create_prediction(request):
+    from .ml_predictor import ModelUnavailable, amodel_version, apredict_injury
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Body must be JSON"}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Body must be a JSON object"}, status=400)
+
+    workload_model = resolve_workload_model(request.GET.get("model"),
+                                            data.get("model"))
+    if workload_model is None:
+        return invalid_workload_model()
+
+    try:
+        athlete = await (AthleteData.objects.select_related("workload")
+                         .aget(id=data.get("athlete")))
+    except (AthleteData.DoesNotExist, ValueError, TypeError):
+        return not_found("Not found.")
+
+    features = extract_features(data)
+    strain_score = features[-1]
+
+    try:
+        version = await amodel_version()
+        # workload_state may rebuild (and write) on first use
+        cache_key = await sync_to_async(fused_cache_key)(
+            athlete, workload_model, version, features)
+        cached = prediction_cache.get(cache_key)
+
+        if cached is None:
+            # Record and cache under the version that produced it
+            ml_probability, version = await apredict_injury(*features)
+            cache_key = await sync_to_async(fused_cache_key)(
+                athlete, workload_model, version, features)
+            acwr = await sync_to_async(athlete_acwr)(athlete, workload_model)
+            final_probability, risk_level, recommendation = fuse_prediction(
+                ml_probability, acwr)
+            prediction_cache.set(cache_key, (
+                ml_probability, acwr, final_probability, risk_level,
+                recommendation))
+        else:
+            (ml_probability, acwr, final_probability,
+             risk_level, recommendation) = cached
+    except ModelUnavailable as exc:
+        return JsonResponse(
+            {"error": "Injury model unavailable", "detail": str(exc)},
+            status=503)
+
+    await InjuryPrediction.objects.acreate(
+        athlete=athlete,
+        risk_level=risk_level,
+        predicted_probability=final_probability,
+        strain_score=strain_score,
+        recommendation=recommendation,
+        model_version=version,
+    )
+
+    return payload_response(prediction_payload(
+        athlete, workload_model, strain_score, cached is not None,
+        ml_probability, acwr, final_probability, risk_level, recommendation))
+
+
+@require_GET
+async def latest_session(request, athlete_id):
+    workload_model = resolve_workload_model(request.GET.get("model"))
+    if workload_model is None:
+        return invalid_workload_model()
+
+    try:
+        athlete = await (AthleteData.objects
+                         .with_rolling_stats()
+                         .select_related("workload")
+                         .aget(id=athlete_id))
+    except AthleteData.DoesNotExist:
+        return JsonResponse({"error": "Athlete not found"}, status=404)
+
+    session = await (AthleteSession.objects.filter(athlete_id=athlete_id)
+                     .order_by("-session_date")
+                     .afirst())
+    if not session:
+        return JsonResponse({"error": "No sessions found"}, status=404)
+
+    payload = await sync_to_async(latest_session_payload)(
+        athlete, session, workload_model)
+    return payload_response(payload)
+
+
+@require_GET
+async def latest_prediction(request, athlete_id):
+    """Return the most recent prediction for an athlete, or 404."""
+    if not await AthleteData.objects.filter(id=athlete_id).aexists():
+        return not_found("No AthleteData matches the given query.")
+
+    pred = await (InjuryPrediction.objects
+                  .filter(athlete_id=athlete_id)
+                  .order_by("-created_at", "-id")
+                  .afirst())
+    if not pred:
+        return not_found("no prediction yet")
+
+    return payload_response(latest_prediction_payload(athlete_id, pred))
@@ -0,0 +1,136 @@
+"""
+Micro-batching for single-row inference.
+
+Concurrent ``predict_injury`` calls each hand their feature vector to a
+shared MicroBatcher. A worker thread collects vectors until the batch is
+full or the flush window since the oldest queued vector has passed, runs
+one batched model call and resolves every caller's future. A failing
+batch fails only its own callers; the worker keeps running.
+"""
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=2.0):
+        """
+        ``predict_fn`` maps an (n, k) array to n results (one per row).
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = deque()  # (row, future, enqueued_at)
+        self._cond = threading.Condition()
+        self._worker = None
+
+        # Metrics
+        self.batch_sizes = Counter()
+        self.items = 0
+        self.batches = 0
+        self._waits_ms = deque(maxlen=1000)
+
+    def submit(self, row):
+        """Queue one feature vector; returns a Future for its result."""
+        future = Future()
+        with self._cond:
+            self._ensure_worker()
+            self._pending.append((row, future, time.perf_counter()))
+            self._cond.notify()
+        return future
+
+    def predict(self, row, timeout=None):
+        """
+        Wait for one row's result. Raises ``concurrent.futures.TimeoutError``
+        after ``timeout`` seconds.
+        """
+        future = self.submit(row)
+        try:
+            return future.result(timeout)
+        finally:
+            future.cancel()  # no-op once resolved; otherwise skipped by _run
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="injury-micro-batcher", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        """Block until a batch is due, then pop and return it."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            size = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(size)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            started = time.perf_counter()
+            try:
+                self._predict_batch(batch)
+            except Exception:
+                logger.exception("Micro-batch of %d rows failed", len(batch))
+            finally:
+                with self._cond:
+                    self.batches += 1
+                    self.items += len(batch)
+                    self.batch_sizes[len(batch)] += 1
+                    self._waits_ms.extend(
+                        (started - enqueued_at) * 1000 for _, _, enqueued_at in batch)
+
+    def _predict_batch(self, batch):
+        try:
+            rows = np.asarray([row for row, _, _ in batch], dtype=np.float64)
+            results = self.predict_fn(rows)
+            if len(results) != len(batch):
+                raise ValueError(f"predict_fn returned {len(results)} results "
+                                 f"for {len(batch)} rows")
+        except Exception as exc:
+            for _, future, _ in batch:
+                _resolve(future.set_exception, exc)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                _resolve(future.set_result, result)
+
+    def metrics(self):
+        with self._cond:
+            waits = list(self._waits_ms)
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "queued": len(self._pending),
+                "mean_batch_size": (round(self.items / self.batches, 2)
+                                    if self.batches else None),
+                "batch_size_distribution": dict(sorted(self.batch_sizes.items())),
+                "queue_wait_ms": {
+                    "p50": round(float(np.percentile(waits, 50)), 3),
+                    "p99": round(float(np.percentile(waits, 99)), 3),
+                    "max": round(max(waits), 3),
+                } if waits else None,
+            }
+
+
+def _resolve(setter, value):
+    # The caller may have timed out and cancelled its future
+    try:
+        setter(value)
+    except InvalidStateError:
+        pass
@@ -0,0 +1,156 @@
+"""
+In-process event bus behind the Server-Sent Events stream (``/api/stream/``).
+
+Writers publish small JSON-able events after their transaction commits:
+new sessions and predictions come from ``signals.py`` and
+``ingest_sessions``, and wearable readings from the metrics uploads. Every
+subscriber has a bounded buffer. A slow client loses its oldest events, and
+is told how many, instead of growing memory or blocking writers.
+
+The bus lives in one process, so a client only sees events written through
+the worker it is connected to.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class Subscription:
+    def __init__(self, bus, athlete_id=None, team=None, maxlen=100):
+        self.bus = bus
+        self.athlete_id = athlete_id
+        self.team = team
+        self.buffer = deque(maxlen=maxlen)
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._async_waiters = set()  # (loop, asyncio.Event)
+
+    def matches(self, event):
+        # Events without an athlete/team (wearable readings) go to everyone
+        if self.athlete_id is not None and event["athlete_id"] not in (None, self.athlete_id):
+            return False
+        if self.team is not None and event["team"] not in (None, self.team):
+            return False
+        return True
+
+    def push(self, event):
+        with self._cond:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(event)
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, ready in waiters:
+            loop.call_soon_threadsafe(ready.set)
+
+    def drain(self):
+        """``(events, dropped)`` since the last drain."""
+        with self._cond:
+            events, dropped = list(self.buffer), self.dropped
+            self.buffer.clear()
+            self.dropped = 0
+        return events, dropped
+
+    def wait(self, timeout):
+        """Block until something is buffered or ``timeout`` passes, then drain."""
+        with self._cond:
+            if not self.buffer:
+                self._cond.wait(timeout)
+        return self.drain()
+
+    async def await_events(self, timeout):
+        """Async ``wait()`` for ASGI responses."""
+        ready = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), ready)
+        with self._cond:
+            if not self.buffer:
+                self._async_waiters.add(waiter)
+        try:
+            if waiter in self._async_waiters:
+                await asyncio.wait_for(ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+        return self.drain()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    def __init__(self, buffer_size=100):
+        self.buffer_size = buffer_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def has_subscribers(self):
+        return bool(self._subscriptions)
+
+    def subscribe(self, athlete_id=None, team=None):
+        subscription = Subscription(self, athlete_id, team, self.buffer_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event_type, data, athlete_id=None, team=None):
+        event = {"id": next(self._ids), "type": event_type, "data": data,
+                 "athlete_id": athlete_id, "team": team}
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription.push(event)
+
+
+bus = EventBus(buffer_size=getattr(settings, "EVENT_STREAM_BUFFER", 100))
+
+
+def format_sse(events, dropped):
+    """Encode drained events as one ``text/event-stream`` chunk."""
+    chunks = []
+    if dropped:
+        chunks.append(f"event: dropped\ndata: {json.dumps({'count': dropped})}\n\n")
+    for event in events:
+        data = json.dumps(event["data"], cls=DjangoJSONEncoder)
+        chunks.append(f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n")
+    return "".join(chunks)
+
+
+def sse_stream(heartbeat, **filters):
+    """
+    Sync (WSGI) event-stream body; unsubscribes when the client goes away.
+    The subscription starts with the first chunk, so a response that is
+    never iterated leaves nothing behind on the bus.
+    """
+    subscription = bus.subscribe(**filters)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            chunk = format_sse(*subscription.wait(heartbeat))
+            yield chunk or ": keep-alive\n\n"
+    finally:
+        subscription.close()
+
+
+async def asse_stream(heartbeat, **filters):
+    """Async (ASGI) event-stream body, so idle clients don't hold a thread."""
+    subscription = bus.subscribe(**filters)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            chunk = format_sse(*await subscription.await_events(heartbeat))
+            yield chunk or ": keep-alive\n\n"
+    finally:
+        subscription.close()
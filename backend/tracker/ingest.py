@@ -0,0 +1,257 @@
+"""
+Bulk AthleteSession ingestion (``POST /api/sessions/bulk/``).
+
+Rows arrive as JSON (a list of objects, or one list per field) or CSV and
+are validated column by column with NumPy. Valid rows are written with
+``bulk_create`` in chunked transactions; since that skips the session
+signals, each chunk then refreshes the daily rollup rows of the days it
+touched and folds its sessions into the workload state, so the cost
+follows the upload, not the athletes' history.
+"""
+import csv
+import io
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .models import (
+    AthleteDailyLoad,
+    AthleteData,
+    AthleteSession,
+    day_start,
+    session_day,
+)
+from .signals import apply_sessions_to_workload, publish_sessions
+
+# Largest values the integer columns can store
+MAX_ID = 2**63 - 1
+MAX_INT = 2**31 - 1
+
+# Field -> (kind, required, minimum, maximum); bounds are inclusive
+SESSION_COLUMNS = {
+    "athlete": ("int", True, 1, MAX_ID),
+    "session_date": ("datetime", False, None, None),
+    "heart_rate": ("float", True, 20, 250),
+    "sleep_hours": ("float", True, 0, 24),
+    "steps": ("int", True, 0, MAX_INT),
+    "calories_burned": ("float", True, 0, None),
+    "calculated_intensity": ("float", True, 0, None),
+    "fatigue_level": ("int", False, 0, MAX_INT),
+    "strain_score": ("float", True, 0, None),
+    "injury_occurred": ("bool", False, None, None),
+}
+
+MAX_ROWS = 50_000
+CHUNK_SIZE = 1_000
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", ""}
+
+
+class CSVParser(BaseParser):
+    """``text/csv`` with a header row -> {field: [values...]}."""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        try:
+            reader = csv.reader(io.StringIO(stream.read().decode(encoding)))
+            header = [name.strip() for name in next(reader)]
+            rows = list(reader)
+        except (StopIteration, UnicodeDecodeError, csv.Error) as exc:
+            raise ParseError(f"CSV parse error - {exc}")
+        return {name: [row[i] if i < len(row) else "" for row in rows]
+                for i, name in enumerate(header)}
+
+
+def to_columns(data):
+    """
+    Normalise a payload (list of row objects, or one list per field) to
+    {field: [values...]} of equal length. Raises ValueError.
+    """
+    if isinstance(data, list):
+        if not all(isinstance(row, dict) for row in data):
+            raise ValueError("Expected a list of session objects")
+        return {name: [row.get(name) for row in data] for name in SESSION_COLUMNS}
+
+    if isinstance(data, dict):
+        columns = {}
+        for name in SESSION_COLUMNS:
+            values = data.get(name)
+            if values is not None and not isinstance(values, list):
+                raise ValueError(f"Column '{name}' must be a list")
+            columns[name] = values or []
+        lengths = {len(values) for values in columns.values() if values}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        n = lengths.pop() if lengths else 0
+        return {name: values or [None] * n for name, values in columns.items()}
+
+    raise ValueError("Expected a JSON list or an object of columns")
+
+
+def _is_blank(values):
+    return np.array([v is None or (isinstance(v, str) and not v.strip())
+                     for v in values], dtype=bool)
+
+
+def _to_float(values):
+    """Column -> float64 array, NaN where a value is not a number."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def _to_bool(values):
+    """Column -> (bool array, invalid mask)."""
+    parsed = np.zeros(len(values), dtype=bool)
+    invalid = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if isinstance(value, bool) or value is None:
+            parsed[i] = bool(value)
+        elif str(value).strip().lower() in TRUE_VALUES:
+            parsed[i] = True
+        elif str(value).strip().lower() not in FALSE_VALUES:
+            invalid[i] = True
+    return parsed, invalid
+
+
+def _to_datetime(values):
+    """Column -> (object array of aware datetimes or None, invalid mask)."""
+    parsed = np.empty(len(values), dtype=object)
+    invalid = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value is None or value == "":
+            continue
+        text = str(value).strip()
+        try:
+            moment = parse_datetime(text)
+            if moment is None:
+                day = parse_date(text)
+                moment = day and day_start(day)
+        except ValueError:
+            moment = None
+        if moment is None:
+            invalid[i] = True
+            continue
+        # Naive timestamps are in the server's time zone, like the ORM's
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        parsed[i] = moment
+    return parsed, invalid
+
+
+def validate_columns(columns):
+    """
+    Check every field as a whole column. Returns ``(values, errors)``:
+    ``values`` maps field -> parsed array and has a ``valid`` row mask,
+    ``errors`` lists ``{"row": i, "errors": {field: message}}``.
+    """
+    n = len(next(iter(columns.values()), []))
+    row_errors = {}
+
+    def flag(mask, field, message):
+        for i in np.flatnonzero(mask):
+            row_errors.setdefault(int(i), {}).setdefault(field, message)
+
+    values = {}
+    for field, (kind, required, low, high) in SESSION_COLUMNS.items():
+        raw = columns[field]
+        blank = _is_blank(raw)
+        if required:
+            flag(blank, field, "This field is required.")
+
+        if kind == "datetime":
+            values[field], invalid = _to_datetime(raw)
+            flag(invalid & ~blank, field, "Invalid date/time.")
+            continue
+        if kind == "bool":
+            values[field], invalid = _to_bool(raw)
+            flag(invalid, field, "Must be true or false.")
+            continue
+
+        numbers = _to_float(raw)
+        numbers[~np.isfinite(numbers)] = np.nan
+        invalid = np.isnan(numbers) & ~blank
+        flag(invalid, field, "A valid number is required.")
+        ok = ~np.isnan(numbers)
+        if kind == "int":
+            flag(ok & (numbers != np.floor(numbers)), field,
+                 "A valid integer is required.")
+        if low is not None:
+            flag(ok & (numbers < low), field, f"Must be at least {low}.")
+        if high is not None:
+            # float(2**63 - 1) rounds up to 2**63, which is already too big
+            too_big = numbers > high if float(high) <= high else numbers >= float(high)
+            flag(ok & too_big, field, f"Must be at most {high}.")
+        values[field] = numbers
+
+    # Unknown athletes: one query for the distinct ids that passed the checks
+    athlete_ids = values["athlete"]
+    checked = ~np.isnan(athlete_ids)
+    checked[[i for i, errors in row_errors.items() if "athlete" in errors]] = False
+    candidates = {int(a) for a in athlete_ids[checked]}
+    known = set(AthleteData.objects.filter(id__in=candidates)
+                .values_list("id", flat=True))
+    unknown = checked & ~np.isin(athlete_ids, list(known))
+    flag(unknown, "athlete", "Athlete not found.")
+
+    values["valid"] = np.ones(n, dtype=bool)
+    values["valid"][list(row_errors)] = False
+    errors = [{"row": i, "errors": row_errors[i]} for i in sorted(row_errors)]
+    return values, errors
+
+
+def build_sessions(values):
+    """AthleteSession instances for the valid rows."""
+    now = timezone.now()
+    fatigue = np.nan_to_num(values["fatigue_level"], nan=0)
+    for i in np.flatnonzero(values["valid"]):
+        yield AthleteSession(
+            athlete_id=int(values["athlete"][i]),
+            session_date=values["session_date"][i] or now,
+            heart_rate=float(values["heart_rate"][i]),
+            sleep_hours=float(values["sleep_hours"][i]),
+            steps=int(values["steps"][i]),
+            calories_burned=float(values["calories_burned"][i]),
+            calculated_intensity=float(values["calculated_intensity"][i]),
+            fatigue_level=int(fatigue[i]),
+            strain_score=float(values["strain_score"][i]),
+            injury_occurred=bool(values["injury_occurred"][i]),
+        )
+
+
+def ingest_sessions(values, chunk_size=CHUNK_SIZE):
+    """
+    Insert the valid rows in chunked transactions. Each chunk refreshes the
+    daily rollup of the (athlete, day) pairs it wrote and folds its
+    sessions into the workload state in the same transaction, since
+    ``bulk_create`` skips the signals. Returns the number of sessions
+    created.
+    """
+    sessions = list(build_sessions(values))
+    created = 0
+    for offset in range(0, len(sessions), chunk_size):
+        with transaction.atomic():
+            chunk = AthleteSession.objects.bulk_create(
+                sessions[offset:offset + chunk_size])
+            # Daily rollup first: a first-time workload rebuild reads from it
+            for athlete_id, day in sorted({(s.athlete_id, session_day(s.session_date))
+                                           for s in chunk}):
+                AthleteDailyLoad.refresh(athlete_id, day)
+            apply_sessions_to_workload(chunk)
+            publish_sessions(chunk)
+        created += len(chunk)
+    return created
@@ -0,0 +1,95 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.tracker.ml_predictor import BACKENDS, ModelHolder
+from backend.tracker.models import FEATURE_FIELDS
+
+
+def max_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare latency and memory of the TensorFlow and NumPy inference "
+        "backends. Each backend is measured in its own subprocess so their "
+        "memory footprints don't mix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", choices=BACKENDS + ("both",),
+                            default="both")
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument("--batch-size", type=int, default=64)
+        parser.add_argument("--json", action="store_true",
+                            help="Print raw results as JSON (used by --backend both)")
+
+    def handle(self, *args, **options):
+        if options["backend"] != "both":
+            result = self.measure(options["backend"], options)
+            if options["json"]:
+                self.stdout.write(json.dumps(result))
+            else:
+                self.report([result])
+            return
+
+        results = []
+        for backend in BACKENDS:
+            output = subprocess.run(
+                [sys.executable, sys.argv[0], "benchmark_inference",
+                 "--backend", backend,
+                 "--iterations", str(options["iterations"]),
+                 "--batch-size", str(options["batch_size"]),
+                 "--json"],
+                capture_output=True, text=True, env=os.environ.copy(),
+            )
+            if output.returncode != 0:
+                raise CommandError(f"{backend} run failed:\n{output.stderr}")
+            results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+        self.report(results)
+
+    def measure(self, backend, options):
+        rss_before = max_rss_mb()
+        holder = ModelHolder(backend=backend)
+        holder.load()
+
+        rng = np.random.default_rng(0)
+        single = rng.normal(size=(1, len(FEATURE_FIELDS)))
+        batch = rng.normal(size=(options["batch_size"], len(FEATURE_FIELDS)))
+
+        timings = {}
+        for name, X in (("single", single), ("batch", batch)):
+            samples = []
+            for _ in range(options["iterations"]):
+                start = time.perf_counter()
+                holder.predict(X)
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = {
+                "p50_ms": round(float(np.percentile(samples, 50)), 4),
+                "p99_ms": round(float(np.percentile(samples, 99)), 4),
+            }
+
+        return {
+            "backend": backend,
+            "load_seconds": holder.load_seconds,
+            "rss_mb": round(max_rss_mb(), 1),
+            "rss_delta_mb": round(max_rss_mb() - rss_before, 1),
+            **{f"{name}_{key}": value
+               for name, stats in timings.items()
+               for key, value in stats.items()},
+        }
+
+    def report(self, results):
+        for result in results:
+            self.stdout.write(self.style.HTTP_INFO(result["backend"]))
+            for key, value in result.items():
+                if key != "backend":
+                    self.stdout.write(f"  {key}: {value}")
@@ -0,0 +1,180 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from backend.tracker import views
+from backend.tracker.workload import team_summary
+
+from backend.tracker.models import (
+    CHRONIC_WINDOW_DAYS,
+    AthleteDailyLoad,
+    AthleteData,
+    AthleteSession,
+    AthleteWorkload,
+    InjuryPrediction,
+    day_start,
+)
+
+BATCH_SIZE = 10_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large session table inside a rolled-back transaction and check "
+        "with EXPLAIN QUERY PLAN that the hot per-athlete queries use index "
+        "seeks, not table scans or temporary sorts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", type=int, default=1_000_000)
+        parser.add_argument("--athletes", type=int, default=1_000)
+        parser.add_argument("--predictions-per-athlete", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN checks require SQLite.")
+
+        with transaction.atomic():
+            athlete_id = self.seed(options)
+            failures = self.check_plans(athlete_id)
+            self.time_team_summary(athlete_id)
+            # Never keep the benchmark rows
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(
+                "Queries not using an index seek: " + ", ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All query plans use index seeks."))
+
+    def seed(self, options):
+        n_athletes = options["athletes"]
+        n_sessions = options["sessions"]
+        start = time.perf_counter()
+
+        athletes = AthleteData.objects.bulk_create(
+            AthleteData(name=f"Bench {i}", age=21, sport="Soccer",
+                        team=f"Bench {i % 20}", experience_years=3)
+            for i in range(n_athletes)
+        )
+        ids = [athlete.id for athlete in athletes]
+        now = timezone.now()
+
+        # bulk_create skips the workload signals, which is what we want here
+        for offset in range(0, n_sessions, BATCH_SIZE):
+            AthleteSession.objects.bulk_create(
+                AthleteSession(
+                    athlete_id=random.choice(ids),
+                    session_date=now - timedelta(minutes=random.randint(0, 2_000_000)),
+                    heart_rate=random.uniform(70, 160),
+                    sleep_hours=random.uniform(4, 9),
+                    steps=random.randint(2000, 15000),
+                    calories_burned=random.uniform(300, 1200),
+                    calculated_intensity=random.uniform(0.4, 1.3),
+                    strain_score=random.uniform(0, 10),
+                )
+                for _ in range(min(BATCH_SIZE, n_sessions - offset))
+            )
+
+        AthleteDailyLoad.rebuild_all()
+        # Give every athlete the workload row the signals would have built,
+        # so ANALYZE sees a realistic table and the ETag join plans are stable
+        for athlete in athletes:
+            AthleteWorkload.rebuild(athlete)
+
+        InjuryPrediction.objects.bulk_create(
+            InjuryPrediction(athlete_id=athlete_id, risk_level="low")
+            for athlete_id in ids
+            for _ in range(options["predictions_per_athlete"])
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        self.stdout.write(
+            f"Seeded {n_sessions} sessions for {n_athletes} athletes "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        return ids[len(ids) // 2]
+
+    def check_plans(self, athlete_id):
+        today = timezone.localdate()
+        queries = {
+            # Same shapes as the views / workload code
+            "latest_session": AthleteSession.objects
+            .filter(athlete_id=athlete_id)
+            .order_by("-session_date")[:1],
+            "athlete_sessions": AthleteSession.objects
+            .filter(athlete_id=athlete_id)
+            .order_by("-session_date"),
+            "athlete_history": AthleteDailyLoad.objects
+            .filter(athlete_id=athlete_id)
+            .order_by("day"),
+            "daily_load_refresh": AthleteSession.objects
+            .filter(athlete_id=athlete_id,
+                    session_date__gte=day_start(today),
+                    session_date__lt=day_start(today + timedelta(days=1))),
+            "workload_window": AthleteDailyLoad.objects
+            .filter(athlete_id=athlete_id,
+                    day__gte=today - timedelta(days=CHRONIC_WINDOW_DAYS)),
+            "latest_prediction": InjuryPrediction.objects
+            .filter(athlete_id=athlete_id)
+            .order_by("-created_at")[:1],
+        }
+        # Conditional-GET lookups run before every polled read
+        for name, etag_func in (("sessions_etag", views.athlete_sessions_etag),
+                                ("prediction_etag", views.latest_prediction_etag)):
+            # Seeding can fill the (capped) DEBUG query log, which would
+            # leave the capture empty
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                etag_func(RequestFactory().get("/"), athlete_id)
+            queries[name] = ctx.captured_queries[0]["sql"]
+
+        failures = []
+        for name, query in queries.items():
+            plan, elapsed_ms = self.explain(query)
+
+            uses_seek = "SEARCH" in plan and "USING" in plan and "INDEX" in plan
+            scans = "SCAN" in plan or "TEMP B-TREE" in plan
+            ok = uses_seek and not scans
+            if not ok:
+                failures.append(name)
+
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f"{name}: {elapsed_ms:.2f}ms"))
+            self.stdout.write(f"  {plan}")
+
+        return failures
+
+    def time_team_summary(self, athlete_id):
+        """Report the roster summary for the sample athlete's team."""
+        team = AthleteData.objects.values_list("team", flat=True).get(id=athlete_id)
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            rows = team_summary(team)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            f"team_summary: {elapsed_ms:.2f}ms for {len(rows)} athletes "
+            f"in {len(ctx.captured_queries)} queries")
+
+    def explain(self, query):
+        """(plan, elapsed_ms) for a queryset or a raw SQL string."""
+        if isinstance(query, str):
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + query)
+                plan = "\n".join(row[-1] for row in cursor.fetchall())
+                start = time.perf_counter()
+                cursor.execute(query)
+                cursor.fetchall()
+        else:
+            plan = query.explain()
+            start = time.perf_counter()
+            list(query)
+        return plan, (time.perf_counter() - start) * 1000
@@ -0,0 +1,134 @@
+import json
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.tracker.models import AthleteData
+
+# (server, path prefix): sync DRF views under gunicorn, async views under uvicorn
+SERVERS = {
+    "wsgi": ("gunicorn", "/api/"),
+    "asgi": ("uvicorn", "/api/async/"),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare /predict/ throughput of the sync views under gunicorn (WSGI) "
+        "and the async views under uvicorn (ASGI) at the same worker count. "
+        "Uses an existing athlete in the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--athlete", type=int,
+                            help="Athlete id (default: first athlete with a session)")
+        parser.add_argument("--server", choices=tuple(SERVERS) + ("both",),
+                            default="both")
+
+    def handle(self, *args, **options):
+        athlete_id = options["athlete"] or (
+            AthleteData.objects.filter(sessions__isnull=False)
+            .values_list("id", flat=True).first())
+        if athlete_id is None:
+            raise CommandError("No athlete with sessions; run generate_fake_data.")
+
+        names = SERVERS if options["server"] == "both" else [options["server"]]
+        for name in names:
+            result = self.run_server(name, athlete_id, options)
+            self.stdout.write(self.style.HTTP_INFO(name))
+            for key, value in result.items():
+                self.stdout.write(f"  {key}: {value}")
+
+    def command_for(self, name, port, workers):
+        program = SERVERS[name][0]
+        if shutil.which(program) is None:
+            raise CommandError(f"{program} is not installed.")
+        if name == "wsgi":
+            return [program, "web_project.wsgi:application",
+                    "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+                    "--log-level", "warning"]
+        return [program, "web_project.asgi:application",
+                "--port", str(port), "--workers", str(workers),
+                "--log-level", "warning"]
+
+    def run_server(self, name, athlete_id, options):
+        port = free_port()
+        server = subprocess.Popen(
+            self.command_for(name, port, options["workers"]),
+            stdout=subprocess.DEVNULL, stderr=sys.stderr)
+        base = f"http://127.0.0.1:{port}{SERVERS[name][1]}"
+        try:
+            self.wait_ready(base, athlete_id, server)
+            return self.drive(base, athlete_id, options)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    def wait_ready(self, base, athlete_id, server, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("Server exited during startup.")
+            try:
+                # Also loads + warms the model in every worker that answers
+                self.post(base, athlete_id)
+                return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.5)
+        raise CommandError("Server did not become ready.")
+
+    def post(self, base, athlete_id, strain=5.0):
+        body = json.dumps({
+            "athlete": athlete_id, "heart_rate": 140, "sleep_hours": 7,
+            "steps": 9000, "calories_burned": 700,
+            "calculated_intensity": 0.8, "strain_score": strain,
+        }).encode()
+        request = urllib.request.Request(
+            base + "predict/", data=body,
+            headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            return response.status
+
+    def drive(self, base, athlete_id, options):
+        def one(i):
+            start = time.perf_counter()
+            # Vary strain so the prediction cache doesn't answer everything
+            try:
+                status = self.post(base, athlete_id, strain=(i % 1000) / 100)
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            return status, (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            results = list(pool.map(one, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+
+        latencies = [ms for _, ms in results]
+        return {
+            "workers": options["workers"],
+            "concurrency": options["concurrency"],
+            "requests": len(results),
+            "errors": sum(status != 200 for status, _ in results),
+            "req_per_s": round(len(results) / elapsed, 1),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        }
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from backend.tracker.ml_predictor import MODEL_PATH, NUMPY_MODEL_PATH, SCALER_PATH
+from backend.tracker.numpy_model import export_npz
+
+
+class Command(BaseCommand):
+    help = "Export the Keras injury model and scaler to a NumPy .npz artifact"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=NUMPY_MODEL_PATH)
+
+    def handle(self, *args, **options):
+        import joblib
+        import tensorflow as tf
+
+        scaler = joblib.load(SCALER_PATH)
+        model = tf.keras.models.load_model(MODEL_PATH)
+        export_npz(model, scaler, options["output"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported NumPy model to {options['output']}"))
@@ -0,0 +1,53 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.tracker.ml_predictor import ML_DIR, registry
+from backend.tracker.model_registry import ARTIFACTS
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish the injury model artifacts as a new immutable registry "
+        "version and point serving processes at it, or switch to an "
+        "existing version with --activate"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source-dir", default=ML_DIR,
+                            help="Directory holding " + ", ".join(ARTIFACTS))
+        parser.add_argument("--no-activate", action="store_true",
+                            help="Publish without moving the CURRENT pointer")
+        parser.add_argument("--activate", metavar="VERSION",
+                            help="Point CURRENT at a published version (rollback)")
+        parser.add_argument("--list", action="store_true",
+                            help="List published versions")
+
+    def handle(self, *args, **options):
+        current = registry.current_version()
+
+        if options["list"]:
+            for version in registry.versions():
+                marker = "*" if version == current else " "
+                self.stdout.write(f"{marker} {version}")
+            return
+
+        if options["activate"]:
+            try:
+                registry.activate(options["activate"])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(
+                f"Activated model {options['activate']} (was {current})."))
+            return
+
+        sources = {name: os.path.join(options["source_dir"], name)
+                   for name in ARTIFACTS
+                   if os.path.exists(os.path.join(options["source_dir"], name))}
+        if not sources:
+            raise CommandError(f"No model artifacts in {options['source_dir']}")
+
+        version = registry.publish(sources, activate=not options["no_activate"])
+        state = "published" if options["no_activate"] else "published and activated"
+        self.stdout.write(self.style.SUCCESS(
+            f"Model {version} {state} ({', '.join(sorted(sources))})."))
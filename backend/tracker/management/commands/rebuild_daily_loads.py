@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from backend.tracker.models import AthleteDailyLoad
+
+
+class Command(BaseCommand):
+    help = ("Rebuild the per-athlete daily load rollup from all sessions. "
+            "Run rebuild_workload afterwards, since it reads the rollup.")
+
+    def handle(self, *args, **kwargs):
+        written = AthleteDailyLoad.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} daily load rows."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from backend.tracker.models import AthleteData, AthleteWorkload
+
+
+class Command(BaseCommand):
+    help = ("Rebuild every athlete's workload state from the daily load rollup "
+            "(see rebuild_daily_loads)")
+
+    def handle(self, *args, **kwargs):
+        count = 0
+        for athlete in AthleteData.objects.all().iterator():
+            AthleteWorkload.rebuild(athlete)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt workload state for {count} athletes."))
@@ -0,0 +1,136 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.tracker.ml_predictor import (
+    ML_DIR,
+    MODEL_PATH,
+    NUMPY_MODEL_PATH,
+    SCALER_PATH,
+    registry,
+)
+from backend.tracker.models import AthleteSession
+from backend.tracker.numpy_model import export_npz
+from backend.tracker.training_data import (
+    CHUNK_SIZE,
+    TRAINING_STATE_FILE,
+    build_injury_model,
+    load_training_arrays,
+    read_training_state,
+    standardize_in_place,
+    write_training_state,
+)
+
+
+def sessions_to_train(state, full=False):
+    """
+    ``(queryset, mode)``: every session for a full rebuild (or when there is
+    no high-water mark yet), otherwise only sessions newer than the mark.
+    """
+    sessions = AthleteSession.objects.all()
+    if full or not state:
+        return sessions, "full"
+    return sessions.filter(id__gt=state["last_session_id"]), "incremental"
+
+
+class Command(BaseCommand):
+    help = (
+        "Continue training the injury model on sessions added since the last "
+        "run (warm start, running scaler statistics), or rebuild it from "
+        "scratch with --full"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true",
+                            help="Refit the scaler and a fresh model on all sessions")
+        parser.add_argument("--epochs", type=int,
+                            help="Default: 3 incremental, 20 full")
+        parser.add_argument("--batch-size", type=int, default=16)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--min-sessions", type=int, default=1,
+                            help="Skip incremental runs with fewer new sessions")
+        parser.add_argument("--model-dir", default=ML_DIR)
+        parser.add_argument("--no-publish", action="store_true",
+                            help="Don't publish the result to the model registry")
+
+    def handle(self, *args, **options):
+        try:
+            import joblib
+            from sklearn.preprocessing import StandardScaler
+        except ImportError as exc:
+            raise CommandError(f"Retraining needs joblib and scikit-learn: {exc}")
+
+        model_dir = options["model_dir"]
+        paths = {
+            "model": os.path.join(model_dir, os.path.basename(MODEL_PATH)),
+            "scaler": os.path.join(model_dir, os.path.basename(SCALER_PATH)),
+            "numpy": os.path.join(model_dir, os.path.basename(NUMPY_MODEL_PATH)),
+            "state": os.path.join(model_dir, TRAINING_STATE_FILE),
+        }
+        state = read_training_state(paths["state"])
+        full = (options["full"]
+                or not (os.path.exists(paths["model"]) and os.path.exists(paths["scaler"])))
+        sessions, mode = sessions_to_train(state, full)
+
+        # Fix the new mark before loading, so sessions written meanwhile
+        # are picked up by the next run
+        last_id = sessions.order_by("-id").values_list("id", flat=True).first()
+        if last_id is None:
+            self.stdout.write("No new sessions; model is up to date.")
+            return
+        sessions = sessions.filter(id__lte=last_id)
+
+        start = time.perf_counter()
+        X, y = load_training_arrays(sessions, chunk_size=options["chunk_size"])
+        if mode == "incremental" and len(X) < options["min_sessions"]:
+            self.stdout.write(
+                f"Only {len(X)} new sessions (< {options['min_sessions']}); skipped.")
+            return
+
+        if mode == "full":
+            scaler = StandardScaler()
+            model = build_injury_model()
+        else:
+            import tensorflow as tf
+
+            # StandardScaler.partial_fit keeps mean, variance and the sample
+            # count, so folding in the new rows updates the running stats
+            scaler = joblib.load(paths["scaler"])
+            model = tf.keras.models.load_model(paths["model"])
+        standardize_in_place(X, scaler, chunk_size=options["chunk_size"])
+
+        epochs = options["epochs"] or (20 if mode == "full" else 3)
+        model.fit(X, y, epochs=epochs, batch_size=options["batch_size"],
+                  validation_split=0.2 if mode == "full" else 0.0, verbose=0)
+
+        os.makedirs(model_dir, exist_ok=True)
+        self.save(model, scaler, paths)
+        seen = len(X) + (0 if mode == "full" else state.get("sessions_seen", 0))
+        write_training_state(paths["state"], last_id, seen, mode)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode.capitalize()} retrain on {len(X)} sessions up to id {last_id} "
+            f"in {time.perf_counter() - start:.1f}s."))
+
+        if not options["no_publish"]:
+            # Running workers pick the new version up without a restart
+            version = registry.publish({
+                "injury_model.h5": paths["model"],
+                "scaler.pkl": paths["scaler"],
+                "injury_model.npz": paths["numpy"],
+            })
+            self.stdout.write(self.style.SUCCESS(f"Published model {version}."))
+
+    def save(self, model, scaler, paths):
+        """Write each artifact beside its target, then swap it in."""
+        import joblib
+
+        tmp_model = paths["model"].replace(".h5", ".tmp.h5")
+        model.save(tmp_model)
+        joblib.dump(scaler, paths["scaler"] + ".tmp")
+        export_npz(model, scaler, paths["numpy"] + ".tmp.npz")
+
+        os.replace(tmp_model, paths["model"])
+        os.replace(paths["scaler"] + ".tmp", paths["scaler"])
+        os.replace(paths["numpy"] + ".tmp.npz", paths["numpy"])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 16:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_injuryprediction_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AthleteWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('buckets', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('athlete', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='workload', to='tracker.athletedata')),
+            ],
+        ),
+    ]
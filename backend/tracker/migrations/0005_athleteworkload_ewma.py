@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_athleteworkload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='athleteworkload',
+            name='ewma_acute',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='athleteworkload',
+            name='ewma_chronic',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='athleteworkload',
+            name='ewma_day',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_athleteworkload_ewma'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='athletesession',
+            index=models.Index(fields=['athlete', 'session_date'], name='tracker_ses_athlete_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='injuryprediction',
+            index=models.Index(fields=['athlete', 'created_at'], name='tracker_pred_athlete_crt_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, Max, Sum
+from django.db.models.functions import TruncDate
+
+ROLLUP_METRICS = {
+    "strain": "strain_score",
+    "calories": "calories_burned",
+    "steps": "steps",
+    "heart_rate": "heart_rate",
+    "sleep": "sleep_hours",
+    "intensity": "calculated_intensity",
+}
+
+
+def populate_daily_loads(apps, schema_editor):
+    AthleteSession = apps.get_model("tracker", "AthleteSession")
+    AthleteDailyLoad = apps.get_model("tracker", "AthleteDailyLoad")
+
+    aggregates = {"session_count": Count("id")}
+    for prefix, source in ROLLUP_METRICS.items():
+        aggregates[f"{prefix}_sum"] = Sum(source)
+        aggregates[f"{prefix}_mean"] = Avg(source)
+        aggregates[f"{prefix}_max"] = Max(source)
+
+    rows = (AthleteSession.objects
+            .annotate(day=TruncDate("session_date"))
+            .order_by()
+            .values("athlete_id", "day")
+            .annotate(**aggregates))
+    AthleteDailyLoad.objects.bulk_create(
+        (AthleteDailyLoad(**row) for row in rows), batch_size=5000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_session_prediction_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AthleteDailyLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('session_count', models.IntegerField(default=0)),
+                ('strain_sum', models.FloatField(default=0)),
+                ('strain_mean', models.FloatField(default=0)),
+                ('strain_max', models.FloatField(default=0)),
+                ('calories_sum', models.FloatField(default=0)),
+                ('calories_mean', models.FloatField(default=0)),
+                ('calories_max', models.FloatField(default=0)),
+                ('steps_sum', models.IntegerField(default=0)),
+                ('steps_mean', models.FloatField(default=0)),
+                ('steps_max', models.IntegerField(default=0)),
+                ('heart_rate_sum', models.FloatField(default=0)),
+                ('heart_rate_mean', models.FloatField(default=0)),
+                ('heart_rate_max', models.FloatField(default=0)),
+                ('sleep_sum', models.FloatField(default=0)),
+                ('sleep_mean', models.FloatField(default=0)),
+                ('sleep_max', models.FloatField(default=0)),
+                ('intensity_sum', models.FloatField(default=0)),
+                ('intensity_mean', models.FloatField(default=0)),
+                ('intensity_max', models.FloatField(default=0)),
+                ('athlete', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_loads', to='tracker.athletedata')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('athlete', 'day'), name='tracker_daily_load_athlete_day')],
+            },
+        ),
+        migrations.RunPython(populate_daily_loads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_athletedailyload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='athleteworkload',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
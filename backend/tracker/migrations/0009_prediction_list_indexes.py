@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_athleteworkload_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='athletedata',
+            index=models.Index(fields=['team'], name='tracker_athlete_team_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='injuryprediction',
+            index=models.Index(fields=['created_at'], name='tracker_pred_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='injuryprediction',
+            index=models.Index(fields=['risk_level', 'created_at'], name='tracker_pred_risk_crt_idx'),
+        ),
+    ]
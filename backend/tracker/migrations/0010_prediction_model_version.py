@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_prediction_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='injuryprediction',
+            name='model_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_prediction_model_version'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='injuryprediction',
+            name='tracker_pred_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='injuryprediction',
+            name='tracker_pred_risk_crt_idx',
+        ),
+        migrations.AddIndex(
+            model_name='injuryprediction',
+            index=models.Index(fields=['created_at', 'id'], name='tracker_pred_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='injuryprediction',
+            index=models.Index(fields=['risk_level', 'created_at', 'id'], name='tracker_pred_risk_crt_id_idx'),
+        ),
+    ]
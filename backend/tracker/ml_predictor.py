@@ -1,7 +1,18 @@
+import asyncio
+import hashlib
 import os
-import joblib
-import tensorflow as tf
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
 import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .batching import MicroBatcher
+from .model_registry import ModelRegistry
+from .models import FEATURE_FIELDS
 
 # BASE_DIR = backend/
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -11,22 +22,353 @@ ML_DIR = os.path.join(os.path.dirname(BASE_DIR), "ml_models")
 
 SCALER_PATH = os.path.join(ML_DIR, "scaler.pkl")
 MODEL_PATH = os.path.join(ML_DIR, "injury_model.h5")
+NUMPY_MODEL_PATH = os.path.join(ML_DIR, "injury_model.npz")
+
+# Published, immutable model versions (see model_registry.py)
+REGISTRY_DIR = os.path.join(ML_DIR, "registry")
+
+# "tensorflow" serves the .h5 model through Keras; "numpy" serves the
+# exported .npz (see numpy_model.py / export_numpy_model) without TensorFlow
+BACKENDS = ("tensorflow", "numpy")
+
+
+class ModelUnavailable(Exception):
+    """The injury model could not be loaded in this process."""
+
+
+class ModelHolder:
+    """
+    Loads the injury model once per process, on first use or from
+    ``warm_in_background()``, and runs a dummy inference so the first real
+    request doesn't pay for graph building. Loading is guarded by a lock, so
+    concurrent first requests trigger a single load.
+
+    With a ``registry`` the holder serves the version its ``CURRENT``
+    manifest points at (or the fixed paths while nothing is published) and
+    looks at the pointer at most every ``poll_seconds``. A new version is
+    loaded and warmed on a background thread while the old one keeps
+    serving, then swapped in with a single assignment.
+
+    After a failed load, requests fail fast with the recorded error until
+    the retry delay (``retry_seconds``, doubling per failure up to
+    ``max_retry_seconds``) has passed, rather than reloading every time.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+                 backend="tensorflow", numpy_path=NUMPY_MODEL_PATH,
+                 registry=None, poll_seconds=5, retry_seconds=1,
+                 max_retry_seconds=60):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}")
+        self.backend = backend
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.numpy_path = numpy_path
+        self.registry = registry
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        # (predict, version, artifact path) replaced as one object, so a
+        # reader never pairs one version's model with another's name
+        self._served = None
+        self.state = "unloaded"  # unloaded -> loading -> ready | failed
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.loaded_at = None
+        self.failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+        # Hot swap
+        self.swaps = 0
+        self.swap_error = None
+        self._swapping = None  # version loading in the background
+        self._manifest_stamp = None
+        self._next_check = 0.0
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    @property
+    def version(self):
+        return self._served[1] if self._served else None
+
+    def load(self):
+        """Load and warm the model if needed. Raises ModelUnavailable."""
+        if self.ready:
+            return
+        self._raise_if_backing_off()
+        with self._lock:
+            if self.ready:
+                return
+            self._raise_if_backing_off()
+            self.state = "loading"
+            try:
+                version = None
+                if self.registry is not None:
+                    self._manifest_stamp = self.registry.manifest_stamp()
+                    version = self.registry.current_version()
+                served = self._load_version(version)
+            except Exception as exc:
+                self.state = "failed"
+                self.error = f"{type(exc).__name__}: {exc}"
+                delay = min(self.retry_seconds * 2 ** self.failures,
+                            self.max_retry_seconds)
+                self.failures += 1
+                self._retry_at = time.monotonic() + delay
+                raise ModelUnavailable(self.error) from exc
+
+            self._served = served
+            self.loaded_at = timezone.now()
+            self.error = None
+            self.failures = 0
+            self.state = "ready"
+
+    def _raise_if_backing_off(self):
+        if self.state == "failed" and time.monotonic() < self._retry_at:
+            raise ModelUnavailable(self.error)
+
+    def _load_version(self, version):
+        """Load and warm a registry version (None: the fixed paths)."""
+        if version is None:
+            paths = {"model": self.model_path, "scaler": self.scaler_path,
+                     "numpy": self.numpy_path}
+        else:
+            paths = {"model": self.registry.path(version, "injury_model.h5"),
+                     "scaler": self.registry.path(version, "scaler.pkl"),
+                     "numpy": self.registry.path(version, "injury_model.npz")}
+
+        start = time.perf_counter()
+        predict = self._load_backend(paths)
+        self.load_seconds = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        predict(np.zeros((1, len(FEATURE_FIELDS))))
+        self.warmup_seconds = round(time.perf_counter() - start, 3)
+
+        served_path = paths["numpy"] if self.backend == "numpy" else paths["model"]
+        return predict, version or self._artifact_version(paths), served_path
+
+    def _load_backend(self, paths):
+        """Return a callable mapping raw features (n, features) -> (n, 1)."""
+        if self.backend == "numpy":
+            from .numpy_model import NumpyInjuryModel
+
+            return NumpyInjuryModel.load(paths["numpy"]).predict
+
+        import joblib
+        import tensorflow as tf
+
+        scaler = joblib.load(paths["scaler"])
+        model = tf.keras.models.load_model(paths["model"])
+        return lambda X: model.predict(scaler.transform(X), verbose=0)
+
+    def _artifact_version(self, paths):
+        """Short content hash of the artifact files being served."""
+        files = ([paths["numpy"]] if self.backend == "numpy"
+                 else [paths["model"], paths["scaler"]])
+        digest = hashlib.sha256()
+        for path in files:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()[:12]
+
+    def check_for_update(self):
+        """
+        Start a background swap if the registry pointer has moved. Cheap
+        enough for every request: at most one stat() per ``poll_seconds``.
+        """
+        if self.registry is None or not self.ready:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.poll_seconds
+
+        stamp = self.registry.manifest_stamp()
+        if stamp is None or stamp == self._manifest_stamp:
+            return
+        version = self.registry.current_version()
+        with self._lock:
+            if self._swapping is not None:
+                return
+            if version == self.version:
+                self._manifest_stamp = stamp
+                return
+            self._swapping = version
+        threading.Thread(target=self._swap, args=(version, stamp),
+                         name="injury-model-swap", daemon=True).start()
 
-# Load model + scaler
-scaler = joblib.load(SCALER_PATH)
-model = tf.keras.models.load_model(MODEL_PATH)
+    def _swap(self, version, stamp):
+        try:
+            served = self._load_version(version)
+        except Exception as exc:
+            # Keep serving the old version; retried when the pointer moves
+            self.swap_error = f"{version}: {type(exc).__name__}: {exc}"
+        else:
+            self._served = served
+            self.loaded_at = timezone.now()
+            self.swaps += 1
+            self.swap_error = None
+
+            from .prediction_cache import prediction_cache
+            prediction_cache.clear()  # entries of the old version are dead
+        finally:
+            with self._lock:
+                self._manifest_stamp = stamp
+                self._swapping = None
+
+    def warm_in_background(self):
+        """Start loading on a daemon thread so startup isn't blocked."""
+        def warm():
+            try:
+                self.load()
+            except ModelUnavailable:
+                pass  # reported through status()
+
+        threading.Thread(target=warm, name="injury-model-warmup",
+                         daemon=True).start()
+
+    def predict(self, X):
+        """
+        ``(output, version)``, both from one snapshot of the served model,
+        so a concurrent swap can't mislabel the output.
+        """
+        self.load()
+        self.check_for_update()
+        predict, version, _ = self._served
+        return predict(X), version
+
+    def status(self):
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "backend": self.backend,
+            "version": self.version,
+            "model_path": (self._served[2] if self._served
+                           else self.numpy_path if self.backend == "numpy"
+                           else self.model_path),
+            "registry": self.registry.root if self.registry else None,
+            "swaps": self.swaps,
+            "swapping_to": self._swapping,
+            "swap_error": self.swap_error,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "loaded_at": self.loaded_at,
+            "error": self.error,
+            "failures": self.failures,
+        }
+
+
+registry = ModelRegistry(getattr(settings, "INJURY_MODEL_REGISTRY", REGISTRY_DIR))
+
+# One holder per process
+holder = ModelHolder(
+    backend=getattr(settings, "INJURY_MODEL_BACKEND", "tensorflow"),
+    registry=registry,
+    poll_seconds=getattr(settings, "INJURY_MODEL_POLL_SECONDS", 5),
+)
+
+
+def warm_up():
+    """
+    Load and warm the model in the background, unless INJURY_MODEL_WARMUP
+    is off. Called by the WSGI/ASGI entrypoints (and so runserver), not on
+    app startup, so management commands, shells and tests never load it.
+    """
+    if getattr(settings, "INJURY_MODEL_WARMUP", True):
+        holder.warm_in_background()
+
+
+def model_version():
+    """Version of the model currently served (loads it if needed)."""
+    holder.load()
+    holder.check_for_update()
+    return holder.version
+
+
+def predict_injury_batch(rows):
+    """
+    Predict injury probabilities for an (n, len(FEATURE_FIELDS)) feature
+    matrix with one scaler transform and one model call. Returns
+    ``(probabilities, version)``: a 1-D array and the model version that
+    produced it.
+    """
+    X = np.asarray(rows, dtype=np.float64).reshape(-1, len(FEATURE_FIELDS))
+
+    # Scale input + predict probabilities
+    output, version = holder.predict(X)
+    return output[:, 0].astype(np.float64), version
+
+
+def _predict_rows(rows):
+    """Batcher callback: one ``(probability, version)`` per row."""
+    probabilities, version = predict_injury_batch(rows)
+    return [(float(p), version) for p in probabilities]
+
+
+# Concurrent single predictions share model calls (see batching.py)
+batcher = MicroBatcher(
+    _predict_rows,
+    max_batch_size=getattr(settings, "INJURY_BATCH_MAX_SIZE", 32),
+    max_wait_ms=getattr(settings, "INJURY_BATCH_WINDOW_MS", 2.0),
+)
+
+
+def batch_timeout():
+    """Seconds a caller waits for its batch before giving up (503)."""
+    return getattr(settings, "INJURY_BATCH_TIMEOUT_SECONDS", 30)
 
 
 def predict_injury(heart_rate, sleep_hours, steps, calories_burned, intensity, strain_score):
+    """``(probability, model_version)`` for one feature vector."""
 
     # Prepare vector
-    X = np.array(
-        [[heart_rate, sleep_hours, steps, calories_burned, intensity, strain_score]])
-
-    # Scale input
-    X_scaled = scaler.transform(X)
+    row = [heart_rate, sleep_hours, steps, calories_burned, intensity, strain_score]
 
     # Predict probability
-    probability = float(model.predict(X_scaled)[0][0])
+    if getattr(settings, "INJURY_BATCHING_ENABLED", True):
+        try:
+            return batcher.predict(row, timeout=batch_timeout())
+        except FutureTimeoutError:
+            raise ModelUnavailable("Timed out waiting for a batched prediction")
+    return _predict_rows([row])[0]
+
+
+# Bounded pool for inference called from async views, so the event loop
+# never blocks on model loading or a forward pass
+inference_pool = ThreadPoolExecutor(
+    max_workers=getattr(settings, "INJURY_INFERENCE_WORKERS", 4),
+    thread_name_prefix="injury-inference",
+)
+
+
+async def amodel_version():
+    """Async model_version(); a cold load runs on the inference pool."""
+    if holder.ready:
+        holder.check_for_update()
+        return holder.version
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_pool, model_version)
+
+
+async def apredict_injury(heart_rate, sleep_hours, steps, calories_burned,
+                          intensity, strain_score):
+    """
+    Async predict_injury(), also returning ``(probability, model_version)``.
+    Awaits the micro-batcher's future when batching
+    is on, otherwise runs the model call on the inference pool.
+    """
+    row = [heart_rate, sleep_hours, steps, calories_burned, intensity, strain_score]
 
-    return probability
+    if getattr(settings, "INJURY_BATCHING_ENABLED", True):
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(batcher.submit(row)), batch_timeout())
+        except asyncio.TimeoutError:
+            raise ModelUnavailable("Timed out waiting for a batched prediction")
+    loop = asyncio.get_running_loop()
+    return (await loop.run_in_executor(inference_pool, _predict_rows, [row]))[0]
@@ -0,0 +1,116 @@
+"""
+Registry of immutable, versioned injury-model artifacts.
+
+    registry/
+        CURRENT              {"version": ..., "activated_at": ...}
+        <version>/           injury_model.h5, scaler.pkl, injury_model.npz
+
+A version is the content hash of its artifacts, so publishing the same
+files twice is a no-op. Versions are staged in a temporary directory and
+renamed into place, and ``CURRENT`` is replaced with ``os.replace``, so a
+reader only ever sees a complete version and a complete pointer. Serving
+processes watch ``CURRENT`` (see ``ml_predictor.ModelHolder``) and swap to
+a new version without restarting.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from django.utils import timezone
+
+ARTIFACTS = ("injury_model.h5", "scaler.pkl", "injury_model.npz")
+MANIFEST = "CURRENT"
+
+
+class ModelRegistry:
+    def __init__(self, root):
+        self.root = root
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, MANIFEST)
+
+    def path(self, version, artifact):
+        return os.path.join(self.root, version, artifact)
+
+    def versions(self):
+        """Published versions, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        versions = [name for name in os.listdir(self.root)
+                    if not name.startswith(".")
+                    and os.path.isdir(os.path.join(self.root, name))]
+        return sorted(versions, key=lambda name: os.path.getmtime(
+            os.path.join(self.root, name)))
+
+    def manifest_stamp(self):
+        """
+        ``(inode, mtime_ns)`` of ``CURRENT`` (a cheap change check), or
+        None. Every activation renames a fresh file into place, so the inode
+        changes even when two re-points land within one mtime tick.
+        """
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def current(self):
+        """The active manifest, or None if nothing was ever activated."""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def current_version(self):
+        manifest = self.current()
+        return manifest["version"] if manifest else None
+
+    def publish(self, sources, activate=True):
+        """
+        Copy ``sources`` (artifact name -> file path; any subset of
+        ARTIFACTS) into a new version and return its name.
+        """
+        unknown = set(sources) - set(ARTIFACTS)
+        if unknown:
+            raise ValueError(f"Unknown artifacts: {', '.join(sorted(unknown))}")
+
+        digest = hashlib.sha256()
+        for name in sorted(sources):
+            digest.update(name.encode())
+            with open(sources[name], "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        version = digest.hexdigest()[:12]
+
+        target = os.path.join(self.root, version)
+        if not os.path.isdir(target):
+            os.makedirs(self.root, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=".incoming-", dir=self.root)
+            try:
+                for name, source in sources.items():
+                    shutil.copyfile(source, os.path.join(staging, name))
+                os.rename(staging, target)
+            except OSError:
+                shutil.rmtree(staging, ignore_errors=True)
+                if not os.path.isdir(target):  # not a concurrent publish
+                    raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """Point ``CURRENT`` at an already published version."""
+        if not os.path.isdir(os.path.join(self.root, version)):
+            raise ValueError(f"Unknown model version: {version}")
+        manifest = {"version": version,
+                    "activated_at": timezone.now().isoformat()}
+        fd, tmp_path = tempfile.mkstemp(prefix=".manifest-", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+        return manifest
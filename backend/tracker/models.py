@@ -1,9 +1,104 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, Count, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round, TruncDate
+from django.utils.functional import cached_property
 import datetime
 from datetime import timedelta
+from django.utils import timezone
 from django.utils.timezone import now
 
 
+# Workload windows in days. Sessions older than CHRONIC_WINDOW_DAYS are
+# dropped from AthleteWorkload.buckets, so the stored state never grows
+# with an athlete's history.
+ACUTE_WINDOW_DAYS = 7
+CHRONIC_WINDOW_DAYS = 28
+
+# EWMA decay factors, 2 / (N + 1) for N-day acute and chronic spans
+EWMA_ACUTE_DECAY = 2 / (ACUTE_WINDOW_DAYS + 1)
+EWMA_CHRONIC_DECAY = 2 / (CHRONIC_WINDOW_DAYS + 1)
+
+# Selectable per request through the ``model`` parameter
+WORKLOAD_MODELS = ("window", "ewma")
+
+SLEEP_TARGET_HOURS = 7.5  # Option B: your chosen target
+
+
+def day_start(day):
+    """
+    Aware datetime at the start of ``day``. Filter with
+    ``session_date__gte=day_start(day)`` rather than ``session_date__date__gte``
+    so the (athlete, session_date) index can be used.
+    """
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def session_day(value):
+    """Calendar day of a session timestamp, matching ``__date`` lookups."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+# Rolling-average name -> AthleteSession field it averages
+ROLLING_AVERAGES = {
+    "avg_heart_rate": "heart_rate",
+    "avg_sleep_hours": "sleep_hours",
+    "avg_steps": "steps",
+    "avg_calories_burned": "calories_burned",
+    "avg_intensity": "calculated_intensity",
+    "avg_strain": "strain_score",
+}
+ROLLING_WINDOW = 5
+
+# Injury model input layout: AthleteSession fields, in column order. Shared
+# by the views, ml_predictor, training_data and train_model.py.
+FEATURE_FIELDS = (
+    "heart_rate",
+    "sleep_hours",
+    "steps",
+    "calories_burned",
+    "calculated_intensity",
+    "strain_score",
+)
+
+# AthleteDailyLoad field prefix -> AthleteSession field it rolls up
+ROLLUP_METRICS = {
+    "strain": "strain_score",
+    "calories": "calories_burned",
+    "steps": "steps",
+    "heart_rate": "heart_rate",
+    "sleep": "sleep_hours",
+    "intensity": "calculated_intensity",
+}
+
+
+class AthleteDataQuerySet(models.QuerySet):
+    def with_rolling_stats(self, n=ROLLING_WINDOW):
+        """
+        Annotate each athlete with the ``avg_*`` averages of their last ``n``
+        sessions, all computed inside the same SELECT.
+        """
+        last_ids = AthleteSession.objects.filter(
+            athlete=OuterRef(OuterRef("pk"))
+        ).order_by("-session_date", "-id").values("id")[:n]
+
+        annotations = {}
+        for name, field in ROLLING_AVERAGES.items():
+            average = (AthleteSession.objects
+                       .filter(id__in=Subquery(last_ids))
+                       .order_by()
+                       .values("athlete")
+                       .annotate(value=Avg(field))
+                       .values("value"))
+            annotations[name] = Round(
+                Coalesce(Subquery(average), Value(0.0),
+                         output_field=models.FloatField()),
+                2,
+            )
+        return self.annotate(**annotations)
+
+
 class AthleteData(models.Model):
     name = models.CharField(max_length=100)
     age = models.IntegerField()
@@ -20,6 +115,13 @@ class AthleteData(models.Model):
     steps = models.IntegerField(default=0)
     fatigue_level = models.IntegerField(default=0)
 
+    objects = AthleteDataQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["team"], name="tracker_athlete_team_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -27,47 +129,44 @@ class AthleteData(models.Model):
     def last_five_sessions(self):
         return self.sessions.order_by("-session_date")[:5]
 
-    @property
+    @cached_property
+    def _rolling_stats(self):
+        """
+        Fallback for instances loaded without ``with_rolling_stats()``:
+        all six averages in one aggregate query.
+        """
+        last_ids = self.sessions.order_by(
+            "-session_date", "-id").values("id")[:ROLLING_WINDOW]
+        stats = AthleteSession.objects.filter(id__in=Subquery(last_ids)).aggregate(
+            **{name: Avg(field) for name, field in ROLLING_AVERAGES.items()}
+        )
+        return {name: round(value or 0, 2) for name, value in stats.items()}
+
+    # These are cached properties rather than plain ones so that the
+    # annotations from with_rolling_stats() can take their place.
+    @cached_property
     def avg_heart_rate(self):
-        sessions = self.last_five_sessions
-        if not sessions:
-            return 0
-        return round(sum(s.heart_rate for s in sessions) / len(sessions), 2)
+        return self._rolling_stats["avg_heart_rate"]
 
-    @property
+    @cached_property
     def avg_sleep_hours(self):
-        sessions = self.last_five_sessions
-        if not sessions:
-            return 0
-        return round(sum(s.sleep_hours for s in sessions) / len(sessions), 2)
+        return self._rolling_stats["avg_sleep_hours"]
 
-    @property
+    @cached_property
     def avg_steps(self):
-        sessions = self.last_five_sessions
-        if not sessions:
-            return 0
-        return round(sum(s.steps for s in sessions) / len(sessions), 2)
+        return self._rolling_stats["avg_steps"]
 
-    @property
+    @cached_property
     def avg_calories_burned(self):
-        sessions = self.last_five_sessions
-        if not sessions:
-            return 0
-        return round(sum(s.calories_burned for s in sessions) / len(sessions), 2)
+        return self._rolling_stats["avg_calories_burned"]
 
-    @property
+    @cached_property
     def avg_intensity(self):
-        sessions = self.last_five_sessions
-        if not sessions:
-            return 0
-        return round(sum(s.calculated_intensity for s in sessions) / len(sessions), 2)
+        return self._rolling_stats["avg_intensity"]
 
-    @property
+    @cached_property
     def avg_strain(self):
-        sessions = self.last_five_sessions
-        if not sessions:
-            return 0
-        return round(sum(s.strain_score for s in sessions) / len(sessions), 2)
+        return self._rolling_stats["avg_strain"]
 
     @property
     def last_five_averages(self):
@@ -75,53 +174,72 @@ class AthleteData(models.Model):
         Returns a dict of rolling averages from last five sessions.
         Used by latest_session endpoint to attach summary metrics.
         """
-        return {
-            "avg_heart_rate": self.avg_heart_rate,
-            "avg_sleep_hours": self.avg_sleep_hours,
-            "avg_steps": self.avg_steps,
-            "avg_calories_burned": self.avg_calories_burned,
-            "avg_intensity": self.avg_intensity,
-            "avg_strain": self.avg_strain,
-        }
+        return {name: getattr(self, name) for name in ROLLING_AVERAGES}
+
+    @property
+    def workload_state(self):
+        """
+        The athlete's maintained AthleteWorkload row, rebuilt from the
+        trailing sessions the first time it is needed.
+        """
+        try:
+            return self.workload
+        except AthleteWorkload.DoesNotExist:
+            return AthleteWorkload.rebuild(self)
 
     @property
     def acute_load(self):
         """
         Sum of strain scores for the last 7 days (short-term load).
         """
-        last_week = now() - timedelta(days=7)
-        sessions = self.sessions.filter(session_date__gte=last_week)
-        if not sessions:
+        strain, count, _ = self.workload_state.totals(ACUTE_WINDOW_DAYS)
+        if not count:
             return 0
-        return round(sum(s.strain_score for s in sessions), 2)
-
+        return round(strain, 2)
 
-@property
-def chronic_load(self):
-    """
-    Average weekly load for the past 28 days (long-term load).
-    """
-    last_month = now() - timedelta(days=28)
-    sessions = self.sessions.filter(session_date__gte=last_month)
-    if not sessions:
-        return 1  # avoid division by zero
+    @property
+    def chronic_load(self):
+        """
+        Average weekly load for the past 28 days (long-term load).
+        """
+        strain, count, _ = self.workload_state.totals(CHRONIC_WINDOW_DAYS)
+        if not count:
+            return 1  # avoid division by zero
 
-    weekly_avg = sum(s.strain_score for s in sessions) / 4
-    return round(weekly_avg, 2)
+        weekly_avg = strain / 4
+        return round(weekly_avg, 2)
 
+    @property
+    def acwr(self):
+        """
+        Acute:Chronic Workload Ratio
+        ACWR = acute_load / chronic_load
+        Safe Zone: 0.8 - 1.3
+        Danger Zone: >1.5
+        Underloaded: <0.8
+        """
+        chronic = self.chronic_load
+        if chronic == 0:
+            return 1.0
+        return round(self.acute_load / chronic, 2)
 
-@property
-def acwr(self):
-    """
-    Acute:Chronic Workload Ratio
-    ACWR = acute_load / chronic_load
-    Safe Zone: 0.8 - 1.3
-    Danger Zone: >1.5
-    Underloaded: <0.8
-    """
-    if self.chronic_load == 0:
-        return 1.0
-    return round(self.acute_load / self.chronic_load, 2)
+    def load_metrics(self, model="window"):
+        """
+        Acute load, chronic load and ACWR from either the rolling-window
+        model or the EWMA model (see WORKLOAD_MODELS).
+        """
+        if model == "ewma":
+            acute, chronic = self.workload_state.ewma()
+            return {
+                "acute_load": round(acute, 2),
+                "chronic_load": round(chronic, 2),
+                "acwr": round(acute / chronic, 2) if chronic > 0 else 1.0,
+            }
+        return {
+            "acute_load": self.acute_load,
+            "chronic_load": self.chronic_load,
+            "acwr": self.acwr,
+        }
 
 
 class AthleteSession(models.Model):
@@ -142,9 +260,297 @@ class AthleteSession(models.Model):
     #  ML training later
     injury_occurred = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["athlete", "session_date"],
+                         name="tracker_ses_athlete_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.athlete.name} – Session on {self.session_date.date()}"
 
+    def save(self, *args, **kwargs):
+        # Keep the row and its AthleteWorkload update (post_save) together.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class AthleteDailyLoad(models.Model):
+    """
+    Per-athlete, per-day rollup of AthleteSession.
+
+    Refreshed for the affected day on every session write (see
+    ``signals.py``) and rebuilt in bulk by the ``rebuild_daily_loads``
+    command. History and workload reads use it so that long histories cost
+    one row per day rather than one per session.
+    """
+    athlete = models.ForeignKey(
+        AthleteData, on_delete=models.CASCADE, related_name="daily_loads"
+    )
+    day = models.DateField()
+    session_count = models.IntegerField(default=0)
+
+    strain_sum = models.FloatField(default=0)
+    strain_mean = models.FloatField(default=0)
+    strain_max = models.FloatField(default=0)
+
+    calories_sum = models.FloatField(default=0)
+    calories_mean = models.FloatField(default=0)
+    calories_max = models.FloatField(default=0)
+
+    steps_sum = models.IntegerField(default=0)
+    steps_mean = models.FloatField(default=0)
+    steps_max = models.IntegerField(default=0)
+
+    heart_rate_sum = models.FloatField(default=0)
+    heart_rate_mean = models.FloatField(default=0)
+    heart_rate_max = models.FloatField(default=0)
+
+    sleep_sum = models.FloatField(default=0)
+    sleep_mean = models.FloatField(default=0)
+    sleep_max = models.FloatField(default=0)
+
+    intensity_sum = models.FloatField(default=0)
+    intensity_mean = models.FloatField(default=0)
+    intensity_max = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["athlete", "day"],
+                                    name="tracker_daily_load_athlete_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.athlete.name} – {self.day}"
+
+    @staticmethod
+    def aggregates():
+        """Aggregate expressions producing every rollup field."""
+        fields = {"session_count": Count("id")}
+        for prefix, source in ROLLUP_METRICS.items():
+            fields[f"{prefix}_sum"] = Sum(source)
+            fields[f"{prefix}_mean"] = Avg(source)
+            fields[f"{prefix}_max"] = Max(source)
+        return fields
+
+    @classmethod
+    def refresh(cls, athlete_id, day):
+        """
+        Recompute one athlete-day from its sessions. Deletes the row when
+        the day has no sessions left.
+        """
+        stats = AthleteSession.objects.filter(
+            athlete_id=athlete_id,
+            session_date__gte=day_start(day),
+            session_date__lt=day_start(day + timedelta(days=1)),
+        ).aggregate(**cls.aggregates())
+
+        if not stats["session_count"]:
+            cls.objects.filter(athlete_id=athlete_id, day=day).delete()
+            return None
+
+        row, _ = cls.objects.update_or_create(
+            athlete_id=athlete_id, day=day, defaults=stats
+        )
+        return row
+
+    @classmethod
+    def rebuild_all(cls, batch_size=5000, athlete_ids=None):
+        """
+        Recreate every rollup row (or only those of ``athlete_ids``) from the
+        session table with one grouped query. Returns the number of rows
+        written.
+        """
+        sessions = AthleteSession.objects.all()
+        existing = cls.objects.all()
+        if athlete_ids is not None:
+            sessions = sessions.filter(athlete_id__in=athlete_ids)
+            existing = existing.filter(athlete_id__in=athlete_ids)
+
+        rows = (sessions
+                .annotate(day=TruncDate("session_date"))
+                .order_by()
+                .values("athlete_id", "day")
+                .annotate(**cls.aggregates())
+                .iterator(chunk_size=batch_size))
+
+        written = 0
+        with transaction.atomic():
+            existing.delete()
+            batch = []
+            for row in rows:
+                batch.append(cls(**row))
+                if len(batch) >= batch_size:
+                    cls.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            cls.objects.bulk_create(batch)
+            written += len(batch)
+        return written
+
+
+class AthleteWorkload(models.Model):
+    """
+    Per-athlete daily strain/sleep totals for the trailing chronic window.
+
+    ``buckets`` maps a day ordinal (as a string) to
+    ``[strain_sum, session_count, sleep_sum]``. It is kept up to date by the
+    AthleteSession signals in ``signals.py``, so workload reads are a single
+    row lookup no matter how many sessions the athlete has.
+
+    The ``ewma_*`` fields hold the alternative exponentially weighted model,
+    which covers the athlete's whole history in constant space.
+    """
+    athlete = models.OneToOneField(
+        AthleteData, on_delete=models.CASCADE, related_name="workload"
+    )
+    buckets = models.JSONField(default=dict)
+
+    # Exponentially weighted daily strain, as of ewma_day
+    ewma_acute = models.FloatField(default=0.0)
+    ewma_chronic = models.FloatField(default=0.0)
+    ewma_day = models.DateField(null=True, blank=True)
+
+    # Bumped on every change; part of the prediction cache key
+    version = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.athlete.name} workload"
+
+    def totals(self, days, today=None):
+        """
+        Return ``(strain_sum, session_count, sleep_sum)`` for sessions dated
+        ``days`` days ago or later.
+        """
+        today = today or timezone.localdate()
+        since = (today - timedelta(days=days)).toordinal()
+        strain = sleep = 0.0
+        count = 0
+        for key, (day_strain, day_count, day_sleep) in self.buckets.items():
+            if int(key) >= since:
+                strain += day_strain
+                count += day_count
+                sleep += day_sleep
+        return strain, count, sleep
+
+    def apply(self, day, strain_score, sleep_hours, sign=1, today=None):
+        """
+        Add (``sign=1``) or remove (``sign=-1``) one session from both the
+        window buckets and the EWMA loads.
+        """
+        self._apply_bucket(day, strain_score, sleep_hours, sign, today)
+        self._fold_ewma(day, sign * strain_score)
+        self.version += 1
+
+    def ewma(self, today=None):
+        """
+        Return ``(acute, chronic)`` exponentially weighted daily loads as of
+        ``today`` (or as of the latest session day, if that is later).
+        """
+        if self.ewma_day is None:
+            return 0.0, 0.0
+        today = today or timezone.localdate()
+        gap = max((today - self.ewma_day).days, 0)
+        return (
+            self.ewma_acute * (1 - EWMA_ACUTE_DECAY) ** gap,
+            self.ewma_chronic * (1 - EWMA_CHRONIC_DECAY) ** gap,
+        )
+
+    def _fold_ewma(self, day, load):
+        """
+        Fold ``load`` on ``day`` into the EWMA state in O(1).
+
+        The EWMA is linear in the daily loads, so a session on any day
+        (including late arrivals and deletions) contributes
+        ``decay * load * (1 - decay) ** age`` where ``age`` is its distance
+        from ``ewma_day``.
+        """
+        if self.ewma_day is None:
+            self.ewma_day = day
+        elif day > self.ewma_day:
+            gap = (day - self.ewma_day).days
+            self.ewma_acute *= (1 - EWMA_ACUTE_DECAY) ** gap
+            self.ewma_chronic *= (1 - EWMA_CHRONIC_DECAY) ** gap
+            self.ewma_day = day
+
+        age = (self.ewma_day - day).days
+        self.ewma_acute += EWMA_ACUTE_DECAY * load * (1 - EWMA_ACUTE_DECAY) ** age
+        self.ewma_chronic += (
+            EWMA_CHRONIC_DECAY * load * (1 - EWMA_CHRONIC_DECAY) ** age
+        )
+
+    def _apply_bucket(self, day, strain_score, sleep_hours, sign=1, today=None):
+        """
+        Add or remove one session from its day bucket. Days outside the
+        chronic window are ignored.
+        """
+        today = today or timezone.localdate()
+        horizon = (today - timedelta(days=CHRONIC_WINDOW_DAYS)).toordinal()
+
+        # Drop days that have aged out of every window
+        self.buckets = {
+            key: value for key, value in self.buckets.items()
+            if int(key) >= horizon
+        }
+
+        ordinal = day.toordinal()
+        if ordinal < horizon:
+            return
+
+        key = str(ordinal)
+        strain, count, sleep = self.buckets.get(key, [0.0, 0, 0.0])
+        count += sign
+        if count <= 0:
+            self.buckets.pop(key, None)
+        else:
+            self.buckets[key] = [
+                strain + sign * strain_score,
+                count,
+                sleep + sign * sleep_hours,
+            ]
+
+    @classmethod
+    def rebuild(cls, athlete):
+        """
+        Recompute an athlete's buckets and EWMA loads from their
+        AthleteDailyLoad rows (one per day, refreshed before this runs on
+        every session write). Used for backfill and after writes that skip
+        signals (``bulk_create``, ``QuerySet.update``).
+        """
+        today = timezone.localdate()
+        horizon = today - timedelta(days=CHRONIC_WINDOW_DAYS)
+        state = cls(buckets={})
+        days = (AthleteDailyLoad.objects
+                .filter(athlete_id=athlete.pk)
+                .order_by("day")
+                .values_list("day", "session_count", "strain_sum", "sleep_sum"))
+        for day, session_count, strain_sum, sleep_sum in days:
+            if day >= horizon:
+                state.buckets[str(day.toordinal())] = [
+                    strain_sum, session_count, sleep_sum]
+            state._fold_ewma(day, strain_sum)
+
+        previous_version = (cls.objects
+                            .filter(athlete_id=athlete.pk)
+                            .values_list("version", flat=True)
+                            .first())
+
+        state, _ = cls.objects.update_or_create(
+            athlete=athlete,
+            defaults={
+                # A first build is version 0, the version the ETags in
+                # views.py assume for a row that doesn't exist yet
+                "version": 0 if previous_version is None else previous_version + 1,
+                "buckets": state.buckets,
+                "ewma_acute": state.ewma_acute,
+                "ewma_chronic": state.ewma_chronic,
+                "ewma_day": state.ewma_day,
+            },
+        )
+        return state
+
 
 class InjuryPrediction(models.Model):
     athlete = models.ForeignKey(AthleteData, on_delete=models.CASCADE)
@@ -153,6 +559,21 @@ class InjuryPrediction(models.Model):
     strain_score = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
     recommendation = models.TextField(default="", blank=True)
+    # Registry version (or artifact hash) of the model that scored it;
+    # blank for predictions made before versions were recorded
+    model_version = models.CharField(max_length=64, default="", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["athlete", "created_at"],
+                         name="tracker_pred_athlete_crt_idx"),
+            # Prediction list: newest first (id breaks ties), optionally by
+            # risk level
+            models.Index(fields=["created_at", "id"],
+                         name="tracker_pred_created_id_idx"),
+            models.Index(fields=["risk_level", "created_at", "id"],
+                         name="tracker_pred_risk_crt_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.athlete.name} - {self.risk_level}"
@@ -0,0 +1,73 @@
+"""
+Pure-NumPy inference for the dense injury model.
+
+``export_npz`` writes the Keras layer weights and the StandardScaler
+statistics into one ``.npz`` file. ``NumpyInjuryModel`` reads it back,
+folds the scaler into the first layer and serves predictions without
+importing TensorFlow.
+"""
+import numpy as np
+
+from .models import FEATURE_FIELDS
+
+ACTIVATIONS = {
+    "relu": lambda x: np.maximum(x, 0.0),
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "linear": lambda x: x,
+}
+
+
+def export_npz(model, scaler, path):
+    """Write a Keras Sequential of Dense layers plus its scaler to ``path``."""
+    arrays = {
+        "feature_fields": np.array(FEATURE_FIELDS),
+        "scaler_mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64),
+    }
+    activations = []
+    for i, layer in enumerate(model.layers):
+        kernel, bias = layer.get_weights()
+        arrays[f"kernel_{i}"] = kernel.astype(np.float64)
+        arrays[f"bias_{i}"] = bias.astype(np.float64)
+        activations.append(layer.get_config()["activation"])
+    arrays["activations"] = np.array(activations)
+
+    np.savez(path, **arrays)
+
+
+class NumpyInjuryModel:
+    """Forward pass over the exported layers, with scaling folded in."""
+
+    def __init__(self, layers):
+        # [(kernel, bias, activation_fn), ...]
+        self.layers = layers
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            activations = [str(a) for a in data["activations"]]
+            kernels = [data[f"kernel_{i}"] for i in range(len(activations))]
+            biases = [data[f"bias_{i}"] for i in range(len(activations))]
+            mean, scale = data["scaler_mean"], data["scaler_scale"]
+            fields = (tuple(str(f) for f in data["feature_fields"])
+                      if "feature_fields" in data.files else FEATURE_FIELDS)
+        if fields != FEATURE_FIELDS:
+            raise ValueError(f"{path} was exported for features {fields}, "
+                             f"expected {FEATURE_FIELDS}")
+
+        # ((x - mean) / scale) @ W + b == x @ (W / scale) + (b - (mean / scale) @ W)
+        first = kernels[0]
+        kernels[0] = first / scale[:, None]
+        biases[0] = biases[0] - (mean / scale) @ first
+
+        return cls([
+            (kernel, bias, ACTIVATIONS[activation])
+            for kernel, bias, activation in zip(kernels, biases, activations)
+        ])
+
+    def predict(self, X):
+        """Raw (unscaled) feature rows (n, features) -> probabilities (n, 1)."""
+        out = np.asarray(X, dtype=np.float64)
+        for kernel, bias, activation in self.layers:
+            out = activation(out @ kernel + bias)
+        return out
@@ -0,0 +1,92 @@
+"""
+Keyset pagination and query-string filters for the per-athlete time series.
+
+Pagination is opt-in: a request with ``?limit=`` or ``?cursor=`` gets a
+``{"next", "previous", "results"}`` page, anything else keeps the plain
+list response the dashboard reads. Cursors seek on the ordering column
+through the (athlete, date) indexes, so deep pages cost the same as the
+first one.
+"""
+from datetime import date, timedelta
+
+from rest_framework.pagination import CursorPagination
+
+from .models import day_start
+
+
+class TimeSeriesCursorPagination(CursorPagination):
+    page_size = 100
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+
+class SessionCursorPagination(TimeSeriesCursorPagination):
+    ordering = "-session_date"  # newest first
+
+
+class HistoryCursorPagination(TimeSeriesCursorPagination):
+    ordering = "day"  # oldest first, as charted
+
+
+class PredictionCursorPagination(CursorPagination):
+    """
+    Always on for the prediction list, newest first. ``id`` breaks ties, so
+    predictions sharing a timestamp are neither skipped nor repeated.
+    """
+    page_size = 50
+    page_size_query_param = "limit"
+    max_page_size = 500
+    ordering = ("-created_at", "-id")
+
+
+class QueryParamError(ValueError):
+    """A filter query parameter could not be parsed."""
+
+
+def parse_date_range(request):
+    """``?from=`` and ``?to=`` as inclusive dates (YYYY-MM-DD), or None."""
+    bounds = []
+    for name in ("from", "to"):
+        value = request.query_params.get(name)
+        try:
+            bounds.append(date.fromisoformat(value) if value else None)
+        except ValueError:
+            raise QueryParamError(f"'{name}' must be a date (YYYY-MM-DD)")
+    return tuple(bounds)
+
+
+def filter_date_range(queryset, request, field):
+    """
+    Apply ``?from=``/``?to=`` to ``queryset``. ``field`` is a DateField, or
+    a DateTimeField compared against local day boundaries.
+    """
+    start, end = parse_date_range(request)
+    is_datetime = queryset.model._meta.get_field(field).get_internal_type() == "DateTimeField"
+    if start:
+        queryset = queryset.filter(
+            **{f"{field}__gte": day_start(start) if is_datetime else start})
+    if end:
+        queryset = queryset.filter(
+            **{f"{field}__lt": day_start(end + timedelta(days=1)) if is_datetime
+               else end + timedelta(days=1)})
+    return queryset
+
+
+def requested_fields(request, available):
+    """
+    ``?fields=a,b`` validated against ``available``; None means all of them.
+    """
+    value = request.query_params.get("fields")
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise QueryParamError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available: {', '.join(available)}")
+    return fields
@@ -0,0 +1,73 @@
+"""
+Process-local LRU + TTL cache for fused injury predictions.
+
+Keys include the model artifact version and the athlete's workload-state
+version, so swapping the model or recording a new session makes older
+entries unreachable; they then age out through the LRU/TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class PredictionCache:
+    def __init__(self, maxsize=1024, ttl_seconds=300):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(athlete_id, workload_model, workload_version, model_version,
+                 features):
+        rounded = tuple(round(float(value), 2) for value in features)
+        return (athlete_id, workload_model, workload_version, model_version,
+                rounded)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+prediction_cache = PredictionCache(
+    maxsize=getattr(settings, "INJURY_PREDICTION_CACHE_SIZE", 1024),
+    ttl_seconds=getattr(settings, "INJURY_PREDICTION_CACHE_TTL", 300),
+)
@@ -0,0 +1,116 @@
+"""
+Columnar renderers for the time-series endpoints (history, sessions, bulk
+workload).
+
+Selected through the ``Accept`` header (or ``?format=``). When one of them
+is chosen the view builds one array per field straight from the query
+instead of a list of row dicts, and the renderer only encodes it:
+
+- ``application/vnd.tracker.columns+json`` (``?format=columns``): compact JSON
+- ``application/msgpack`` (``?format=msgpack``): needs ``msgpack``
+- ``application/vnd.apache.arrow.stream`` (``?format=arrow``): Arrow IPC
+  stream, needs ``pyarrow``
+
+The binary renderers are only offered when their package is installed.
+Paginated responses keep ``next``/``previous`` next to the columns (for
+Arrow, in the schema metadata).
+"""
+import datetime
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional
+    pa = None
+
+
+def wants_columns(request):
+    """True if content negotiation picked a columnar renderer."""
+    return getattr(getattr(request, "accepted_renderer", None), "columnar", False)
+
+
+def rows_to_columns(rows, fields, source=None):
+    """
+    Pivot row dicts (e.g. from ``.values()``) into one list per field.
+    ``source`` optionally maps an output field to its key in the rows.
+    """
+    rows = list(rows)
+    source = source or {}
+    return {name: [row[source.get(name, name)] for row in rows]
+            for name in fields}
+
+
+def split_columns(data):
+    """(columns, metadata) for a plain or paginated columnar payload."""
+    if isinstance(data, dict) and isinstance(data.get("results"), dict):
+        meta = {key: value for key, value in data.items() if key != "results"}
+        return data["results"], meta
+    if isinstance(data, dict) and all(isinstance(v, list) for v in data.values()):
+        return data, {}
+    # Errors and other non-columnar bodies: one row of scalars
+    return {key: [value] for key, value in dict(data or {}).items()}, {}
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = "application/vnd.tracker.columns+json"
+    format = "columns"
+    columnar = True
+    compact = True
+
+
+def _msgpack_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class MsgpackColumnarRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    columnar = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_msgpack_default)
+
+
+class ArrowColumnarRenderer(BaseRenderer):
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+    charset = None
+    render_style = "binary"
+    columnar = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        columns, meta = split_columns(data)
+        table = pa.table(columns)
+        if meta:
+            table = table.replace_schema_metadata(
+                {key: json.dumps(value) for key, value in meta.items()})
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+# Renderers for the time-series views: the defaults, then the columnar ones
+TIME_SERIES_RENDERERS = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    ColumnarJSONRenderer,
+    *([MsgpackColumnarRenderer] if msgpack else []),
+    *([ArrowColumnarRenderer] if pa else []),
+]
@@ -3,6 +3,13 @@ from .models import AthleteData, InjuryPrediction, PredictionHistory, AthleteSes
 
 
 class AthleteSessionSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, fields=None, **kwargs):
+        # Optional projection, e.g. from ?fields=
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = AthleteSession
         fields = "__all__"
@@ -72,6 +79,7 @@ class InjuryPredictionSerializer(serializers.ModelSerializer):
             "calculated_intensity",
             "risk_level",
             "strain_score",
+            "model_version",
             "created_at",
         ]
 
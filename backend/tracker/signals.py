@@ -0,0 +1,167 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .events import bus
+from .models import (
+    AthleteDailyLoad,
+    AthleteData,
+    AthleteSession,
+    AthleteWorkload,
+    InjuryPrediction,
+    session_day,
+)
+
+# AthleteSession fields sent with "session" events
+SESSION_EVENT_FIELDS = (
+    "id", "athlete_id", "session_date", "heart_rate", "sleep_hours", "steps",
+    "calories_burned", "calculated_intensity", "fatigue_level", "strain_score",
+)
+
+
+def _apply_to_workload(athlete_id, session_date, strain_score, sleep_hours, sign):
+    """Fold one session into (or out of) the athlete's workload row."""
+    state = (AthleteWorkload.objects
+             .select_for_update()
+             .filter(athlete_id=athlete_id)
+             .first())
+    if state is None:
+        if sign < 0:
+            # Nothing to subtract from (or the athlete is being deleted)
+            return
+        # First write for this athlete: the rebuild already includes it
+        AthleteWorkload.rebuild(AthleteData(id=athlete_id))
+        return
+
+    state.apply(session_day(session_date), strain_score, sleep_hours, sign)
+    state.save(update_fields=[
+        "buckets", "ewma_acute", "ewma_chronic", "ewma_day", "version",
+        "updated_at",
+    ])
+
+
+def apply_sessions_to_workload(sessions):
+    """
+    Fold newly created sessions (``bulk_create`` skips the signals) into
+    their athletes' workload rows, saving each row once. Run after the
+    daily rollup of their days has been refreshed.
+    """
+    by_athlete = {}
+    for session in sessions:
+        by_athlete.setdefault(session.athlete_id, []).append(session)
+
+    for athlete_id, athlete_sessions in sorted(by_athlete.items()):
+        state = (AthleteWorkload.objects
+                 .select_for_update()
+                 .filter(athlete_id=athlete_id)
+                 .first())
+        if state is None:
+            # First write for this athlete: the rebuild already includes them
+            AthleteWorkload.rebuild(AthleteData(id=athlete_id))
+            continue
+        for session in athlete_sessions:
+            state.apply(session_day(session.session_date),
+                        session.strain_score, session.sleep_hours)
+        state.save(update_fields=[
+            "buckets", "ewma_acute", "ewma_chronic", "ewma_day", "version",
+            "updated_at",
+        ])
+
+
+@receiver(pre_save, sender=AthleteSession)
+def remember_previous_session(sender, instance, **kwargs):
+    """Keep the stored values of an updated session so they can be removed."""
+    instance._workload_previous = None
+    if instance.pk is None or instance._state.adding:
+        return
+    instance._workload_previous = (
+        AthleteSession.objects
+        .filter(pk=instance.pk)
+        .values_list("athlete_id", "session_date", "strain_score", "sleep_hours")
+        .first()
+    )
+
+
+@receiver(post_save, sender=AthleteSession)
+def update_workload_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return  # fixtures: rebuild afterwards instead
+
+    # Daily rollup first: a first-time workload rebuild reads from it
+    previous = getattr(instance, "_workload_previous", None)
+    if previous is not None:
+        AthleteDailyLoad.refresh(previous[0], session_day(previous[1]))
+    AthleteDailyLoad.refresh(instance.athlete_id,
+                             session_day(instance.session_date))
+
+    if previous is not None:
+        _apply_to_workload(*previous, sign=-1)
+
+    _apply_to_workload(
+        instance.athlete_id,
+        instance.session_date,
+        instance.strain_score,
+        instance.sleep_hours,
+        sign=1,
+    )
+
+
+@receiver(post_delete, sender=AthleteSession)
+def update_workload_on_delete(sender, instance, **kwargs):
+    AthleteDailyLoad.refresh(instance.athlete_id,
+                             session_day(instance.session_date))
+    _apply_to_workload(
+        instance.athlete_id,
+        instance.session_date,
+        instance.strain_score,
+        instance.sleep_hours,
+        sign=-1,
+    )
+
+
+# ----------------- EVENT STREAM ----------------- #
+
+
+def publish_sessions(sessions):
+    """Publish "session" events once the writing transaction commits."""
+    if not bus.has_subscribers():
+        return
+    teams = dict(AthleteData.objects
+                 .filter(id__in={s.athlete_id for s in sessions})
+                 .values_list("id", "team"))
+
+    def publish():
+        for session in sessions:
+            bus.publish(
+                "session",
+                {field: getattr(session, field) for field in SESSION_EVENT_FIELDS},
+                athlete_id=session.athlete_id,
+                team=teams.get(session.athlete_id),
+            )
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=AthleteSession)
+def publish_new_session(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish_sessions([instance])
+
+
+@receiver(post_save, sender=InjuryPrediction)
+def publish_new_prediction(sender, instance, created, raw=False, **kwargs):
+    if not created or raw or not bus.has_subscribers():
+        return
+    team = (AthleteData.objects.filter(id=instance.athlete_id)
+            .values_list("team", flat=True).first())
+    data = {
+        "id": instance.id,
+        "athlete_id": instance.athlete_id,
+        "risk_level": instance.risk_level,
+        "predicted_probability": instance.predicted_probability,
+        "strain_score": instance.strain_score,
+        "model_version": instance.model_version,
+        "created_at": instance.created_at,
+    }
+    transaction.on_commit(lambda: bus.publish(
+        "prediction", data, athlete_id=instance.athlete_id, team=team))
@@ -1,3 +1,1237 @@
-from django.test import TestCase
+import importlib.util
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import (
+    AthleteDailyLoad,
+    AthleteData,
+    AthleteSession,
+    AthleteWorkload,
+    InjuryPrediction,
+)
+from .prediction_cache import prediction_cache
+from .management.commands.retrain_injury_model import sessions_to_train
+from .training_data import (
+    FEATURE_FIELDS,
+    TRAINING_STATE_FILE,
+    load_training_arrays,
+    read_training_state,
+    write_training_state,
+)
+from .views import (
+    acwr_risk_component,
+    compute_workload_features,
+    fuse_prediction,
+    sleep_risk_component,
+)
+from .workload import (
+    acwr_risk_components,
+    compute_bulk_ewma,
+    load_daily_columns,
+    sleep_risk_components,
+)
+
+
+def make_athlete(name="Test Athlete", team="Team A"):
+    return AthleteData.objects.create(
+        name=name, age=21, sport="Soccer", team=team, experience_years=3
+    )
+
+
+def make_session(athlete, days_ago=0, strain=5.0, sleep=7.0, **extra):
+    fields = {
+        "heart_rate": 120,
+        "steps": 8000,
+        "calories_burned": 500,
+        "calculated_intensity": 0.7,
+    }
+    fields.update(extra)
+    return AthleteSession.objects.create(
+        athlete=athlete,
+        session_date=timezone.now() - timedelta(days=days_ago),
+        strain_score=strain,
+        sleep_hours=sleep,
+        **fields,
+    )
+
+
+class WorkloadStateTests(TestCase):
+    def setUp(self):
+        self.athlete = make_athlete()
+
+    def test_state_follows_inserts_updates_and_deletes(self):
+        recent = make_session(self.athlete, days_ago=1, strain=6.0)
+        make_session(self.athlete, days_ago=20, strain=2.0)
+
+        athlete = AthleteData.objects.get(pk=self.athlete.pk)
+        self.assertEqual(athlete.acute_load, 6.0)
+        self.assertEqual(athlete.chronic_load, 2.0)  # (6 + 2) / 4
+        self.assertEqual(athlete.acwr, 3.0)
+
+        recent.strain_score = 10.0
+        recent.save()
+        athlete = AthleteData.objects.get(pk=self.athlete.pk)
+        self.assertEqual(athlete.acute_load, 10.0)
+
+        recent.delete()
+        athlete = AthleteData.objects.get(pk=self.athlete.pk)
+        self.assertEqual(athlete.acute_load, 0)
+        self.assertEqual(athlete.chronic_load, 0.5)
+
+    def test_sessions_outside_window_are_not_stored(self):
+        make_session(self.athlete, days_ago=60)
+        state = AthleteWorkload.objects.get(athlete=self.athlete)
+        self.assertEqual(state.buckets, {})
+
+    def test_state_matches_rebuild(self):
+        for days_ago in (0, 2, 5, 9, 13, 30):
+            make_session(self.athlete, days_ago=days_ago, strain=days_ago + 1)
+        maintained = AthleteWorkload.objects.get(athlete=self.athlete).buckets
+        rebuilt = AthleteWorkload.rebuild(self.athlete).buckets
+        self.assertEqual(maintained, rebuilt)
+
+    def test_compute_workload_features_reads_state(self):
+        make_session(self.athlete, days_ago=1, strain=4.0, sleep=6.5)
+        make_session(self.athlete, days_ago=10, strain=2.0, sleep=8.0)
+        athlete = AthleteData.objects.select_related("workload").get(
+            pk=self.athlete.pk)
+
+        with self.assertNumQueries(0):
+            features = compute_workload_features(athlete)
+
+        self.assertEqual(features, {
+            "acute_load": 4.0,
+            "chronic_load": 3.0,
+            "acwr": 1.33,
+            "sleep_debt": 1.0,
+        })
+
+
+class EwmaWorkloadTests(TestCase):
+    def setUp(self):
+        self.athlete = make_athlete()
+
+    def test_incremental_ewma_matches_rebuild(self):
+        # Out of order on purpose: late arrivals fold in exactly
+        for days_ago, strain in ((3, 4.0), (10, 6.0), (0, 5.0), (1, 2.0),
+                                 (60, 8.0), (1, 3.0)):
+            make_session(self.athlete, days_ago=days_ago, strain=strain)
+        make_session(self.athlete, days_ago=5, strain=9.0).delete()
+
+        state = AthleteWorkload.objects.get(athlete=self.athlete)
+        rebuilt = AthleteWorkload.rebuild(self.athlete)
+        for maintained, expected in zip(state.ewma(), rebuilt.ewma()):
+            self.assertAlmostEqual(maintained, expected)
+
+    def test_single_session_decays_with_time(self):
+        make_session(self.athlete, days_ago=2, strain=8.0)
+        acute, chronic = AthleteWorkload.objects.get(
+            athlete=self.athlete).ewma()
+        self.assertAlmostEqual(acute, 8.0 * 0.25 * 0.75 ** 2)
+        self.assertAlmostEqual(chronic, 8.0 * (2 / 29) * (27 / 29) ** 2)
+
+    def test_model_is_selectable_per_request(self):
+        make_session(self.athlete, days_ago=1, strain=4.0)
+        make_session(self.athlete, days_ago=12, strain=2.0)
+        url = f"/api/athletes/{self.athlete.pk}/latest_session/"
+
+        window = self.client.get(url).json()
+        ewma = self.client.get(url, {"model": "ewma"}).json()
+        self.assertEqual(window["workload_model"], "window")
+        self.assertEqual(window["acwr"], self.athlete.acwr)
+        self.assertEqual(ewma["workload_model"], "ewma")
+        self.assertEqual(ewma["acwr"], self.athlete.load_metrics("ewma")["acwr"])
+
+        self.assertEqual(self.client.get(url, {"model": "nope"}).status_code, 400)
+
+
+class DailyLoadTests(TestCase):
+    def setUp(self):
+        self.athlete = make_athlete()
+
+    def test_rollup_follows_session_writes(self):
+        first = make_session(self.athlete, days_ago=1, strain=4.0, steps=6000)
+        make_session(self.athlete, days_ago=1, strain=8.0, steps=9000)
+        make_session(self.athlete, days_ago=3, strain=5.0)
+
+        day = AthleteDailyLoad.objects.get(
+            athlete=self.athlete, session_count=2)
+        self.assertEqual(day.strain_sum, 12.0)
+        self.assertEqual(day.strain_mean, 6.0)
+        self.assertEqual(day.strain_max, 8.0)
+        self.assertEqual(day.steps_sum, 15000)
+
+        first.delete()
+        day.refresh_from_db()
+        self.assertEqual(day.session_count, 1)
+        self.assertEqual(day.strain_max, 8.0)
+
+    def test_rebuild_all_matches_maintained_rows(self):
+        for days_ago in (0, 0, 2, 40):
+            make_session(self.athlete, days_ago=days_ago)
+        fields = ("day", "session_count", "strain_sum", "sleep_max")
+        maintained = list(AthleteDailyLoad.objects.order_by("day")
+                          .values_list(*fields))
+
+        self.assertEqual(AthleteDailyLoad.rebuild_all(), 3)
+        self.assertEqual(
+            list(AthleteDailyLoad.objects.order_by("day").values_list(*fields)),
+            maintained,
+        )
+
+    def test_history_returns_one_row_per_day(self):
+        make_session(self.athlete, days_ago=2, strain=2.0, steps=1000)
+        make_session(self.athlete, days_ago=2, strain=6.0, steps=1001)
+        make_session(self.athlete, days_ago=0, strain=3.0)
+
+        history = self.client.get(
+            f"/api/athletes/{self.athlete.pk}/history/").json()
+        self.assertEqual([row["sessions"] for row in history], [2, 1])
+        self.assertEqual(history[0]["strain_score"], 4.0)
+        self.assertEqual(history[0]["strain_total"], 8.0)
+        self.assertIsInstance(history[0]["steps"], int)
+        self.assertEqual([row["steps"] for row in history], [1001, 8000])
+
+
+class RollingStatsTests(TestCase):
+    def setUp(self):
+        self.athletes = [make_athlete(name=f"Athlete {i}") for i in range(4)]
+        for athlete in self.athletes:
+            for days_ago in range(8):
+                make_session(athlete, days_ago=days_ago,
+                             strain=days_ago, heart_rate=100 + days_ago)
+
+    def test_annotations_match_per_instance_fallback(self):
+        annotated = AthleteData.objects.with_rolling_stats().get(
+            pk=self.athletes[0].pk)
+        plain = AthleteData.objects.get(pk=self.athletes[0].pk)
+
+        self.assertEqual(annotated.last_five_averages, plain.last_five_averages)
+        self.assertEqual(annotated.avg_strain, 2.0)  # mean of 0..4
+        self.assertEqual(annotated.avg_heart_rate, 102.0)
+
+    def test_athlete_without_sessions_averages_to_zero(self):
+        athlete = make_athlete(name="Rookie")
+        annotated = AthleteData.objects.with_rolling_stats().get(pk=athlete.pk)
+        self.assertEqual(annotated.avg_steps, 0)
+
+    def test_athlete_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/athletes/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 4)
+
+        for i in range(4, 10):
+            make_session(make_athlete(name=f"Athlete {i}"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/athletes/")
+        self.assertEqual(len(response.json()), 10)
+
+
+class BulkWorkloadTests(TestCase):
+    def test_bulk_matches_per_athlete_properties(self):
+        athletes = [make_athlete(name=f"A{i}") for i in range(3)]
+        make_athlete(name="Other team", team="Team B")
+        for i, athlete in enumerate(athletes[:2]):
+            for days_ago in (0, 3, 8, 15, 27, 40):
+                make_session(athlete, days_ago=days_ago,
+                             strain=days_ago + i, sleep=6 + i)
+
+        response = self.client.get("/api/workload/bulk/", {"team": "Team A"})
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()
+        self.assertEqual([row["athlete_id"] for row in rows],
+                         [athlete.pk for athlete in athletes])
+
+        for row, athlete in zip(rows, athletes):
+            athlete = AthleteData.objects.get(pk=athlete.pk)
+            self.assertAlmostEqual(row["acute_load"], athlete.acute_load)
+            self.assertAlmostEqual(row["chronic_load"], athlete.chronic_load)
+            self.assertAlmostEqual(row["acwr"], athlete.acwr)
+
+        # No sessions: same values as the properties, and no sleep debt
+        self.assertEqual(rows[2]["acwr"], 0.0)
+        self.assertEqual(rows[2]["sleep_debt"], 0.0)
+
+        ewma = compute_bulk_ewma([athlete.pk for athlete in athletes],
+                                 athletes=AthleteData.objects.filter(team="Team A"))
+        for value, athlete in zip(ewma["acwr"], athletes):
+            athlete = AthleteData.objects.get(pk=athlete.pk)
+            self.assertEqual(value, athlete.load_metrics("ewma")["acwr"])
+
+    def test_league_load_uses_a_subquery_and_reads_in_chunks(self):
+        athletes = [make_athlete(name=f"A{i}", team=f"Team {i}") for i in range(3)]
+        for athlete in athletes:
+            for days_ago in (0, 3, 8):
+                make_session(athlete, days_ago=days_ago)
+        since = timezone.localdate() - timedelta(days=28)
+
+        with CaptureQueriesContext(connection) as queries:
+            columns = load_daily_columns(AthleteData.objects.all(), since, chunk_size=2)
+        self.assertIn("IN (SELECT", queries[0]["sql"])
+        expected = load_daily_columns([a.pk for a in athletes], since)
+        for column, values in zip(columns, expected):
+            self.assertEqual(sorted(column.tolist()), sorted(values.tolist()))
+        self.assertEqual(len(columns[0]), 9)
+
+        rows = self.client.get("/api/workload/bulk/").json()
+        self.assertEqual([row["athlete_id"] for row in rows],
+                         [athlete.pk for athlete in athletes])
+
+    def test_vectorized_components_match_scalar(self):
+        acwr_values = [-1, 0, 0.5, 0.8, 1.0, 1.3, 1.4, 1.5, 1.8, 2.0, 2.5]
+        self.assertEqual(acwr_risk_components(acwr_values).tolist(),
+                         [acwr_risk_component(v) for v in acwr_values])
+
+        debts = [0, 0.5, 1.5, 3, 4.2]
+        self.assertEqual(sleep_risk_components(debts).tolist(),
+                         [sleep_risk_component(v) for v in debts])
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_index_seeks(self):
+        # Small run of the benchmark; it raises CommandError on a scan
+        out = StringIO()
+        call_command("benchmark_query_plans", sessions=5000, athletes=50,
+                     predictions_per_athlete=5, stdout=out)
+        self.assertIn("All query plans use index seeks.", out.getvalue())
+        self.assertFalse(AthleteSession.objects.exists())  # rolled back
+
+
+def fake_predictor(**functions):
+    """Stand-in for ml_predictor so view tests don't load TensorFlow."""
+    module = types.ModuleType("backend.tracker.ml_predictor")
+    module.ModelUnavailable = type("ModelUnavailable", (Exception,), {})
+    module.model_version = lambda: "test-model"
+    module.__dict__.update(functions)
+    return mock.patch.dict(sys.modules, {"backend.tracker.ml_predictor": module})
+
+
+class BatchPredictionTests(TestCase):
+    def setUp(self):
+        self.athletes = [make_athlete(name=f"A{i}") for i in range(3)]
+        for i, athlete in enumerate(self.athletes):
+            make_session(athlete, days_ago=1, strain=2.0 + i)
+
+    def test_batch_scores_in_input_order_with_one_model_call(self):
+        batch = mock.Mock(side_effect=lambda rows: ([0.1, 0.5, 0.9][:len(rows)], "test-model"))
+        payloads = [
+            {"athlete": athlete.pk, "heart_rate": 120, "strain_score": 3}
+            for athlete in reversed(self.athletes)
+        ]
+
+        with fake_predictor(predict_injury_batch=batch):
+            response = self.client.post("/api/predict/batch/", payloads,
+                                        content_type="application/json")
+
+        self.assertEqual(response.status_code, 200)
+        batch.assert_called_once()
+        results = response.json()["results"]
+        self.assertEqual([r["athlete_id"] for r in results],
+                         [a.pk for a in reversed(self.athletes)])
+
+        for result, ml_probability in zip(results, [0.1, 0.5, 0.9]):
+            expected = fuse_prediction(ml_probability, result["acwr"])
+            self.assertEqual(
+                (result["probability"], result["risk_level"],
+                 result["recommendation"]),
+                expected,
+            )
+        self.assertEqual(InjuryPrediction.objects.count(), 3)
+        self.assertEqual(
+            InjuryPrediction.objects.filter(model_version="test-model").count(), 3)
+
+    def test_team_batch_uses_latest_sessions(self):
+        rookie = make_athlete(name="Rookie")
+        batch = mock.Mock(side_effect=lambda rows: ([0.2] * len(rows), "test-model"))
+
+        with fake_predictor(predict_injury_batch=batch):
+            response = self.client.post("/api/predict/batch/",
+                                        {"team": "Team A"},
+                                        content_type="application/json")
+
+        body = response.json()
+        self.assertEqual(body["skipped"], [rookie.pk])
+        rows = batch.call_args.args[0]
+        self.assertEqual([row[-1] for row in rows], [2.0, 3.0, 4.0])
+
+    def test_unknown_athlete_is_rejected(self):
+        with fake_predictor(predict_injury_batch=mock.Mock()):
+            response = self.client.post("/api/predict/batch/",
+                                        [{"athlete": 999999}],
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_athlete_ids_are_a_400(self):
+        payloads = [{"athlete": self.athletes[0].pk}, {"athlete": "abc"}, {},
+                    {"athlete": "9" * 30}, {"athlete": 10**30}, {"athlete": 0}]
+        with fake_predictor(predict_injury_batch=mock.Mock()):
+            response = self.client.post("/api/predict/batch/", payloads,
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["index"] for e in response.json()["errors"]], [1, 2, 3, 4, 5])
+
+    def test_team_without_sessions_gets_a_specific_error(self):
+        rookie = make_athlete(name="Rookie", team="Team Z")
+        with fake_predictor(predict_injury_batch=mock.Mock()):
+            response = self.client.post("/api/predict/batch/", {"team": "Team Z"},
+                                        content_type="application/json")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("has a session", response.json()["error"])
+            self.assertEqual(response.json()["skipped"], [rookie.pk])
+
+            response = self.client.post("/api/predict/batch/", {"team": "Nobody"},
+                                        content_type="application/json")
+            self.assertEqual(response.status_code, 404)
+
+
+class ModelHolderTests(TestCase):
+    def test_failed_load_is_reported_and_returns_503(self):
+        from .ml_predictor import ModelHolder
+
+        broken = ModelHolder(model_path="/nonexistent/model.h5",
+                             scaler_path="/nonexistent/scaler.pkl")
+        with mock.patch("backend.tracker.ml_predictor.holder", broken):
+            response = self.client.post(
+                "/api/predict/", {"athlete": make_athlete().pk},
+                content_type="application/json")
+            self.assertEqual(response.status_code, 503)
+
+            health = self.client.get("/api/health/model/")
+            self.assertEqual(health.status_code, 503)
+            self.assertEqual(health.json()["state"], "failed")
+
+    def test_failed_load_backs_off_before_retrying(self):
+        from . import ml_predictor
+
+        broken = ml_predictor.ModelHolder(model_path="/nonexistent/model.h5",
+                                          scaler_path="/nonexistent/scaler.pkl",
+                                          retry_seconds=10)
+        with mock.patch.object(broken, "_load_version",
+                               side_effect=OSError("missing")) as load:
+            for _ in range(3):
+                with self.assertRaises(ml_predictor.ModelUnavailable):
+                    broken.load()
+            self.assertEqual(load.call_count, 1)
+
+            later = time.monotonic() + 10
+            with mock.patch.object(ml_predictor.time, "monotonic", return_value=later):
+                with self.assertRaises(ml_predictor.ModelUnavailable):
+                    broken.load()
+            self.assertEqual(load.call_count, 2)
+            self.assertEqual(broken.status()["failures"], 2)
+
+
+class NumpyModelTests(SimpleTestCase):
+    def test_scaler_is_folded_into_first_layer(self):
+        from .numpy_model import NumpyInjuryModel
+
+        rng = np.random.default_rng(1)
+        W1, b1 = rng.normal(size=(6, 4)), rng.normal(size=4)
+        W2, b2 = rng.normal(size=(4, 1)), rng.normal(size=1)
+        mean, scale = rng.normal(size=6), rng.uniform(0.5, 2, size=6)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/model.npz"
+            np.savez(path, kernel_0=W1, bias_0=b1, kernel_1=W2, bias_1=b2,
+                     scaler_mean=mean, scaler_scale=scale,
+                     activations=np.array(["relu", "sigmoid"]))
+            model = NumpyInjuryModel.load(path)
+
+        X = rng.normal(size=(8, 6)) * 100
+        hidden = np.maximum((X - mean) / scale @ W1 + b1, 0)
+        expected = 1 / (1 + np.exp(-(hidden @ W2 + b2)))
+        np.testing.assert_allclose(model.predict(X), expected, rtol=1e-10)
+
+    def test_rejects_an_export_for_other_features(self):
+        from .numpy_model import NumpyInjuryModel
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/model.npz"
+            np.savez(path, kernel_0=np.ones((2, 1)), bias_0=np.zeros(1),
+                     scaler_mean=np.zeros(2), scaler_scale=np.ones(2),
+                     activations=np.array(["sigmoid"]),
+                     feature_fields=np.array(["heart_rate", "steps"]))
+            with self.assertRaises(ValueError):
+                NumpyInjuryModel.load(path)
+
+    @unittest.skipUnless(importlib.util.find_spec("tensorflow"),
+                         "TensorFlow not installed")
+    def test_parity_with_tensorflow(self):
+        import joblib
+        import tensorflow as tf
+
+        from .ml_predictor import MODEL_PATH, SCALER_PATH
+        from .numpy_model import NumpyInjuryModel, export_npz
+
+        scaler = joblib.load(SCALER_PATH)
+        keras_model = tf.keras.models.load_model(MODEL_PATH)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/model.npz"
+            export_npz(keras_model, scaler, path)
+            numpy_model = NumpyInjuryModel.load(path)
+
+        rng = np.random.default_rng(2)
+        X = np.column_stack([
+            rng.uniform(60, 180, 256), rng.uniform(4, 9, 256),
+            rng.integers(1000, 16000, 256), rng.uniform(300, 1200, 256),
+            rng.uniform(0.3, 1.5, 256), rng.uniform(0, 12, 256),
+        ])
+        expected = keras_model.predict(scaler.transform(X), verbose=0)
+        np.testing.assert_allclose(numpy_model.predict(X), expected, atol=1e-5)
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def test_concurrent_calls_share_batches(self):
+        from .batching import MicroBatcher
+
+        calls = []
+
+        def predict(rows):
+            calls.append(len(rows))
+            return rows[:, 0] * 2
+
+        batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=50)
+        futures = [batcher.submit([i, 0, 0, 0, 0, 0]) for i in range(10)]
+
+        self.assertEqual([f.result(timeout=5) for f in futures],
+                         [i * 2 for i in range(10)])
+        self.assertEqual(calls, [4, 4, 2])
+
+        metrics = batcher.metrics()
+        self.assertEqual(metrics["items"], 10)
+        self.assertEqual(metrics["batch_size_distribution"], {2: 1, 4: 2})
+        self.assertIsNotNone(metrics["queue_wait_ms"])
+
+    def test_errors_reach_every_caller(self):
+        from .batching import MicroBatcher
+
+        def predict(rows):
+            raise RuntimeError("model down")
+
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=1)
+        futures = [batcher.submit([0] * 6) for _ in range(3)]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+    def test_bad_rows_and_short_results_fail_the_batch_not_the_worker(self):
+        from .batching import MicroBatcher
+
+        batcher = MicroBatcher(lambda rows: rows[:-1, 0], max_batch_size=2, max_wait_ms=1)
+        with self.assertRaises(ValueError):
+            batcher.predict(["not a number"] * 6, timeout=5)
+        with self.assertRaises(ValueError):  # one result for two rows
+            futures = [batcher.submit([1] * 6), batcher.submit([2] * 6)]
+            futures[0].result(timeout=5)
+
+        batcher.predict_fn = lambda rows: rows[:, 0]
+        self.assertEqual(batcher.predict([3] * 6, timeout=5), 3)
+
+    def test_predict_timeout_is_a_503(self):
+        from .batching import MicroBatcher
+
+        release = threading.Event()
+        stuck = MicroBatcher(lambda rows: release.wait(5) and rows[:, 0],
+                             max_batch_size=1, max_wait_ms=1)
+        self.addCleanup(release.set)
+        with mock.patch("backend.tracker.ml_predictor.batcher", stuck), \
+                self.settings(INJURY_BATCH_TIMEOUT_SECONDS=0.05):
+            from .ml_predictor import ModelUnavailable, predict_injury
+
+            with self.assertRaises(ModelUnavailable):
+                predict_injury(0, 0, 0, 0, 0, 0)
+
+
+class PredictionCacheTests(TestCase):
+    def setUp(self):
+        from .prediction_cache import prediction_cache
+
+        self.cache = prediction_cache
+        self.cache.clear()
+        self.athlete = make_athlete()
+        make_session(self.athlete, days_ago=1)
+        self.payload = {"athlete": self.athlete.pk, "heart_rate": 120.001,
+                        "sleep_hours": 7, "strain_score": 5}
+
+    def post(self, predict):
+        with fake_predictor(predict_injury=predict):
+            return self.client.post("/api/predict/", self.payload,
+                                    content_type="application/json").json()
+
+    def test_repeat_request_hits_cache(self):
+        predict = mock.Mock(return_value=(0.3, "test-model"))
+        first = self.post(predict)
+        self.payload["heart_rate"] = 120.004  # same after rounding
+        second = self.post(predict)
+
+        predict.assert_called_once()
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["probability"], second["probability"])
+
+    def test_new_session_invalidates(self):
+        predict = mock.Mock(return_value=(0.3, "test-model"))
+        self.post(predict)
+        make_session(self.athlete, days_ago=0)
+        self.assertFalse(self.post(predict)["cached"])
+        self.assertEqual(predict.call_count, 2)
+
+    def test_lru_and_ttl(self):
+        from .prediction_cache import PredictionCache
+
+        cache = PredictionCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)  # evicts b, the least recently used
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.ttl = -1
+        cache.set("d", 4)
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        prediction_cache.clear()
+        self.athlete = make_athlete()
+        make_session(self.athlete, days_ago=1, strain=4.0)
+
+    async def test_async_predict_matches_sync_payload(self):
+        async def apredict(*features):
+            return 0.3, "test-model"
+
+        async def aversion():
+            return "test-model"
+
+        payload = {"athlete": self.athlete.pk, "heart_rate": 120, "strain_score": 4}
+        with fake_predictor(predict_injury=lambda *f: (0.3, "test-model"),
+                            apredict_injury=apredict, amodel_version=aversion):
+            async_body = (await self.async_client.post(
+                "/api/async/predict/", payload,
+                content_type="application/json")).json()
+            prediction_cache.clear()
+            sync_body = (await sync_to_async(self.client.post)(
+                "/api/predict/", payload,
+                content_type="application/json")).json()
+
+        self.assertEqual(async_body, sync_body)
+        self.assertEqual(await InjuryPrediction.objects.acount(), 2)
+
+    async def test_async_predict_needs_no_csrf_token(self):
+        async def apredict(*features):
+            return 0.3, "test-model"
+
+        async def aversion():
+            return "test-model"
+
+        client = AsyncClient(enforce_csrf_checks=True)
+        with fake_predictor(apredict_injury=apredict, amodel_version=aversion):
+            response = await client.post(
+                "/api/async/predict/", {"athlete": self.athlete.pk},
+                content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+    async def test_async_latest_endpoints(self):
+        response = await self.async_client.get(
+            f"/api/async/predictions/latest/{self.athlete.pk}/")
+        self.assertEqual(response.status_code, 404)
+
+        await InjuryPrediction.objects.acreate(
+            athlete=self.athlete, risk_level="low", predicted_probability=0.2)
+        response = await self.async_client.get(
+            f"/api/async/predictions/latest/{self.athlete.pk}/")
+        sync_response = await sync_to_async(self.client.get)(
+            f"/api/predictions/latest/{self.athlete.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+
+        response = await self.async_client.get(
+            f"/api/async/athletes/{self.athlete.pk}/latest_session/?model=ewma")
+        sync_response = await sync_to_async(self.client.get)(
+            f"/api/athletes/{self.athlete.pk}/latest_session/?model=ewma")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+
+
+class TimeSeriesPaginationTests(TestCase):
+    def setUp(self):
+        self.athlete = make_athlete()
+        for days_ago in range(10):
+            make_session(self.athlete, days_ago=days_ago, strain=float(days_ago))
+
+    def get(self, path, **params):
+        return self.client.get(f"/api/athletes/{self.athlete.pk}/{path}/", params)
+
+    def test_sessions_cursor_walks_every_row_once(self):
+        page = self.get("sessions", limit=4).json()
+        seen = [row["id"] for row in page["results"]]
+        while page["next"]:
+            page = self.client.get(page["next"]).json()
+            seen += [row["id"] for row in page["results"]]
+
+        expected = list(self.athlete.sessions.order_by("-session_date")
+                        .values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_history_range_and_projection(self):
+        today = timezone.localdate()
+        history = self.get("history", fields="date,strain_total",
+                           **{"from": (today - timedelta(days=2)).isoformat()}).json()
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(set(history[0]), {"date", "strain_total"})
+        self.assertEqual(history[-1]["date"], today.isoformat())
+
+    def test_unpaginated_default_and_bad_params(self):
+        self.assertEqual(len(self.get("sessions").json()), 10)
+        self.assertEqual(self.get("history", fields="nope").status_code, 400)
+        self.assertEqual(self.get("sessions", to="yesterday").status_code, 400)
+
+
+class ColumnarRendererTests(TestCase):
+    COLUMNS = "application/vnd.tracker.columns+json"
+
+    def setUp(self):
+        self.athlete = make_athlete()
+        for days_ago in range(3):
+            make_session(self.athlete, days_ago=days_ago, strain=float(days_ago))
+
+    def test_history_columns_match_rows(self):
+        url = f"/api/athletes/{self.athlete.pk}/history/"
+        rows = self.client.get(url).json()
+        response = self.client.get(url, HTTP_ACCEPT=self.COLUMNS)
+
+        self.assertEqual(response["Content-Type"], self.COLUMNS)
+        columns = response.json()
+        self.assertEqual(columns["strain_total"], [row["strain_total"] for row in rows])
+        self.assertEqual(columns["date"], [row["date"] for row in rows])
+
+    def test_paginated_sessions_and_bulk_workload(self):
+        page = self.client.get(f"/api/athletes/{self.athlete.pk}/sessions/",
+                               {"format": "columns", "limit": 2,
+                                "fields": "strain_score"}).json()
+        self.assertEqual(page["results"], {"strain_score": [0.0, 1.0]})
+        self.assertIsNotNone(page["next"])
+
+        bulk = self.client.get("/api/workload/bulk/", {"format": "columns"}).json()
+        self.assertEqual(bulk["athlete_id"], [self.athlete.pk])
+        self.assertEqual(len(bulk["acwr"]), 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_arrow_stream(self):
+        import pyarrow as pa
+
+        response = self.client.get(f"/api/athletes/{self.athlete.pk}/history/",
+                                   HTTP_ACCEPT="application/vnd.apache.arrow.stream")
+        table = pa.ipc.open_stream(response.content).read_all()
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column("strain_total").to_pylist(), [2.0, 1.0, 0.0])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.athlete = make_athlete()
+        make_session(self.athlete, days_ago=1)
+
+    def assert_revalidates(self, url, change):
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_latest_session_and_history(self):
+        for path in ("latest_session", "history"):
+            self.assert_revalidates(
+                f"/api/athletes/{self.athlete.pk}/{path}/",
+                lambda: make_session(self.athlete, days_ago=0))
+
+    def test_editing_an_older_session_changes_history_etag(self):
+        old = make_session(self.athlete, days_ago=5)
+
+        def edit():
+            old.strain_score = 9
+            old.save()
+
+        self.assert_revalidates(f"/api/athletes/{self.athlete.pk}/history/", edit)
+
+    def test_latest_prediction(self):
+        InjuryPrediction.objects.create(athlete=self.athlete, risk_level="low")
+        self.assert_revalidates(
+            f"/api/predictions/latest/{self.athlete.pk}/",
+            lambda: InjuryPrediction.objects.create(athlete=self.athlete,
+                                                    risk_level="high"))
+
+    def test_latest_session_etag_changes_with_the_day(self):
+        url = f"/api/athletes/{self.athlete.pk}/latest_session/"
+        etag = self.client.get(url)["ETag"]
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch("django.utils.timezone.localdate", return_value=tomorrow):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_is_stable_when_the_workload_row_is_missing(self):
+        AthleteWorkload.objects.filter(athlete=self.athlete).delete()
+        url = f"/api/athletes/{self.athlete.pk}/latest_session/"
+        first = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url)["ETag"], first)
+
+    def test_etag_lookup_does_not_write(self):
+        from .views import latest_session_etag
+
+        AthleteWorkload.objects.filter(athlete=self.athlete).delete()
+        request = mock.Mock(META={})
+        with CaptureQueriesContext(connection) as queries:
+            latest_session_etag(request, self.athlete.pk)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]["sql"].startswith("SELECT"))
+        self.assertFalse(AthleteWorkload.objects.filter(athlete=self.athlete).exists())
+
+    def test_latest_session_etag_changes_with_the_profile(self):
+        self.assert_revalidates(
+            f"/api/athletes/{self.athlete.pk}/latest_session/",
+            lambda: AthleteData.objects.filter(pk=self.athlete.pk).update(team="Team B"))
+
+    def test_etag_varies_with_format(self):
+        url = f"/api/athletes/{self.athlete.pk}/history/"
+        self.assertNotEqual(self.client.get(url)["ETag"],
+                            self.client.get(url, {"format": "columns"})["ETag"])
+
+
+class BulkSessionIngestTests(TestCase):
+    def setUp(self):
+        self.athletes = [make_athlete(name=f"A{i}") for i in range(2)]
+
+    def row(self, athlete, days_ago=0, **extra):
+        row = {"athlete": athlete.pk,
+               "session_date": (timezone.now() - timedelta(days=days_ago)).isoformat(),
+               "heart_rate": 120, "sleep_hours": 7, "steps": 8000,
+               "calories_burned": 500, "calculated_intensity": 0.7,
+               "strain_score": 4}
+        row.update(extra)
+        return row
+
+    def test_json_rows_with_per_row_errors(self):
+        rows = [self.row(athlete, days_ago=d)
+                for athlete in self.athletes for d in range(5)]
+        rows += [self.row(self.athletes[0], heart_rate="fast"),
+                 self.row(self.athletes[0], steps=1.5, sleep_hours=30),
+                 {**self.row(self.athletes[0]), "athlete": 9999}]
+
+        with mock.patch.object(AthleteWorkload, "rebuild",
+                               wraps=AthleteWorkload.rebuild) as rebuild:
+            response = self.client.post("/api/sessions/bulk/", rows,
+                                        content_type="application/json")
+
+        body = response.json()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((body["created"], body["rejected"]), (10, 3))
+        self.assertEqual([e["row"] for e in body["errors"]], [10, 11, 12])
+        self.assertEqual(set(body["errors"][1]["errors"]), {"steps", "sleep_hours"})
+        self.assertEqual(rebuild.call_count, 2)  # first write per athlete
+
+        # Derived state matches what the per-row signals would produce
+        athlete = self.athletes[0]
+        self.assertEqual(athlete.daily_loads.count(), 5)
+        self.assertEqual(AthleteWorkload.objects.get(athlete=athlete).totals(7)[0], 20.0)
+
+    def test_upload_refreshes_only_the_days_it_touches(self):
+        athlete = self.athletes[0]
+        for days_ago in range(10):
+            make_session(athlete, days_ago=days_ago, strain=1.0)
+        expected = AthleteWorkload.objects.get(athlete=athlete)
+
+        with mock.patch.object(AthleteWorkload, "rebuild") as rebuild, \
+                mock.patch.object(AthleteDailyLoad, "rebuild_all") as rebuild_all, \
+                mock.patch.object(AthleteDailyLoad, "refresh",
+                                  wraps=AthleteDailyLoad.refresh) as refresh:
+            response = self.client.post(
+                "/api/sessions/bulk/",
+                [self.row(athlete, days_ago=1, strain_score=3),
+                 self.row(athlete, days_ago=1, strain_score=2)],
+                content_type="application/json")
+
+        self.assertEqual(response.json()["created"], 2)
+        rebuild.assert_not_called()
+        rebuild_all.assert_not_called()
+        self.assertEqual(refresh.call_count, 1)
+        state = AthleteWorkload.objects.get(athlete=athlete)
+        self.assertAlmostEqual(state.totals(7)[0], expected.totals(7)[0] + 5)
+        self.assertEqual(athlete.daily_loads.get(
+            day=timezone.localdate() - timedelta(days=1)).session_count, 3)
+
+    def test_out_of_range_integers_are_row_errors(self):
+        rows = [self.row(self.athletes[0], steps=1e20),
+                {**self.row(self.athletes[0]), "athlete": 1e20},
+                {**self.row(self.athletes[0]), "athlete": 2**63},
+                self.row(self.athletes[0], fatigue_level=2**31)]
+        response = self.client.post("/api/sessions/bulk/", rows,
+                                    content_type="application/json")
+
+        body = response.json()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([set(e["errors"]) for e in body["errors"]],
+                         [{"steps"}, {"athlete"}, {"athlete"}, {"fatigue_level"}])
+        self.assertIn("at most", body["errors"][1]["errors"]["athlete"])
+
+    def test_csv(self):
+        athlete = self.athletes[1]
+        csv_body = (
+            "athlete,session_date,heart_rate,sleep_hours,steps,calories_burned,"
+            "calculated_intensity,strain_score\n"
+            f"{athlete.pk},2026-01-01,130,6.5,9000,600,0.8,5.5\n"
+            f"{athlete.pk},,130,6.5,9000,600,0.8,\n"
+        )
+        response = self.client.post("/api/sessions/bulk/", csv_body,
+                                    content_type="text/csv")
+
+        body = response.json()
+        self.assertEqual(body["created"], 1)
+        self.assertEqual(body["errors"],
+                         [{"row": 1, "errors": {"strain_score": "This field is required."}}])
+        self.assertEqual(athlete.sessions.get().strain_score, 5.5)
+
+    def test_scalar_column_is_a_400(self):
+        response = self.client.post("/api/sessions/bulk/",
+                                    {"athlete": self.athletes[0].pk, "strain_score": [1]},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("'athlete'", response.json()["error"])
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.athlete = make_athlete(team="Team A")
+        self.other = make_athlete(name="Other", team="Team B")
+
+    def test_bounded_buffer_reports_drops(self):
+        from .events import EventBus
+
+        bus = EventBus(buffer_size=2)
+        subscription = bus.subscribe(team="Team A")
+        for i in range(5):
+            bus.publish("session", {"n": i}, athlete_id=1, team="Team A")
+        bus.publish("session", {"n": 99}, athlete_id=2, team="Team B")
+
+        events, dropped = subscription.drain()
+        self.assertEqual([e["data"]["n"] for e in events], [3, 4])
+        self.assertEqual(dropped, 3)
+
+    def test_stream_pushes_matching_sessions_and_predictions(self):
+        response = self.client.get("/api/stream/", {"athlete": self.athlete.pk})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b"retry: 3000\n\n")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_session(self.other, strain=1.0)
+            make_session(self.athlete, strain=6.5)
+            InjuryPrediction.objects.create(athlete=self.athlete, risk_level="high")
+
+        chunk = next(stream).decode()
+        response.close()
+
+        self.assertIn("event: session", chunk)
+        self.assertIn('"strain_score": 6.5', chunk)
+        self.assertIn("event: prediction", chunk)
+        self.assertNotIn('"strain_score": 1.0', chunk)
+        from .events import bus
+        self.assertFalse(bus.has_subscribers())
+
+    def test_unread_stream_does_not_subscribe(self):
+        from .events import bus
+
+        self.assertEqual(self.client.post("/api/stream/").status_code, 405)
+        response = self.client.get("/api/stream/", {"team": "Team A"})
+        self.assertFalse(bus.has_subscribers())
+        response.close()
+        self.assertFalse(bus.has_subscribers())
+
+
+class PredictionListTests(TestCase):
+    def setUp(self):
+        self.athletes = [make_athlete(name=f"A{i}", team="Team A" if i < 3 else "Team B")
+                         for i in range(5)]
+        for i, athlete in enumerate(self.athletes):
+            for risk in ("low", "high"):
+                InjuryPrediction.objects.create(athlete=athlete, risk_level=risk,
+                                                strain_score=i)
+
+    def get(self, **params):
+        return self.client.get("/api/predictions/", params)
+
+    def test_query_count_is_constant_in_page_size(self):
+        for limit in (2, 10):
+            with self.assertNumQueries(1):
+                page = self.get(limit=limit).json()
+            self.assertEqual(len(page["results"]), limit)
+            self.assertIn("athlete_name", page["results"][0])
+
+    def test_newest_first_and_filters(self):
+        results = self.get().json()["results"]
+        created = [row["created_at"] for row in results]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+        team = self.get(team="Team B", risk_level="high").json()["results"]
+        self.assertEqual({row["athlete_name"] for row in team}, {"A3", "A4"})
+        self.assertEqual({row["risk_level"] for row in team}, {"high"})
+
+        athlete = self.get(athlete=self.athletes[0].pk).json()["results"]
+        self.assertEqual(len(athlete), 2)
+        self.assertEqual(self.get(athlete="x").status_code, 400)
+        self.assertEqual(self.get(athlete="9" * 30).status_code, 400)
+        self.assertEqual(len(self.get(**{"from": timezone.localdate().isoformat()})
+                             .json()["results"]), 10)
+
+    def test_latest_prediction_breaks_timestamp_ties_like_its_etag(self):
+        athlete = self.athletes[0]
+        InjuryPrediction.objects.filter(athlete=athlete).update(created_at=timezone.now())
+        newest = InjuryPrediction.objects.filter(athlete=athlete).order_by("-id").first()
+
+        response = self.client.get(f"/api/predictions/latest/{athlete.pk}/")
+        self.assertEqual(response.json()["risk_level"], newest.risk_level)
+
+    def test_pages_through_predictions_sharing_a_timestamp(self):
+        InjuryPrediction.objects.update(created_at=timezone.now())
+        seen, page = [], self.get(limit=3).json()
+        while True:
+            seen += [(row["athlete_name"], row["risk_level"]) for row in page["results"]]
+            if not page["next"]:
+                break
+            page = self.client.get(page["next"]).json()
+        self.assertEqual(len(seen), 10)
+        self.assertEqual(len(set(seen)), 10)
+
+
+class TeamSummaryTests(TestCase):
+    def add_athlete(self, name, sessions=6):
+        athlete = make_athlete(name=name, team="Team A")
+        for day in range(sessions):
+            make_session(athlete, days_ago=day * 3, strain=5.0 + day, sleep=6.0 + day % 2)
+        return athlete
+
+    def get(self, team="Team A", **params):
+        return self.client.get(f"/api/teams/{team}/summary/", params)
+
+    def test_rows_match_the_per_athlete_endpoints(self):
+        athlete = self.add_athlete("Ann")
+        make_athlete(name="Bob", team="Team A")  # no sessions yet
+        InjuryPrediction.objects.create(athlete=athlete, risk_level="low")
+        InjuryPrediction.objects.create(athlete=athlete, risk_level="high",
+                                        predicted_probability=0.8)
+
+        for model in ("window", "ewma"):
+            body = self.get(model=model).json()
+            ann, bob = body["athletes"]
+            latest = self.client.get(
+                f"/api/athletes/{athlete.pk}/latest_session/", {"model": model}).json()
+
+            for key in ("acute_load", "chronic_load", "acwr", "avg_strain", "avg_sleep_hours"):
+                self.assertAlmostEqual(ann[key], latest[key], msg=key)
+            self.assertEqual(ann["latest_session"]["strain_score"], latest["strain_score"])
+            self.assertEqual(ann["latest_prediction"]["risk_level"], "high")
+            self.assertIsNone(bob["latest_session"])
+            self.assertIsNone(bob["latest_prediction"])
+
+    def test_query_count_does_not_grow_with_roster(self):
+        InjuryPrediction.objects.create(athlete=self.add_athlete("A0"), risk_level="low")
+        with self.assertNumQueries(4):
+            self.get()
+        for i in range(1, 8):
+            self.add_athlete(f"A{i}")
+        with self.assertNumQueries(4):
+            self.assertEqual(len(self.get().json()["athletes"]), 8)
+
+    def test_unknown_team_and_model(self):
+        self.assertEqual(self.get(team="Nobody").status_code, 404)
+        self.assertEqual(self.get(model="nope").status_code, 400)
+
+
+class TrainingDataTests(TestCase):
+    def setUp(self):
+        athlete = make_athlete()
+        self.sessions = [make_session(athlete, days_ago=i, strain=i, steps=1000 + i,
+                                      injury_occurred=i % 3 == 0)
+                         for i in range(7)]
+
+    def test_streams_sessions_in_id_order(self):
+        X, y = load_training_arrays(chunk_size=3)
+
+        self.assertEqual((X.shape, X.dtype), ((7, len(FEATURE_FIELDS)), np.float32))
+        self.assertEqual(X[:, FEATURE_FIELDS.index("strain_score")].tolist(), list(range(7)))
+        self.assertEqual(X[:, FEATURE_FIELDS.index("steps")].tolist(),
+                         [1000 + i for i in range(7)])
+        self.assertEqual(y.tolist(), [1, 0, 0, 1, 0, 0, 1])
+
+    def test_memory_mapped_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/features.npy"
+            X, y = load_training_arrays(chunk_size=2, mmap_path=path)
+            self.assertIsInstance(X, np.memmap)
+            np.testing.assert_array_equal(np.load(path), load_training_arrays()[0])
+            del X
+
+    def test_empty_table(self):
+        AthleteSession.objects.all().delete()
+        X, y = load_training_arrays()
+        self.assertEqual((X.shape, y.shape), ((0, len(FEATURE_FIELDS)), (0,)))
+
+
+class RetrainInjuryModelTests(TestCase):
+    def test_high_water_mark_selects_new_sessions_only(self):
+        athlete = make_athlete()
+        old = make_session(athlete, days_ago=2)
+        new = make_session(athlete, days_ago=1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/{TRAINING_STATE_FILE}"
+            self.assertIsNone(read_training_state(path))
+            write_training_state(path, old.id, 1, "full")
+            state = read_training_state(path)
+
+        sessions, mode = sessions_to_train(state)
+        self.assertEqual((list(sessions), mode), ([new], "incremental"))
+        sessions, mode = sessions_to_train(state, full=True)
+        self.assertEqual((sessions.count(), mode), (2, "full"))
+        self.assertEqual(sessions_to_train(None)[1], "full")
+
+    @unittest.skipUnless(importlib.util.find_spec("tensorflow")
+                         and importlib.util.find_spec("sklearn"),
+                         "TensorFlow and scikit-learn not installed")
+    def test_full_then_incremental(self):
+        athlete = make_athlete()
+        for day in range(40):
+            make_session(athlete, days_ago=day, strain=day % 10,
+                         injury_occurred=day % 10 > 7)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command("retrain_injury_model", model_dir=tmp, epochs=1,
+                         no_publish=True, stdout=StringIO())
+            first = read_training_state(f"{tmp}/{TRAINING_STATE_FILE}")
+            self.assertEqual((first["mode"], first["sessions_seen"]), ("full", 40))
+
+            make_session(athlete, strain=9, injury_occurred=True)
+            call_command("retrain_injury_model", model_dir=tmp, epochs=1,
+                         no_publish=True, stdout=StringIO())
+            second = read_training_state(f"{tmp}/{TRAINING_STATE_FILE}")
+            self.assertEqual((second["mode"], second["sessions_seen"]), ("incremental", 41))
+            self.assertGreater(second["last_session_id"], first["last_session_id"])
+
+
+def write_npz_model(path, bias):
+    """A one-layer NumPy artifact whose output is sigmoid(bias)."""
+    np.savez(path, kernel_0=np.zeros((6, 1)), bias_0=np.array([bias]),
+             scaler_mean=np.zeros(6), scaler_scale=np.ones(6),
+             activations=np.array(["sigmoid"]))
+
+
+class ModelRegistryTests(TestCase):
+    def setUp(self):
+        from .model_registry import ModelRegistry
+
+        prediction_cache.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.registry = ModelRegistry(f"{self.tmp}/registry")
+
+    def publish(self, bias, activate=True):
+        path = f"{self.tmp}/model-{bias}.npz"
+        write_npz_model(path, bias)
+        return self.registry.publish({"injury_model.npz": path}, activate=activate)
+
+    def test_versions_are_immutable_and_pointer_is_explicit(self):
+        first = self.publish(0.0)
+        self.assertEqual(self.publish(0.0), first)  # same content, same version
+        second = self.publish(2.0, activate=False)
+
+        self.assertCountEqual(self.registry.versions(), [first, second])
+        self.assertEqual(self.registry.current_version(), first)
+        self.registry.activate(second)
+        self.assertEqual(self.registry.current_version(), second)
+        with self.assertRaises(ValueError):
+            self.registry.activate("missing")
+
+    def test_holder_hot_swaps_in_the_background(self):
+        from .ml_predictor import ModelHolder
+        from .prediction_cache import prediction_cache
+
+        first = self.publish(0.0)
+        holder = ModelHolder(backend="numpy", registry=self.registry, poll_seconds=0)
+        self.assertAlmostEqual(float(holder.predict(np.zeros((1, 6)))[0][0, 0]), 0.5)
+        self.assertEqual(holder.version, first)
+
+        prediction_cache.set("stale", 1)
+        second = self.publish(2.0)
+        holder.predict(np.zeros((1, 6)))  # old version still serves meanwhile
+        for _ in range(200):
+            if holder.version == second:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual((holder.version, holder.swaps), (second, 1))
+        self.assertGreater(float(holder.predict(np.zeros((1, 6)))[0][0, 0]), 0.8)
+        self.assertIsNone(prediction_cache.get("stale"))
+
+    def test_predictions_record_the_model_version(self):
+        athlete = make_athlete()
+        make_session(athlete, days_ago=1)
+        with fake_predictor(predict_injury=mock.Mock(return_value=(0.2, "abc123")),
+                            model_version=lambda: "abc123"):
+            self.client.post("/api/predict/", {"athlete": athlete.pk, "strain_score": 4},
+                             content_type="application/json")
+
+        self.assertEqual(InjuryPrediction.objects.get().model_version, "abc123")
+        latest = self.client.get(f"/api/predictions/latest/{athlete.pk}/").json()
+        self.assertEqual(latest["model_version"], "abc123")
+
+    def test_swap_between_lookup_and_predict_records_the_producing_version(self):
+        athlete = make_athlete()
+        payload = {"athlete": athlete.pk, "strain_score": 4}
+        predict = mock.Mock(return_value=(0.9, "new"))
+        with fake_predictor(predict_injury=predict, model_version=lambda: "old"):
+            self.client.post("/api/predict/", payload, content_type="application/json")
+        with fake_predictor(predict_injury=predict, model_version=lambda: "new"):
+            second = self.client.post("/api/predict/", payload,
+                                      content_type="application/json").json()
+
+        self.assertEqual(
+            list(InjuryPrediction.objects.values_list("model_version", flat=True)),
+            ["new", "new"])
+        self.assertTrue(second["cached"])  # cached under the producing version
+
+    def test_holder_output_and_version_come_from_one_snapshot(self):
+        from .ml_predictor import ModelHolder
+
+        self.publish(0.0)
+        holder = ModelHolder(backend="numpy", registry=self.registry, poll_seconds=0)
+        holder.load()
+        second = self.publish(3.0)
+        holder._swap(second, self.registry.manifest_stamp())  # swap inline
+        output, version = holder.predict(np.zeros((1, 6)))
+        self.assertEqual(version, second)
+        self.assertGreater(float(output[0, 0]), 0.9)
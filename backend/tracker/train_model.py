@@ -1,13 +1,11 @@
 # isort:skip_file
 
+import argparse
 import os
 import sys
 import django
-import pandas as pd
-import numpy as np
 from sklearn.preprocessing import StandardScaler
 import joblib
-import tensorflow as tf
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -17,53 +15,40 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 django.setup()
 
 
-def load_models():
-    from tracker.models import AthleteSession
-    return AthleteSession
-
-
-AthleteSession = load_models()
+parser = argparse.ArgumentParser(description="Train the injury model.")
+parser.add_argument("--chunk-size", type=int, default=20_000,
+                    help="Sessions fetched and converted per batch")
+parser.add_argument("--mmap", metavar="PATH",
+                    help="Stream features into a memory-mapped .npy file "
+                         "instead of RAM")
+args = parser.parse_args()
 
 
 # Load session dataset
 
-print("Loading data from database...")
-
-sessions = AthleteSession.objects.all().values(
-    "heart_rate",
-    "sleep_hours",
-    "steps",
-    "calories_burned",
-    "calculated_intensity",
-    "strain_score",
-    "injury_occurred",
+from tracker.training_data import (  # noqa: E402
+    build_injury_model,
+    TRAINING_STATE_FILE,
+    load_training_arrays,
+    standardize_in_place,
+    write_training_state,
 )
+from tracker.models import FEATURE_FIELDS, AthleteSession  # noqa: E402
 
-data = pd.DataFrame(list(sessions))
+print(f"Loading {', '.join(FEATURE_FIELDS)} from database...")
 
-if data.empty:
+last_id = AthleteSession.objects.order_by("-id").values_list("id", flat=True).first()
+X, y = load_training_arrays(AthleteSession.objects.filter(id__lte=last_id or 0),
+                            chunk_size=args.chunk_size, mmap_path=args.mmap)
+
+if not len(X):
     raise ValueError(
         " ERROR: No AthleteSession records found. Run generate_fake_data first.")
 
 
-X = data[
-    [
-        "heart_rate",
-        "sleep_hours",
-        "steps",
-        "calories_burned",
-        "calculated_intensity",
-        "strain_score",
-    ]
-].values
-
-y = data["injury_occurred"].astype(int).values
-
-
 print("Normalizing...")
 
-scaler = StandardScaler()
-X = scaler.fit_transform(X)
+scaler = standardize_in_place(X, StandardScaler(), chunk_size=args.chunk_size)
 
 # Ensure directory exists
 MODEL_DIR = os.path.join(BASE_DIR, "backend", "ml_models")
@@ -76,18 +61,19 @@ joblib.dump(scaler, os.path.join(MODEL_DIR, "scaler.pkl"))
 
 print("Training model...")
 
-model = tf.keras.Sequential([
-    tf.keras.layers.Dense(64, activation="relu", input_shape=(6,)),
-    tf.keras.layers.Dense(32, activation="relu"),
-    tf.keras.layers.Dense(1, activation="sigmoid"),  # Binary classification
-])
-
-model.compile(optimizer="adam", loss="binary_crossentropy",
-              metrics=["accuracy"])
+model = build_injury_model()
 
 model.fit(X, y, epochs=20, batch_size=16, validation_split=0.2)
 
 
 model.save(os.path.join(MODEL_DIR, "injury_model.h5"))
 
+# NumPy copy for the TensorFlow-free serving backend
+from tracker.numpy_model import export_npz  # noqa: E402
+export_npz(model, scaler, os.path.join(MODEL_DIR, "injury_model.npz"))
+
+# High-water mark for incremental retraining (manage.py retrain_injury_model)
+write_training_state(os.path.join(MODEL_DIR, TRAINING_STATE_FILE),
+                     last_id, len(X), "full")
+
 print(" Model trained and saved successfully!")
@@ -0,0 +1,126 @@
+"""
+Streaming loader for the injury model's training set.
+
+Sessions are read in primary-key order with a server-side iterator and
+copied chunk by chunk into a preallocated float32 array, or a
+memory-mapped ``.npy`` file, so peak memory is the output array plus one
+chunk rather than several copies of the whole table. With ``mmap_path``
+the features never need to fit in RAM at all.
+
+Also holds the network definition and the high-water-mark state file
+shared by ``train_model.py`` and the ``retrain_injury_model`` command.
+"""
+import json
+import os
+from itertools import islice
+
+import numpy as np
+from django.utils import timezone
+
+from .models import FEATURE_FIELDS, AthleteSession
+
+LABEL_FIELD = "injury_occurred"
+CHUNK_SIZE = 20_000
+
+# Written next to the model artifacts by retrain_injury_model
+TRAINING_STATE_FILE = "training_state.json"
+
+
+def load_training_arrays(queryset=None, chunk_size=CHUNK_SIZE, mmap_path=None):
+    """
+    Return ``(X, y)``: float32 features of shape ``(n, len(FEATURE_FIELDS))``
+    and int8 labels. ``X`` is an ``np.memmap`` backed by ``mmap_path`` when
+    given. Sessions written while loading are left out; sessions deleted
+    while loading shorten the result.
+    """
+    queryset = AthleteSession.objects.all() if queryset is None else queryset
+    last_id = queryset.order_by("-id").values_list("id", flat=True).first()
+    if last_id is None:
+        return _allocate(0, mmap_path), np.empty(0, dtype=np.int8)
+
+    queryset = queryset.filter(id__lte=last_id)
+    total = queryset.count()
+    X = _allocate(total, mmap_path)
+    y = np.empty(total, dtype=np.int8)
+
+    rows = (queryset.order_by("id")
+            .values_list(*FEATURE_FIELDS, LABEL_FIELD)
+            .iterator(chunk_size=chunk_size))
+    filled = 0
+    while filled < total:
+        chunk = list(islice(rows, min(chunk_size, total - filled)))
+        if not chunk:
+            break
+        block = np.array(chunk, dtype=np.float64)
+        X[filled:filled + len(chunk)] = block[:, :-1]
+        y[filled:filled + len(chunk)] = block[:, -1]
+        filled += len(chunk)
+
+    if filled < total:
+        X, y = X[:filled], y[:filled]
+    if isinstance(X, np.memmap):
+        X.flush()
+    return X, y
+
+
+def _allocate(rows, mmap_path):
+    shape = (rows, len(FEATURE_FIELDS))
+    if mmap_path is None:
+        return np.empty(shape, dtype=np.float32)
+    return np.lib.format.open_memmap(mmap_path, mode="w+",
+                                     dtype=np.float32, shape=shape)
+
+
+def standardize_in_place(X, scaler, chunk_size=CHUNK_SIZE):
+    """
+    Fit ``scaler`` (anything with ``partial_fit``/``transform``, such as
+    sklearn's StandardScaler) over ``X`` in chunks, then scale ``X`` in
+    place, so no full-size float64 copy is made.
+    """
+    for start in range(0, len(X), chunk_size):
+        scaler.partial_fit(X[start:start + chunk_size])
+    for start in range(0, len(X), chunk_size):
+        X[start:start + chunk_size] = scaler.transform(X[start:start + chunk_size])
+    return scaler
+
+
+def build_injury_model():
+    """The compiled Keras network, as first trained by train_model.py."""
+    import tensorflow as tf
+
+    model = tf.keras.Sequential([
+        tf.keras.layers.Dense(64, activation="relu",
+                              input_shape=(len(FEATURE_FIELDS),)),
+        tf.keras.layers.Dense(32, activation="relu"),
+        tf.keras.layers.Dense(1, activation="sigmoid"),  # Binary classification
+    ])
+    model.compile(optimizer="adam", loss="binary_crossentropy",
+                  metrics=["accuracy"])
+    return model
+
+
+def read_training_state(path):
+    """The saved training state, or None if the model was never retrained."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_training_state(path, last_session_id, sessions_seen, mode):
+    """
+    Record the high-water mark: the newest session id the saved model has
+    been trained on. Replaced atomically, so a crash keeps the old mark.
+    """
+    state = {
+        "last_session_id": last_session_id,
+        "sessions_seen": sessions_seen,
+        "mode": mode,
+        "trained_at": timezone.now().isoformat(),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+    return state
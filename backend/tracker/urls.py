@@ -1,7 +1,7 @@
 # backend/urls.py
 
 from django.urls import path
-from backend.tracker import views
+from backend.tracker import async_views, views
 
 urlpatterns = [
     # ---- Athletes ----
@@ -15,12 +15,37 @@ urlpatterns = [
     path("predictions/latest/<int:athlete_id>/",
          views.latest_prediction, name="latest-prediction"),
     path("predict/", views.create_prediction, name="predict"),
+    path("predict/batch/", views.create_batch_prediction,
+         name="predict-batch"),
+
+    # ---- Health ----
+    path("health/model/", views.model_health, name="model-health"),
+    path("metrics/inference/", views.inference_metrics,
+         name="inference-metrics"),
+
+    # ---- Workload ----
+    path("workload/bulk/", views.bulk_workload, name="workload-bulk"),
+    path("teams/<str:team>/summary/", views.team_dashboard_summary,
+         name="team-summary"),
 
     # ---- Sessions & history ----
+    path("sessions/bulk/", views.bulk_create_sessions,
+         name="sessions-bulk"),
     path("athletes/<int:athlete_id>/sessions/",
          views.athlete_sessions, name="athlete-sessions"),
     path("athletes/<int:athlete_id>/latest_session/",
          views.latest_session, name="athlete-latest-session"),
     path("athletes/<int:athlete_id>/history/",
          views.athlete_history, name="athlete-history"),
+
+    # ---- Push ----
+    path("stream/", views.event_stream, name="event-stream"),
+
+    # ---- Async (ASGI) variants ----
+    path("async/predict/", async_views.create_prediction,
+         name="async-predict"),
+    path("async/predictions/latest/<int:athlete_id>/",
+         async_views.latest_prediction, name="async-latest-prediction"),
+    path("async/athletes/<int:athlete_id>/latest_session/",
+         async_views.latest_session, name="async-athlete-latest-session"),
 ]
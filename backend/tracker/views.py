@@ -1,16 +1,46 @@
 from rest_framework import generics
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes, renderer_classes
+from rest_framework.parsers import JSONParser
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from .models import AthleteSession, AthleteData
-from django.db.models import Avg
+from django.db.models import Avg, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Cast, Round
 from datetime import timedelta
 from django.utils import timezone
+from django.views.decorators.http import condition, require_GET
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from typing import Dict
+import hashlib
 
 
 from .models import AthleteData, InjuryPrediction,  AthleteSession
+from .models import AthleteDailyLoad
+from .events import asse_stream, sse_stream
+from .models import FEATURE_FIELDS, SLEEP_TARGET_HOURS, WORKLOAD_MODELS
+from .ingest import (
+    MAX_ID,
+    MAX_ROWS,
+    CSVParser,
+    ingest_sessions,
+    to_columns,
+    validate_columns,
+)
+from .pagination import (
+    HistoryCursorPagination,
+    PredictionCursorPagination,
+    QueryParamError,
+    SessionCursorPagination,
+    filter_date_range,
+    requested_fields,
+)
+from .prediction_cache import prediction_cache
+from .renderers import TIME_SERIES_RENDERERS, rows_to_columns, wants_columns
+from .workload import team_summary, team_workload
 from .serializers import (
     AthleteDataSerializer,
     AthleteSessionSerializer,
@@ -20,45 +50,70 @@ from .serializers import (
 
 
 class AthleteListView(generics.ListAPIView):
-    queryset = AthleteData.objects.all()
+    queryset = AthleteData.objects.with_rolling_stats()
     serializer_class = AthleteDataSerializer
 
 
 class AthleteDetailView(generics.RetrieveAPIView):
-    queryset = AthleteData.objects.all()
+    queryset = AthleteData.objects.with_rolling_stats()
     serializer_class = AthleteDataSerializer
 
 
+def parse_id(value):
+    """``value`` as a positive database id, or None (bools, junk, overflow)."""
+    text = str(value)
+    if isinstance(value, bool) or not (text.isascii() and text.isdigit()):
+        return None
+    value = int(text)
+    return value if 0 < value <= MAX_ID else None
+
+
 class InjuryPredictionListView(generics.ListAPIView):
-    queryset = InjuryPrediction.objects.all()
+    """
+    Predictions newest first, cursor-paginated (``?limit=``/``?cursor=``).
+    Filters: ``?athlete=<id>``, ``?team=``, ``?risk_level=`` (comma
+    separated) and ``?from=``/``?to=`` dates on created_at.
+    """
     serializer_class = InjuryPredictionSerializer
+    pagination_class = PredictionCursorPagination
+
+    def get_queryset(self):
+        # The serializer reads athlete.*: join it instead of one query per row
+        predictions = InjuryPrediction.objects.select_related("athlete")
+        params = self.request.query_params
+
+        athlete_id = params.get("athlete")
+        if athlete_id:
+            if parse_id(athlete_id) is None:
+                raise ValidationError({"athlete": "Must be an integer id."})
+            predictions = predictions.filter(athlete_id=parse_id(athlete_id))
+        if params.get("team"):
+            predictions = predictions.filter(athlete__team=params["team"])
+        if params.get("risk_level"):
+            predictions = predictions.filter(
+                risk_level__in=params["risk_level"].split(","))
+
+        try:
+            return filter_date_range(predictions, self.request, "created_at")
+        except QueryParamError as exc:
+            raise ValidationError({"error": str(exc)})
 
 # ----------------- WORKLOAD & FATIGUE FEATURES ----------------- #
 
 
-SLEEP_TARGET_HOURS = 7.5  # Option B: your chosen target
-
-
 def compute_workload_features(athlete) -> Dict[str, float]:
     """
     Compute acute load, chronic load, ACWR, and sleep debt
-    using the athlete's recent sessions.
+    using the athlete's maintained workload state.
     """
-    now = timezone.now()
-    today = now.date()
-
-    # Last 14 days for chronic load
-    last_14 = athlete.sessions.filter(
-        session_date__date__gte=today - timedelta(days=14)
-    ).order_by("session_date")
+    state = athlete.workload_state
 
-    # Last 7 days for acute load
-    last_7 = athlete.sessions.filter(
-        session_date__date__gte=today - timedelta(days=7)
-    ).order_by("session_date")
+    # Last 14 days for chronic load, last 7 days for acute load
+    chronic_strain, chronic_count, _ = state.totals(14)
+    acute_strain, acute_count, acute_sleep = state.totals(7)
 
     # If we somehow have no sessions, fall back to neutral defaults
-    if not last_14.exists():
+    if not chronic_count:
         return {
             "acute_load": 0.0,
             "chronic_load": 0.0,
@@ -67,10 +122,10 @@ def compute_workload_features(athlete) -> Dict[str, float]:
         }
 
     acute_load = 0.0
-    if last_7.exists():
-        acute_load = sum(s.strain_score for s in last_7) / last_7.count()
+    if acute_count:
+        acute_load = acute_strain / acute_count
 
-    chronic_load = sum(s.strain_score for s in last_14) / last_14.count()
+    chronic_load = chronic_strain / chronic_count
 
     if chronic_load > 0:
         acwr = acute_load / chronic_load
@@ -78,8 +133,8 @@ def compute_workload_features(athlete) -> Dict[str, float]:
         acwr = 1.0  # neutral if we can't compute it
 
     # Sleep debt over the last 7 days
-    if last_7.exists():
-        avg_sleep = sum(s.sleep_hours for s in last_7) / last_7.count()
+    if acute_count:
+        avg_sleep = acute_sleep / acute_count
         sleep_debt = max(0.0, SLEEP_TARGET_HOURS - avg_sleep)
     else:
         sleep_debt = 0.0
@@ -127,42 +182,117 @@ def strain_risk_component(strain_score: float) -> float:
 # -----------
 
 
-@api_view(["POST"])
-def create_prediction(request):
+def resolve_workload_model(*candidates):
+    """
+    First non-empty candidate, defaulting to the rolling window. Returns
+    None if it is not one of WORKLOAD_MODELS.
+    """
+    model = next((c for c in candidates if c), "window")
+    return model if model in WORKLOAD_MODELS else None
 
-    from .ml_predictor import predict_injury
 
-    # -------- 1) GET ATHLETE --------
-    athlete_id = request.data.get("athlete")
-    athlete = get_object_or_404(AthleteData, id=athlete_id)
+def get_workload_model(request):
+    """
+    Workload model requested through ``?model=`` (or ``model`` in the body),
+    defaulting to the rolling window. Returns None if it is not recognised.
+    """
+    body = request.data if isinstance(request.data, dict) else {}
+    return resolve_workload_model(request.query_params.get("model"),
+                                  body.get("model"))
 
-    # -------- 2) EXTRACT INPUT FEATURES --------
-    heart_rate = float(request.data.get("heart_rate", 0))
-    sleep_hours = float(request.data.get("sleep_hours", 0))
-    steps = int(request.data.get("steps", 0))
-    calories_burned = float(request.data.get("calories_burned", 0))
-    intensity = float(request.data.get("calculated_intensity", 0))
-    strain_score = float(request.data.get("strain_score", 0))
-
-    # -------- 3) BASE ML PREDICTION --------
-    ml_probability = float(
-        predict_injury(
-            heart_rate,
-            sleep_hours,
-            steps,
-            calories_burned,
-            intensity,
-            strain_score,
-        )
+
+def invalid_workload_model_response():
+    return Response(
+        {"error": f"model must be one of: {', '.join(WORKLOAD_MODELS)}"},
+        status=status.HTTP_400_BAD_REQUEST,
     )
 
-    # -------- 4) WORKLOAD RISK LAYER (ACWR) --------
-    # ACWR already computed & stored on athlete model
+
+@api_view(["GET"])
+@renderer_classes(TIME_SERIES_RENDERERS)
+def bulk_workload(request):
+    """
+    Acute/chronic load, ACWR and sleep debt for a whole team (or the whole
+    league when ``team`` is omitted), computed in one vectorized pass.
+    """
+    model = get_workload_model(request)
+    if model is None:
+        return invalid_workload_model_response()
+
+    team = request.query_params.get("team")
+    return Response(team_workload(team, model=model,
+                                  columnar=wants_columns(request)))
+
+
+@api_view(["GET"])
+def team_dashboard_summary(request, team):
+    """
+    One roster row per athlete on ``team``: latest session, last-five
+    averages, acute/chronic load, ACWR and latest prediction.
+    """
+    model = get_workload_model(request)
+    if model is None:
+        return invalid_workload_model_response()
+
+    rows = team_summary(team, model=model)
+    if not rows:
+        return Response({"error": "Team not found"}, status=404)
+    return Response({"team": team, "workload_model": model, "athletes": rows})
+
+
+# ----------------- PREDICTION FUSION ----------------- #
+
+def extract_features(data):
+    """Read the six model features from a request payload."""
+    return [
+        float(data.get("heart_rate", 0)),
+        float(data.get("sleep_hours", 0)),
+        int(data.get("steps", 0)),
+        float(data.get("calories_burned", 0)),
+        float(data.get("calculated_intensity", 0)),
+        float(data.get("strain_score", 0)),
+    ]
+
+
+def athlete_acwr(athlete, workload_model):
+    """ACWR from the athlete's maintained workload state, or None."""
     try:
-        acwr = float(athlete.acwr) if athlete.acwr is not None else None
+        return float(athlete.load_metrics(workload_model)["acwr"])
     except:
-        acwr = None  # NaN-safe
+        return None  # NaN-safe
+
+
+def build_recommendation(prob, acwr_val):
+    if acwr_val and acwr_val > 1.5:
+        return (
+            "🚨 Load spike detected — VERY HIGH injury risk. "
+            "Rest today. Reduce next week's workload by 40–60%. "
+            "Avoid explosive sprinting and heavy lifting. "
+            "Hydrate well and increase sleep duration."
+        )
+    if prob > 0.7:
+        return (
+            "❌ High injury risk. Avoid intense training today. "
+            "Replace with mobility work, light stretching, and recovery runs."
+        )
+    elif prob > 0.4:
+        return (
+            "⚠️ Moderate risk. Reduce today's intensity by ~30%. "
+            "Avoid max-effort jumps, sprints, and heavy squats."
+        )
+    else:
+        return (
+            "🟢 Low risk — safe to train. Maintain current progressions. "
+            "Monitor soreness and keep sleep above 7.5 hours."
+        )
+
 
+def fuse_prediction(ml_probability, acwr):
+    """
+    Blend the ML probability with the ACWR workload layer and return
+    ``(final_probability, risk_level, recommendation)``.
+    """
+    # -------- WORKLOAD RISK LAYER (ACWR) --------
     if acwr is None:
         acwr_component = None
     elif acwr <= 0.8:
@@ -174,7 +304,7 @@ def create_prediction(request):
     else:
         acwr_component = 0.9  # overload spike
 
-    # -------- 5) FUSE ML + ACWR --------
+    # -------- FUSE ML + ACWR --------
     if acwr_component is None:
         final_probability = ml_probability
     else:
@@ -183,7 +313,7 @@ def create_prediction(request):
 
     final_probability = max(0.0, min(1.0, final_probability))  # clamp 0–1
 
-    # -------- 6) RISK CLASSIFICATION --------
+    # -------- RISK CLASSIFICATION --------
     if final_probability > 0.7:
         risk_level = "high"
     elif final_probability > 0.4:
@@ -191,33 +321,95 @@ def create_prediction(request):
     else:
         risk_level = "low"
 
-    # -------- 7) PRESCRIPTIVE RECOMMENDATION ENGINE --------
-    def build_recommendation(prob, acwr_val):
-        if acwr_val and acwr_val > 1.5:
-            return (
-                "🚨 Load spike detected — VERY HIGH injury risk. "
-                "Rest today. Reduce next week's workload by 40–60%. "
-                "Avoid explosive sprinting and heavy lifting. "
-                "Hydrate well and increase sleep duration."
-            )
-        if prob > 0.7:
-            return (
-                "❌ High injury risk. Avoid intense training today. "
-                "Replace with mobility work, light stretching, and recovery runs."
-            )
-        elif prob > 0.4:
-            return (
-                "⚠️ Moderate risk. Reduce today's intensity by ~30%. "
-                "Avoid max-effort jumps, sprints, and heavy squats."
-            )
-        else:
-            return (
-                "🟢 Low risk — safe to train. Maintain current progressions. "
-                "Monitor soreness and keep sleep above 7.5 hours."
-            )
-
+    # -------- PRESCRIPTIVE RECOMMENDATION ENGINE --------
     recommendation = build_recommendation(final_probability, acwr)
 
+    return final_probability, risk_level, recommendation
+
+
+def model_unavailable_response(exc):
+    return Response({"error": "Injury model unavailable", "detail": str(exc)},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@api_view(["GET"])
+def model_health(request):
+    """
+    Readiness probe: 200 once this worker's model is loaded and warmed,
+    503 while it is still loading or if loading failed.
+    """
+    from .ml_predictor import holder
+
+    payload = holder.status()
+    code = status.HTTP_200_OK if payload["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return Response(payload, status=code)
+
+
+@api_view(["GET"])
+def inference_metrics(request):
+    """
+    Micro-batching stats (batch-size distribution, queue wait) and
+    prediction cache hit/miss counters.
+    """
+    from .ml_predictor import batcher
+
+    return Response({
+        "batching": batcher.metrics(),
+        "prediction_cache": prediction_cache.stats(),
+    })
+
+
+@api_view(["POST"])
+def create_prediction(request):
+
+    from .ml_predictor import ModelUnavailable, model_version, predict_injury
+
+    workload_model = get_workload_model(request)
+    if workload_model is None:
+        return invalid_workload_model_response()
+
+    # -------- 1) GET ATHLETE --------
+    athlete_id = request.data.get("athlete")
+    athlete = get_object_or_404(
+        AthleteData.objects.select_related("workload"), id=athlete_id)
+
+    # -------- 2) EXTRACT INPUT FEATURES --------
+    features = extract_features(request.data)
+    strain_score = features[-1]
+
+    # -------- 3) CACHED RESULT? --------
+    # Keyed on model + workload versions: a new model or a new session
+    # for this athlete always misses. A hit was produced by ``version``.
+    try:
+        version = model_version()
+        cache_key = fused_cache_key(athlete, workload_model, version, features)
+    except ModelUnavailable as exc:
+        return model_unavailable_response(exc)
+    cached = prediction_cache.get(cache_key)
+
+    if cached is None:
+        # -------- 4) BASE ML PREDICTION --------
+        # The model may have been swapped since the lookup: record and
+        # cache under the version that actually produced the probability
+        try:
+            ml_probability, version = predict_injury(*features)
+        except ModelUnavailable as exc:
+            return model_unavailable_response(exc)
+        cache_key = fused_cache_key(athlete, workload_model, version, features)
+
+        # -------- 5) WORKLOAD RISK LAYER (ACWR) --------
+        # ACWR read from the athlete's maintained workload state
+        acwr = athlete_acwr(athlete, workload_model)
+
+        # -------- 6-7) FUSE, CLASSIFY, RECOMMEND --------
+        final_probability, risk_level, recommendation = fuse_prediction(
+            ml_probability, acwr)
+        prediction_cache.set(cache_key, (
+            ml_probability, acwr, final_probability, risk_level, recommendation))
+    else:
+        (ml_probability, acwr, final_probability,
+         risk_level, recommendation) = cached
+
     # -------- 8) SAVE FINAL PREDICTION --------
     InjuryPrediction.objects.create(
         athlete=athlete,
@@ -225,57 +417,369 @@ def create_prediction(request):
         predicted_probability=final_probability,
         strain_score=strain_score,
         recommendation=recommendation,
-        # ⬅️ NEW FIELD
+        model_version=version,
     )
 
     # -------- 9) SEND RESPONSE TO FRONTEND --------
-    return Response(
-        {
-            "status": "success",
+    return Response(prediction_payload(
+        athlete, workload_model, strain_score, cached is not None,
+        ml_probability, acwr, final_probability, risk_level, recommendation))
+
+
+def prediction_payload(athlete, workload_model, strain_score, cached,
+                       ml_probability, acwr, final_probability, risk_level,
+                       recommendation):
+    return {
+        "status": "success",
+        "athlete": athlete.name,
+        "risk_level": risk_level,
+        "probability": final_probability,
+        "ml_probability": ml_probability,
+        "acwr": acwr,
+        "workload_model": workload_model,
+        "cached": cached,
+
+        "strain_score": strain_score,
+        "recommendation": recommendation,  # ⬅️ NEW
+    }
+
+
+def fused_cache_key(athlete, workload_model, model_version, features):
+    return prediction_cache.make_key(
+        athlete.id, workload_model, athlete.workload_state.version,
+        model_version, features)
+
+
+def team_prediction_payloads(team):
+    """
+    Build one prediction payload per athlete on ``team`` from their latest
+    session. Returns ``(payloads, skipped_athlete_ids)``.
+    """
+    latest_id = (AthleteSession.objects
+                 .filter(athlete=OuterRef("pk"))
+                 .order_by("-session_date", "-id")
+                 .values("id")[:1])
+    athletes = list(AthleteData.objects
+                    .filter(team=team)
+                    .order_by("id")
+                    .annotate(latest_session_id=Subquery(latest_id))
+                    .values_list("id", "latest_session_id"))
+    sessions = AthleteSession.objects.in_bulk(
+        [session_id for _, session_id in athletes if session_id])
+
+    payloads, skipped = [], []
+    for athlete_id, session_id in athletes:
+        if not session_id:
+            skipped.append(athlete_id)
+            continue
+        session = sessions[session_id]
+        payload = {"athlete": athlete_id}
+        payload.update({field: getattr(session, field)
+                        for field in FEATURE_FIELDS})
+        payloads.append(payload)
+    return payloads, skipped
+
+
+@api_view(["POST"])
+def create_batch_prediction(request):
+    """
+    Score many athletes at once: one scaler transform and model call, one
+    bulk insert. Accepts a JSON list of /predict/ payloads, ``{"athletes":
+    [...]}``, or ``{"team": "..."}`` to score every athlete on a team from
+    their latest session. Results come back in input order.
+    """
+    from .ml_predictor import ModelUnavailable, predict_injury_batch
+
+    workload_model = get_workload_model(request)
+    if workload_model is None:
+        return invalid_workload_model_response()
+
+    # -------- 1) COLLECT PAYLOADS --------
+    skipped = []
+    if isinstance(request.data, list):
+        payloads = request.data
+    elif request.data.get("team"):
+        team = request.data["team"]
+        payloads, skipped = team_prediction_payloads(team)
+        if not payloads:
+            if not skipped:
+                return Response({"error": "Team not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+            return Response(
+                {"error": f"No athlete on team '{team}' has a session to score.",
+                 "skipped": skipped},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    else:
+        payloads = request.data.get("athletes")
+
+    if not isinstance(payloads, list) or not payloads:
+        return Response(
+            {"error": "Send a non-empty list of athlete payloads or a team."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # -------- 2) BUILD FEATURE MATRIX --------
+    rows, errors = [], []
+    for index, payload in enumerate(payloads):
+        try:
+            rows.append(extract_features(payload))
+        except (AttributeError, TypeError, ValueError):
+            errors.append({"index": index, "error": "invalid features"})
+            continue
+        if parse_id(payload.get("athlete")) is None:
+            errors.append({"index": index, "error": "invalid athlete id"})
+    if errors:
+        return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    athlete_ids = [parse_id(payload.get("athlete")) for payload in payloads]
+    athletes = (AthleteData.objects
+                .select_related("workload")
+                .in_bulk(athlete_ids))
+    missing = [a for a in athlete_ids if a not in athletes]
+    if missing:
+        return Response({"error": "Athlete not found", "athletes": missing},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    # -------- 3) ONE MODEL CALL --------
+    try:
+        ml_probabilities, version = predict_injury_batch(rows)
+    except ModelUnavailable as exc:
+        return model_unavailable_response(exc)
+
+    # -------- 4) FUSE + BUILD ROWS --------
+    predictions, results = [], []
+    for athlete_id, features, ml_probability in zip(
+            athlete_ids, rows, ml_probabilities):
+        athlete = athletes[athlete_id]
+        ml_probability = float(ml_probability)
+        acwr = athlete_acwr(athlete, workload_model)
+        final_probability, risk_level, recommendation = fuse_prediction(
+            ml_probability, acwr)
+        strain_score = features[-1]
+
+        predictions.append(InjuryPrediction(
+            athlete=athlete,
+            risk_level=risk_level,
+            predicted_probability=final_probability,
+            strain_score=strain_score,
+            recommendation=recommendation,
+            model_version=version,
+        ))
+        results.append({
+            "athlete_id": athlete.id,
             "athlete": athlete.name,
             "risk_level": risk_level,
             "probability": final_probability,
             "ml_probability": ml_probability,
             "acwr": acwr,
-
             "strain_score": strain_score,
-            "recommendation": recommendation,  # ⬅️ NEW
-        }
-    )
+            "recommendation": recommendation,
+        })
+
+    # -------- 5) SAVE ALL PREDICTIONS --------
+    InjuryPrediction.objects.bulk_create(predictions)
+
+    return Response({
+        "status": "success",
+        "workload_model": workload_model,
+        "results": results,
+        "skipped": skipped,
+    })
+
 
+# ----------------- CONDITIONAL GET (ETags) ----------------- #
+#
+# Each ETag comes from one indexed lookup on the athlete row (plus
+# subqueries on the (athlete, date) indexes), computed before the view runs,
+# so a 304 skips aggregation and serialization entirely.
 
+
+def _etag(request, *parts):
+    # The same state renders differently per query string and Accept header
+    key = "|".join([*map(str, parts),
+                    request.META.get("QUERY_STRING", ""),
+                    request.META.get("HTTP_ACCEPT", "")])
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+# AthleteData fields returned by latest_session
+PROFILE_FIELDS = ("name", "age", "sport", "team", "experience_years")
+
+
+def _sessions_state(athlete_id, *fields):
+    """
+    ``(latest_session_id, workload_version, *fields)``, or None for an
+    unknown athlete. Read-only: a missing workload row counts as version 0,
+    the version the view gives it when it builds the row on first use.
+    """
+    latest_session_id = (AthleteSession.objects
+                         .filter(athlete=OuterRef("pk"))
+                         .order_by("-session_date", "-id")
+                         .values("id")[:1])
+    state = (AthleteData.objects
+             .filter(id=athlete_id)
+             .values_list(Subquery(latest_session_id), "workload__version", *fields)
+             .first())
+    if state is None:
+        return None
+    return (state[0], state[1] or 0, *state[2:])
+
+
+def athlete_sessions_etag(request, athlete_id):
+    """
+    Changes whenever the athlete's sessions do: the latest session id plus
+    the workload version, which every session save/delete bumps.
+    """
+    state = _sessions_state(athlete_id)
+    return None if state is None else _etag(request, "sessions", athlete_id, *state)
+
+
+def latest_session_etag(request, athlete_id):
+    """
+    As athlete_sessions_etag, plus the profile fields in the response and
+    today's date: the window/EWMA loads decay day by day without any new
+    session.
+    """
+    state = _sessions_state(athlete_id, *PROFILE_FIELDS)
+    return None if state is None else _etag(
+        request, "latest_session", athlete_id, *state, timezone.localdate())
+
+
+def latest_prediction_etag(request, athlete_id):
+    """Predictions are immutable, so the latest id identifies the response."""
+    latest_prediction_id = (InjuryPrediction.objects
+                            .filter(athlete=OuterRef("pk"))
+                            .order_by("-created_at", "-id")
+                            .values("id")[:1])
+    state = (AthleteData.objects
+             .filter(id=athlete_id)
+             .values_list(Subquery(latest_prediction_id))
+             .first())
+    return None if state is None else _etag(request, "prediction", athlete_id, *state)
+
+
+@condition(etag_func=latest_prediction_etag)
 @api_view(["GET"])
 def latest_prediction(request, athlete_id: int):
     """Return the most recent prediction for an athlete, or 404."""
     get_object_or_404(AthleteData, id=athlete_id)  # validate athlete exists
     pred = (InjuryPrediction.objects
             .filter(athlete_id=athlete_id)
-            .order_by("-created_at")
+            .order_by("-created_at", "-id")
             .first())
     if not pred:
         return Response({"detail": "no prediction yet"}, status=status.HTTP_404_NOT_FOUND)
 
-    return Response({
+    return Response(latest_prediction_payload(athlete_id, pred))
+
+
+def latest_prediction_payload(athlete_id, pred):
+    return {
         "athlete_id": athlete_id,
         "risk_level": pred.risk_level,
         "predicted_probability": pred.predicted_probability,
         "strain_score": pred.strain_score,
+        "model_version": pred.model_version,
         "created_at": pred.created_at,
-    })
+    }
+
+
+def query_param_error_response(exc):
+    return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def paginated_or_list(request, queryset, paginator_class, render):
+    """
+    One cursor page of ``queryset`` if the client asked for one (see
+    pagination.py), otherwise the whole list. ``render`` maps rows to data.
+    """
+    paginator = paginator_class()
+    if not paginator.is_requested(request):
+        return Response(render(queryset))
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(render(page))
+
+
+@api_view(["POST"])
+@parser_classes([JSONParser, CSVParser])
+def bulk_create_sessions(request):
+    """
+    Create many sessions at once from JSON (a list of session objects, or
+    one list per field) or CSV with a header row. Invalid rows are skipped
+    and reported by index; the rest are inserted (see ingest.py).
+    """
+    try:
+        columns = to_columns(request.data)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    received = len(columns["athlete"])
+    if received > MAX_ROWS:
+        return Response(
+            {"error": f"At most {MAX_ROWS} sessions per request"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    values, errors = validate_columns(columns)
+    created = ingest_sessions(values)
+
+    return Response(
+        {
+            "received": received,
+            "created": created,
+            "rejected": len(errors),
+            "errors": errors,
+        },
+        status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+    )
 
 
 @api_view(["GET"])
+@renderer_classes(TIME_SERIES_RENDERERS)
 def athlete_sessions(request, athlete_id: int):
+    """
+    Sessions newest first. Supports ``?from=``/``?to=`` (dates, inclusive),
+    ``?fields=``, cursor pagination via ``?limit=``/``?cursor=`` and the
+    columnar formats in renderers.py.
+    """
     athlete = get_object_or_404(AthleteData, id=athlete_id)
-    sessions = athlete.sessions.order_by("-session_date")
-    serializer = AthleteSessionSerializer(sessions, many=True)
-    return Response(serializer.data)
+    available = tuple(AthleteSessionSerializer().fields)
+    try:
+        fields = requested_fields(request, available)
+        sessions = filter_date_range(
+            athlete.sessions.order_by("-session_date"), request, "session_date")
+    except QueryParamError as exc:
+        return query_param_error_response(exc)
+
+    # session_date is the cursor position, so always load it
+    if wants_columns(request):
+        fields = fields or available
+        return paginated_or_list(
+            request, sessions.values("session_date", *fields),
+            SessionCursorPagination,
+            lambda rows: rows_to_columns(rows, fields))
+
+    if fields:
+        sessions = sessions.only("session_date", *fields)
 
+    return paginated_or_list(
+        request, sessions, SessionCursorPagination,
+        lambda rows: AthleteSessionSerializer(rows, many=True, fields=fields).data)
 
+
+@condition(etag_func=latest_session_etag)
 @api_view(["GET"])
 def latest_session(request, athlete_id):
+    workload_model = get_workload_model(request)
+    if workload_model is None:
+        return invalid_workload_model_response()
+
     try:
-        athlete = AthleteData.objects.get(id=athlete_id)
+        athlete = (AthleteData.objects
+                   .with_rolling_stats()
+                   .select_related("workload")
+                   .get(id=athlete_id))
     except AthleteData.DoesNotExist:
         return Response({"error": "Athlete not found"}, status=404)
 
@@ -288,11 +792,17 @@ def latest_session(request, athlete_id):
     if not session:
         return Response({"error": "No sessions found"}, status=404)
 
+    return Response(
+        latest_session_payload(athlete, session, workload_model), status=200)
+
+
+def latest_session_payload(athlete, session, workload_model):
+    """Athlete profile + latest session + workload + rolling averages."""
     # Compute ACWR safely
     try:
-        acwr_val = float(athlete.acwr) if athlete.acwr is not None else None
+        load = athlete.load_metrics(workload_model)
     except:
-        acwr_val = None
+        load = {"acute_load": None, "chronic_load": None, "acwr": None}
 
     payload = {
         "id": athlete.id,
@@ -312,34 +822,96 @@ def latest_session(request, athlete_id):
         "fatigue_level": session.fatigue_level,
 
         # NEW — RETURN THESE SAFELY
-        "acute_load": getattr(athlete, "acute_load", None),
-        "chronic_load": getattr(athlete, "chronic_load", None),
-        "acwr": acwr_val,
+        "acute_load": load["acute_load"],
+        "chronic_load": load["chronic_load"],
+        "acwr": load["acwr"],
+        "workload_model": workload_model,
     }
 
-    # Add averages (you already had this)
+    # Add averages (annotated by with_rolling_stats in the views)
     payload.update(athlete.last_five_averages)
 
-    return Response(payload, status=200)
+    return payload
+
 
+# athlete_history key -> AthleteDailyLoad column
+HISTORY_COLUMNS = {
+    "date": "day",
+    "sessions": "session_count",
+    "heart_rate": "heart_rate_mean",
+    "sleep_hours": "sleep_mean",
+    "steps": "steps_day_mean",
+    "calories_burned": "calories_mean",
+    "strain_score": "strain_mean",
+    "intensity": "intensity_mean",
+    "strain_total": "strain_sum",
+    "strain_max": "strain_max",
+}
 
+# Step counts stay whole numbers, as on the raw sessions
+HISTORY_ANNOTATIONS = {
+    "steps_day_mean": Cast(Round("steps_mean"), IntegerField()),
+}
+
+
+@condition(etag_func=athlete_sessions_etag)
 @api_view(["GET"])
+@renderer_classes(TIME_SERIES_RENDERERS)
 def athlete_history(request, athlete_id):
-    try:
-        athlete = AthleteData.objects.get(id=athlete_id)
-        sessions = athlete.sessions.order_by("session_date")
-
-        return Response([
-            {
-                "date": s.session_date.date().isoformat(),
-                "heart_rate": s.heart_rate,
-                "sleep_hours": s.sleep_hours,
-                "steps": s.steps,
-                "calories_burned": s.calories_burned,
-                "strain_score": s.strain_score,
-                "intensity": s.calculated_intensity,
-            }
-            for s in sessions
-        ])
-    except AthleteData.DoesNotExist:
+    """
+    One entry per training day from the daily rollup. Metric values are the
+    day's per-session means (steps rounded to a whole number), so
+    single-session days match the raw session.
+    Supports ``?from=``/``?to=``, ``?fields=``, cursor pagination via
+    ``?limit=``/``?cursor=`` and the columnar formats in renderers.py.
+    """
+    if not AthleteData.objects.filter(id=athlete_id).exists():
         return Response({"error": "Athlete not found"}, status=404)
+
+    try:
+        fields = requested_fields(request, tuple(HISTORY_COLUMNS)) or list(HISTORY_COLUMNS)
+        days = filter_date_range(
+            AthleteDailyLoad.objects.filter(athlete_id=athlete_id).order_by("day"),
+            request, "day")
+    except QueryParamError as exc:
+        return query_param_error_response(exc)
+
+    # day is the cursor position, so always select it
+    columns = {"day", *(HISTORY_COLUMNS[name] for name in fields)}
+    days = days.annotate(**{name: expression
+                            for name, expression in HISTORY_ANNOTATIONS.items()
+                            if name in columns}).values(*columns)
+
+    if wants_columns(request):
+        render = lambda rows: rows_to_columns(rows, fields, HISTORY_COLUMNS)
+    else:
+        render = lambda rows: [{name: row[HISTORY_COLUMNS[name]] for name in fields}
+                               for row in rows]
+    return paginated_or_list(request, days, HistoryCursorPagination, render)
+
+
+# ----------------- EVENT STREAM (SSE) ----------------- #
+
+
+@require_GET
+def event_stream(request):
+    """
+    Server-Sent Events feed of new sessions, predictions and wearable
+    readings, optionally limited to ``?athlete=<id>`` or ``?team=<name>``.
+    See events.py.
+    """
+    athlete_id = request.GET.get("athlete")
+    if athlete_id is not None and not athlete_id.isdigit():
+        return JsonResponse({"error": "athlete must be an integer id"}, status=400)
+
+    heartbeat = getattr(settings, "EVENT_STREAM_HEARTBEAT_SECONDS", 15)
+    stream = (asse_stream if isinstance(request, ASGIRequest) else sse_stream)(
+        heartbeat,
+        athlete_id=int(athlete_id) if athlete_id else None,
+        team=request.GET.get("team") or None,
+    )
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+    return response
@@ -0,0 +1,304 @@
+"""
+Vectorized workload engine.
+
+Loads the daily loads of many athletes into flat NumPy columns and computes
+acute/chronic load, ACWR and sleep debt for all of them in one pass,
+instead of calling ``compute_workload_features`` once per athlete.
+"""
+from datetime import timedelta
+from itertools import islice
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import (
+    ACUTE_WINDOW_DAYS,
+    CHRONIC_WINDOW_DAYS,
+    EWMA_ACUTE_DECAY,
+    EWMA_CHRONIC_DECAY,
+    SLEEP_TARGET_HOURS,
+    ROLLING_AVERAGES,
+    AthleteDailyLoad,
+    AthleteData,
+    AthleteSession,
+    AthleteWorkload,
+    InjuryPrediction,
+)
+
+CHUNK_SIZE = 20_000
+
+
+def load_daily_columns(athletes, since, chunk_size=CHUNK_SIZE):
+    """
+    Return ``(athlete_ids, day_ordinals, session_counts, strain, sleep)``
+    arrays from the AthleteDailyLoad rows on or after ``since`` belonging to
+    ``athletes`` (strain and sleep are daily sums).
+
+    ``athletes`` is a list of ids or an AthleteData queryset; a queryset is
+    applied as a subquery, so loading a whole league binds no id list. Rows
+    are copied from the cursor one chunk at a time.
+    """
+    rows = (AthleteDailyLoad.objects
+            .filter(athlete__in=athletes, day__gte=since)
+            .values_list("athlete_id", "day", "session_count",
+                         "strain_sum", "sleep_sum")
+            .iterator(chunk_size=chunk_size))
+
+    chunks = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        count = len(chunk)
+        athlete_col, day_col, count_col, strain_col, sleep_col = zip(*chunk)
+        chunks.append((
+            np.fromiter(athlete_col, dtype=np.int64, count=count),
+            np.fromiter((d.toordinal() for d in day_col), dtype=np.int64, count=count),
+            np.fromiter(count_col, dtype=np.int64, count=count),
+            np.fromiter(strain_col, dtype=np.float64, count=count),
+            np.fromiter(sleep_col, dtype=np.float64, count=count),
+        ))
+
+    if not chunks:
+        empty = np.empty(0)
+        return (empty.astype(np.int64), empty.astype(np.int64),
+                empty.astype(np.int64), empty, empty)
+    return tuple(np.concatenate(column) for column in zip(*chunks))
+
+
+def compute_bulk_workload(athlete_ids, today=None, athletes=None):
+    """
+    Compute the workload features for ``athlete_ids`` (in that order).
+
+    Acute load is the 7-day strain sum, chronic load the 28-day strain sum
+    averaged per week, matching ``AthleteData.acute_load``/``chronic_load``.
+    Sleep debt uses the 7-day average sleep, as ``compute_workload_features``
+    does. Returns a dict of arrays aligned with ``athlete_ids``.
+
+    ``athletes``, the AthleteData queryset the ids were read from, is used
+    in the SQL instead of the id list (see ``load_daily_columns``).
+    """
+    today = today or timezone.localdate()
+    ids = np.asarray(athlete_ids, dtype=np.int64)
+    n = len(ids)
+
+    row_athletes, days, counts, strain, sleep = load_daily_columns(
+        ids.tolist() if athletes is None else athletes,
+        today - timedelta(days=CHRONIC_WINDOW_DAYS))
+
+    # Position of each row's athlete in ``ids``; the subquery may also match
+    # athletes created since the ids were read, so drop those rows
+    order = np.argsort(ids)
+    found = np.minimum(np.searchsorted(ids, row_athletes, sorter=order), max(n - 1, 0))
+    known = (ids[order[found]] == row_athletes if n
+             else np.zeros(len(row_athletes), dtype=bool))
+    group = order[found[known]]
+    days, counts, strain, sleep = days[known], counts[known], strain[known], sleep[known]
+
+    days_ago = today.toordinal() - days
+    acute = days_ago <= ACUTE_WINDOW_DAYS
+
+    acute_count = np.bincount(group, weights=counts * acute, minlength=n)
+    acute_load = np.bincount(group, weights=strain * acute, minlength=n)
+    acute_sleep = np.bincount(group, weights=sleep * acute, minlength=n)
+    # Like the properties, an athlete without sessions in the window gets a
+    # chronic load of 1 (and so an ACWR of 0)
+    chronic_count = np.bincount(group, weights=counts, minlength=n)
+    chronic_load = np.where(chronic_count > 0,
+                            np.bincount(group, weights=strain, minlength=n) / 4, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where(chronic_load > 0, acute_load / chronic_load, 1.0)
+        avg_sleep = np.where(acute_count > 0, acute_sleep / acute_count,
+                             SLEEP_TARGET_HOURS)
+    sleep_debt = np.maximum(0.0, SLEEP_TARGET_HOURS - avg_sleep)
+
+    return {
+        "acute_load": np.round(acute_load, 2),
+        "chronic_load": np.round(chronic_load, 2),
+        "acwr": np.round(acwr, 2),
+        "sleep_debt": np.round(sleep_debt, 2),
+    }
+
+
+def compute_bulk_ewma(athlete_ids, today=None, athletes=None):
+    """
+    EWMA acute load, chronic load and ACWR for ``athlete_ids``, read from the
+    maintained AthleteWorkload rows and decayed to ``today`` in one pass.
+    Matches ``AthleteData.load_metrics("ewma")``, including the ACWR of 1.0
+    for an athlete without sessions.
+
+    ``athletes`` is used in the SQL instead of the id list, as in
+    ``compute_bulk_workload``.
+    """
+    today = today or timezone.localdate()
+    ids = list(athlete_ids)
+    n = len(ids)
+    position = {athlete_id: i for i, athlete_id in enumerate(ids)}
+
+    acute = np.zeros(n)
+    chronic = np.zeros(n)
+    gap = np.zeros(n)
+    states = (AthleteWorkload.objects
+              .filter(athlete__in=ids if athletes is None else athletes,
+                      ewma_day__isnull=False)
+              .values_list("athlete_id", "ewma_acute", "ewma_chronic", "ewma_day"))
+    for athlete_id, ewma_acute, ewma_chronic, ewma_day in states:
+        i = position.get(athlete_id)
+        if i is None:
+            continue  # created since the ids were read
+        acute[i] = ewma_acute
+        chronic[i] = ewma_chronic
+        gap[i] = max((today - ewma_day).days, 0)
+
+    acute *= (1 - EWMA_ACUTE_DECAY) ** gap
+    chronic *= (1 - EWMA_CHRONIC_DECAY) ** gap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where(chronic > 0, acute / chronic, 1.0)
+
+    return {
+        "acute_load": np.round(acute, 2),
+        "chronic_load": np.round(chronic, 2),
+        "acwr": np.round(acwr, 2),
+    }
+
+
+def acwr_risk_components(acwr):
+    """Vectorized ``views.acwr_risk_component``."""
+    acwr = np.asarray(acwr, dtype=np.float64)
+    return np.select(
+        [acwr <= 0, acwr < 0.8, acwr <= 1.3, acwr <= 1.5, acwr <= 2.0],
+        [0.5, 0.4, 0.1, 0.4, 0.7],
+        default=0.9,
+    )
+
+
+def sleep_risk_components(sleep_debt):
+    """Vectorized ``views.sleep_risk_component``."""
+    return np.clip(np.asarray(sleep_debt, dtype=np.float64) / 3.0, 0.0, 1.0)
+
+
+def team_workload(team=None, model="window", columnar=False):
+    """
+    Workload rows for every athlete (optionally only one team), ready to be
+    returned from the bulk endpoint. With ``model="ewma"`` the loads and
+    ACWR come from the EWMA state; sleep debt always uses the 7-day window.
+    ``columnar=True`` returns one list per field instead of row dicts.
+    """
+    roster = AthleteData.objects.all()
+    if team:
+        roster = roster.filter(team=team)
+    athletes = list(roster.order_by("id").values_list("id", "name", "team"))
+    if not athletes:
+        return {"athlete_id": [], "name": [], "team": []} if columnar else []
+
+    ids, names, teams = zip(*athletes)
+    features = compute_bulk_workload(ids, athletes=roster)
+    if model == "ewma":
+        features.update(compute_bulk_ewma(ids, athletes=roster))
+    acwr_risk = acwr_risk_components(features["acwr"])
+    sleep_risk = sleep_risk_components(features["sleep_debt"])
+
+    columns = {name: values.tolist() for name, values in features.items()}
+    columns["acwr_risk"] = acwr_risk.tolist()
+    columns["sleep_risk"] = np.round(sleep_risk, 2).tolist()
+
+    if columnar:
+        return {"athlete_id": list(ids), "name": list(names),
+                "team": list(teams), **columns}
+
+    return [
+        {
+            "athlete_id": athlete_id,
+            "name": names[i],
+            "team": teams[i],
+            **{name: values[i] for name, values in columns.items()},
+        }
+        for i, athlete_id in enumerate(ids)
+    ]
+
+
+# team_summary key -> AthleteSession field of the latest session
+LATEST_SESSION_FIELDS = {
+    "session_date": "session_date",
+    "heart_rate": "heart_rate",
+    "sleep_hours": "sleep_hours",
+    "steps": "steps",
+    "calories_burned": "calories_burned",
+    "intensity": "calculated_intensity",
+    "strain_score": "strain_score",
+    "fatigue_level": "fatigue_level",
+}
+
+# team_summary key -> InjuryPrediction field of the latest prediction
+LATEST_PREDICTION_FIELDS = {
+    "risk_level": "risk_level",
+    "predicted_probability": "predicted_probability",
+    "created_at": "created_at",
+}
+
+
+def rows_by_id(queryset, ids, fields):
+    """``{id: {key: value}}`` of the ``queryset`` rows with these ids."""
+    rows = queryset.filter(id__in=[i for i in ids if i is not None])
+    return {row["id"]: {key: row[field] for key, field in fields.items()}
+            for row in rows.values("id", *fields.values())}
+
+
+def team_summary(team, model="window"):
+    """
+    Roster rows for ``team``: latest session, last-five averages, workload
+    and latest prediction per athlete. The profile, averages and the ids of
+    the latest session and prediction come from one annotated SELECT (each
+    correlated ``LIMIT 1`` subquery seeks the per-athlete indexes, so no
+    athlete's history is scanned), those rows from one primary-key lookup
+    each, the loads from ``compute_bulk_workload`` and, for
+    ``model="ewma"``, ``compute_bulk_ewma``, so the query count doesn't grow
+    with roster size or history.
+    """
+    sessions = (AthleteSession.objects
+                .filter(athlete=OuterRef("pk"))
+                .order_by("-session_date", "-id"))
+    predictions = (InjuryPrediction.objects
+                   .filter(athlete=OuterRef("pk"))
+                   .order_by("-created_at", "-id"))
+    roster = AthleteData.objects.filter(team=team)
+    athletes = list(roster
+                    .order_by("name", "id")
+                    .with_rolling_stats()
+                    .annotate(latest_session_id=Subquery(sessions.values("id")[:1]),
+                              latest_prediction_id=Subquery(predictions.values("id")[:1]))
+                    .values("id", "name", "sport", "experience_years",
+                            "latest_session_id", "latest_prediction_id",
+                            *ROLLING_AVERAGES))
+    if not athletes:
+        return []
+
+    sessions = rows_by_id(AthleteSession.objects,
+                          [row["latest_session_id"] for row in athletes],
+                          LATEST_SESSION_FIELDS)
+    predictions = rows_by_id(InjuryPrediction.objects,
+                             [row["latest_prediction_id"] for row in athletes],
+                             LATEST_PREDICTION_FIELDS)
+
+    ids = [row["id"] for row in athletes]
+    features = compute_bulk_workload(ids, athletes=roster)
+    if model == "ewma":
+        features.update(compute_bulk_ewma(ids, athletes=roster))
+    loads = {name: features[name].tolist()
+             for name in ("acute_load", "chronic_load", "acwr")}
+
+    rows = []
+    for i, row in enumerate(athletes):
+        rows.append({
+            "athlete_id": row["id"],
+            "name": row["name"],
+            "sport": row["sport"],
+            "experience_years": row["experience_years"],
+            "latest_session": sessions.get(row["latest_session_id"]),
+            **{name: row[name] for name in ROLLING_AVERAGES},
+            **{name: values[i] for name, values in loads.items()},
+            "latest_prediction": predictions.get(row["latest_prediction_id"]),
+        })
+    return rows
@@ -13,14 +13,37 @@ SELECTED_ATHLETE_ID = 9
 # ------------------------------------------------------------
 # BACKEND FETCHING
 # ------------------------------------------------------------
+def conditional_get(url: str, headers=None):
+    """
+    GET that sends the last ETag seen for ``url``. On 304 the body cached in
+    the session is replayed. Returns (status_code, json or None).
+    """
+    cache = st.session_state.setdefault("etag_cache", {})
+    key = (url, tuple(sorted((headers or {}).items())))
+    headers = dict(headers or {})
+    if key in cache:
+        headers["If-None-Match"] = cache[key][0]
+
+    res = requests.get(url, headers=headers, timeout=10)
+    if res.status_code == 304:
+        return 200, cache[key][1]
+    if res.status_code != 200:
+        return res.status_code, None
+
+    data = res.json()
+    if res.headers.get("ETag"):
+        cache[key] = (res.headers["ETag"], data)
+    return 200, data
+
+
 def get_latest_session(athlete_id: int = SELECTED_ATHLETE_ID):
     try:
-        res = requests.get(
-            f"{BASE_URL}/athletes/{athlete_id}/latest_session/", timeout=10)
-        if res.status_code == 200:
-            return res.json()
+        status_code, data = conditional_get(
+            f"{BASE_URL}/athletes/{athlete_id}/latest_session/")
+        if status_code == 200:
+            return data
         else:
-            st.error(f"Backend error {res.status_code} on latest_session")
+            st.error(f"Backend error {status_code} on latest_session")
             return {}
     except Exception as e:
         st.error(f"❌ Could not reach backend: {e}")
@@ -28,15 +51,17 @@ def get_latest_session(athlete_id: int = SELECTED_ATHLETE_ID):
 
 
 def get_session_history(athlete_id: int = SELECTED_ATHLETE_ID):
+    """Daily history as columns ({field: [values...]}), ready for pd.DataFrame."""
     try:
-        res = requests.get(
-            f"{BASE_URL}/athletes/{athlete_id}/history/", timeout=10)
-        if res.status_code == 200:
-            return res.json()
+        status_code, data = conditional_get(
+            f"{BASE_URL}/athletes/{athlete_id}/history/",
+            headers={"Accept": "application/vnd.tracker.columns+json"})
+        if status_code == 200:
+            return data
         else:
-            return []
+            return {}
     except Exception:
-        return []
+        return {}
 
 
 # ------------------------------------------------------------
@@ -113,12 +138,9 @@ if page == "🏠 Dashboard":
     col6.metric("💪 Strain Score", f"{latest['strain_score']:.2f}")
 
     try:
-        r = requests.get(
-            f"{BASE_URL}/predictions/latest/{SELECTED_ATHLETE_ID}/",
-            timeout=10,
-        )
-        if r.status_code == 200:
-            pred = r.json()
+        status_code, pred = conditional_get(
+            f"{BASE_URL}/predictions/latest/{SELECTED_ATHLETE_ID}/")
+        if status_code == 200:
             risk_pct = float(pred["predicted_probability"]) * 100.0
             # 0–10 scale from backend
             strain_idx = float(pred["strain_score"])
@@ -139,7 +161,7 @@ if page == "🏠 Dashboard":
     st.subheader("📈 Performance Trends")
 
     history = get_session_history()
-    if not history:
+    if not history.get("date"):
         st.info("No historical data available.")
         st.stop()
 
@@ -156,7 +178,7 @@ if page == "🏠 Dashboard":
                                 title="Heart Rate Over Time"),
                         use_container_width=True)
         st.plotly_chart(px.bar(df, x="session_date", y="steps",
-                               title="Steps Per Session"),
+                               title="Average Steps Per Day"),
                         use_container_width=True)
 
     with colB:
@@ -193,12 +215,10 @@ elif page == "🧠 AI Prevention":
     # --------------------------------------------------
     history = []
     try:
-        hist_resp = requests.get(
-            f"{BASE_URL}/athletes/{SELECTED_ATHLETE_ID}/history/",
-            timeout=10,
-        )
-        if hist_resp.status_code == 200:
-            history = hist_resp.json()
+        status_code, data = conditional_get(
+            f"{BASE_URL}/athletes/{SELECTED_ATHLETE_ID}/history/")
+        if status_code == 200:
+            history = data
         else:
             st.warning("Could not load training history.")
     except Exception as e:
@@ -209,10 +229,10 @@ elif page == "🧠 AI Prevention":
     # --------------------------------------------------
     def compute_acwr(sessions):
         """
-        Acute: last 3 sessions (most recent)
-        Chronic: last 7 sessions (training base)
-        sessions is ordered oldest -> newest by the backend,
-        so we take the last ones here.
+        Acute: last 3 training days (most recent)
+        Chronic: last 7 training days (training base)
+        sessions is the backend's daily history, ordered
+        oldest -> newest, so we take the last ones here.
         """
         if len(sessions) < 4:
             return None
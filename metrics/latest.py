@@ -0,0 +1,43 @@
+"""
+Process-local slot holding the newest wearable reading.
+
+Uploads offer every reading they accept, and ``latest_data`` answers from
+the slot without touching the database. Each worker process has its own
+slot, so a reading is only kept for ``ttl_seconds``: after that the next
+read goes back to the indexed query and picks up readings uploaded
+through other workers.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+
+class LatestReading:
+    def __init__(self, ttl_seconds=2.0):
+        self.ttl_seconds = ttl_seconds
+        self._reading = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The held reading, or None if there is none or it went stale."""
+        with self._lock:
+            if self._reading is not None and time.monotonic() >= self._expires:
+                self._reading = None
+            return self._reading
+
+    def offer(self, reading):
+        """Keep ``reading`` if it is at least as new as the current one."""
+        with self._lock:
+            current = self._reading
+            if current is None or reading.timestamp >= current.timestamp:
+                self._reading = reading
+                self._expires = time.monotonic() + self.ttl_seconds
+
+    def clear(self):
+        with self._lock:
+            self._reading = None
+
+
+latest_reading = LatestReading(getattr(settings, 'METRICS_LATEST_TTL_SECONDS', 2.0))
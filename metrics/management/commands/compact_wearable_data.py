@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from metrics.rollups import compact
+
+
+class Command(BaseCommand):
+    help = ("Roll raw wearable readings up into 1-minute and hourly buckets "
+            "and drop data past its retention age. Run it periodically "
+            "(e.g. every few minutes from cron).")
+
+    def handle(self, *args, **kwargs):
+        counts = compact()
+        self.stdout.write(self.style.SUCCESS(
+            "Wrote {minute_buckets} minute and {hour_buckets} hour buckets; "
+            "dropped {raw_deleted} raw readings and "
+            "{minute_buckets_deleted} minute buckets.".format(**counts)))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0002_wearabledata_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WearableRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.PositiveIntegerField(choices=[(60, 'minute'), (3600, 'hour')])),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField()),
+                ('heart_rate_min', models.IntegerField()),
+                ('heart_rate_max', models.IntegerField()),
+                ('heart_rate_mean', models.FloatField()),
+                ('steps_sum', models.BigIntegerField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('resolution', 'bucket_start'), name='metrics_rollup_res_bucket')],
+            },
+        ),
+    ]
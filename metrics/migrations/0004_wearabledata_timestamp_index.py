@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0003_wearablerollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wearabledata',
+            index=models.Index(fields=['timestamp'], name='metrics_wd_timestamp_idx'),
+        ),
+    ]
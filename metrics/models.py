@@ -1,12 +1,48 @@
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
 class WearableData(models.Model):
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set on receipt (or by the device), not at insert: readings from the
+    # NDJSON upload are written later in batches
+    timestamp = models.DateTimeField(default=timezone.now)
     heart_rate = models.IntegerField()
     fatigue_level = models.IntegerField()
     sleep_hours = models.FloatField()
     steps = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            # Latest reading, time-range reads and compaction
+            models.Index(fields=['timestamp'], name='metrics_wd_timestamp_idx'),
+        ]
+
+    def __str__(self):
+        return f"Data @ {self.timestamp}"
+
+
+class WearableRollup(models.Model):
+    """
+    WearableData aggregated into fixed UTC buckets: 1-minute buckets from
+    raw readings, hourly buckets from the minute tier (see rollups.py).
+    """
+    MINUTE = 60
+    HOUR = 3600
+    RESOLUTIONS = [(MINUTE, 'minute'), (HOUR, 'hour')]
+
+    resolution = models.PositiveIntegerField(choices=RESOLUTIONS)  # seconds
+    bucket_start = models.DateTimeField()
+    count = models.PositiveIntegerField()
+    heart_rate_min = models.IntegerField()
+    heart_rate_max = models.IntegerField()
+    heart_rate_mean = models.FloatField()
+    steps_sum = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resolution', 'bucket_start'],
+                                    name='metrics_rollup_res_bucket'),
+        ]
+
     def __str__(self):
-        return f"Data @ {self.timestamp}"
\ No newline at end of file
+        return f"{self.get_resolution_display()} @ {self.bucket_start}"
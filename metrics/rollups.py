@@ -0,0 +1,231 @@
+"""
+Tiered downsampling and retention for WearableData.
+
+``compact()`` rolls raw readings up into 1-minute buckets, minute buckets
+into hourly ones, then drops raw readings (and minute buckets) past their
+retention age. Hourly buckets are kept. ``read_series()`` answers a time
+range from the coarsest tier that still resolves the requested step and
+whose retention covers the range, filling the not yet compacted tail from
+the finer tiers.
+
+Buckets are recomputed from a short look-back window on every run, so
+readings that arrive late (write-behind, devices syncing after being
+offline) are folded in, as long as they arrive before raw retention
+drops them.
+"""
+import datetime
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from django.db.models.functions import TruncHour, TruncMinute
+from django.utils import timezone
+
+from .models import WearableData, WearableRollup
+
+UTC = datetime.timezone.utc
+ROLLUP_FIELDS = ['count', 'heart_rate_min', 'heart_rate_max',
+                 'heart_rate_mean', 'steps_sum']
+
+# Points returned when the client doesn't ask for a step
+DEFAULT_POINTS = 300
+
+
+def raw_retention():
+    return timedelta(hours=getattr(settings, 'METRICS_RAW_RETENTION_HOURS', 48))
+
+
+def minute_retention():
+    return timedelta(days=getattr(settings, 'METRICS_MINUTE_RETENTION_DAYS', 30))
+
+
+def late_arrival():
+    return timedelta(minutes=getattr(settings, 'METRICS_LATE_ARRIVAL_MINUTES', 10))
+
+
+def floor_to(moment, seconds):
+    """Start of the UTC bucket of ``seconds`` containing ``moment``."""
+    epoch = int(moment.timestamp())
+    return datetime.datetime.fromtimestamp(epoch - epoch % seconds, tz=UTC)
+
+
+def _upsert(rows, resolution):
+    WearableRollup.objects.bulk_create(
+        [WearableRollup(resolution=resolution, **row) for row in rows],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['resolution', 'bucket_start'],
+        update_fields=ROLLUP_FIELDS,
+    )
+    return len(rows)
+
+
+def roll_up_minutes(start, end):
+    """(Re)compute minute buckets in [start, end) from raw readings."""
+    rows = list(WearableData.objects
+                .filter(timestamp__gte=start, timestamp__lt=end)
+                .annotate(bucket_start=TruncMinute('timestamp', tzinfo=UTC))
+                .order_by()
+                .values('bucket_start')
+                .annotate(count=Count('id'),
+                          heart_rate_min=Min('heart_rate'),
+                          heart_rate_max=Max('heart_rate'),
+                          heart_rate_mean=Avg('heart_rate'),
+                          steps_sum=Sum('steps')))
+    return _upsert(rows, WearableRollup.MINUTE)
+
+
+def roll_up_hours(start, end):
+    """(Re)compute hourly buckets in [start, end) from minute buckets."""
+    rows = list(WearableRollup.objects
+                .filter(resolution=WearableRollup.MINUTE,
+                        bucket_start__gte=start, bucket_start__lt=end)
+                .annotate(hour=TruncHour('bucket_start', tzinfo=UTC))
+                .order_by()
+                .values('hour')
+                .annotate(total=Sum('count'),
+                          hr_min=Min('heart_rate_min'),
+                          hr_max=Max('heart_rate_max'),
+                          hr_weighted=Sum(F('heart_rate_mean') * F('count')),
+                          steps=Sum('steps_sum')))
+    return _upsert([
+        {
+            'bucket_start': row['hour'],
+            'count': row['total'],
+            'heart_rate_min': row['hr_min'],
+            'heart_rate_max': row['hr_max'],
+            'heart_rate_mean': row['hr_weighted'] / row['total'],
+            'steps_sum': row['steps'],
+        }
+        for row in rows
+    ], WearableRollup.HOUR)
+
+
+def compact(now=None):
+    """
+    Roll up complete minutes and hours, then apply retention. Returns a
+    dict of row counts.
+    """
+    now = now or timezone.now()
+    minute_end = floor_to(now, WearableRollup.MINUTE)
+    hour_end = floor_to(now, WearableRollup.HOUR)
+    raw_cutoff = now - raw_retention()
+
+    # Resume from the newest minute bucket, minus a late-arrival margin (all
+    # raw rows after it are still retained, since the margin is far shorter
+    # than raw retention)
+    newest = (WearableRollup.objects
+              .filter(resolution=WearableRollup.MINUTE)
+              .order_by('-bucket_start')
+              .values_list('bucket_start', flat=True)
+              .first())
+    if newest is None:
+        oldest_raw = (WearableData.objects.order_by('timestamp')
+                      .values_list('timestamp', flat=True).first())
+        since = oldest_raw or minute_end
+    else:
+        since = newest - late_arrival()
+    since = floor_to(since, WearableRollup.MINUTE)
+
+    with transaction.atomic():
+        minutes = roll_up_minutes(since, minute_end)
+        hours = roll_up_hours(floor_to(since, WearableRollup.HOUR), hour_end)
+
+        raw_deleted, _ = (WearableData.objects
+                          .filter(timestamp__lt=min(raw_cutoff, minute_end))
+                          .delete())
+        minutes_deleted, _ = (WearableRollup.objects
+                              .filter(resolution=WearableRollup.MINUTE,
+                                      bucket_start__lt=min(now - minute_retention(),
+                                                           hour_end))
+                              .delete())
+
+    return {
+        'minute_buckets': minutes,
+        'hour_buckets': hours,
+        'raw_deleted': raw_deleted,
+        'minute_buckets_deleted': minutes_deleted,
+    }
+
+
+# Tiers from coarsest to finest: (name, resolution in seconds)
+TIERS = [('hour', WearableRollup.HOUR), ('minute', WearableRollup.MINUTE),
+         ('raw', 0)]
+
+
+def choose_tier(start, end, step=None, now=None):
+    """
+    Coarsest tier whose resolution is at most ``step`` (default: the range
+    split into DEFAULT_POINTS) and whose retention still covers ``start``.
+    If none does, the finest tier that covers ``start`` (hourly buckets are
+    never dropped).
+    """
+    now = now or timezone.now()
+    if step is None:
+        step = (end - start).total_seconds() / DEFAULT_POINTS
+    oldest = {
+        'hour': None,
+        'minute': now - minute_retention(),
+        'raw': now - raw_retention(),
+    }
+    covering = [(name, resolution) for name, resolution in TIERS
+                if oldest[name] is None or start >= oldest[name]]
+    for name, resolution in covering:
+        if resolution <= step:
+            return name, resolution
+    return covering[-1]
+
+
+def compacted_until(resolution):
+    """End of the newest ``resolution`` bucket, or None if there are none."""
+    newest = (WearableRollup.objects
+              .filter(resolution=resolution)
+              .order_by('-bucket_start')
+              .values_list('bucket_start', flat=True)
+              .first())
+    return newest and newest + timedelta(seconds=resolution)
+
+
+def _raw_points(start, end):
+    return [
+        {
+            'bucket_start': row['timestamp'],
+            'count': 1,
+            'heart_rate_min': row['heart_rate'],
+            'heart_rate_max': row['heart_rate'],
+            'heart_rate_mean': float(row['heart_rate']),
+            'steps_sum': row['steps'],
+        }
+        for row in WearableData.objects
+        .filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by('timestamp')
+        .values('timestamp', 'heart_rate', 'steps')
+    ]
+
+
+def read_series(start, end, step=None):
+    """
+    ``(tier, resolution, points)`` for [start, end), oldest first. The part
+    of the range after the chosen tier's newest bucket (not compacted yet)
+    is read from the next finer tier, down to raw readings, so those points
+    are finer than ``resolution``.
+    """
+    tier, resolution = choose_tier(start, end, step)
+    points = []
+    for name, tier_resolution in TIERS[TIERS.index((tier, resolution)):]:
+        if start >= end:
+            break
+        if name == 'raw':
+            points += _raw_points(start, end)
+            break
+        until = compacted_until(tier_resolution)
+        upto = min(end, until) if until else start
+        if upto > start:
+            points += (WearableRollup.objects
+                       .filter(resolution=tier_resolution,
+                               bucket_start__gte=start, bucket_start__lt=upto)
+                       .order_by('bucket_start')
+                       .values('bucket_start', *ROLLUP_FIELDS))
+            start = upto
+    return tier, resolution, points
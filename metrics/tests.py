@@ -1,3 +1,224 @@
+import datetime
+import json
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from . import latest, rollups, views
+from .latest import latest_reading
+from .models import WearableData, WearableRollup
+from .write_behind import WriteBehindQueue
+
+
+def reading(**overrides):
+    data = {'heart_rate': 72, 'fatigue_level': 2, 'sleep_hours': 7.5,
+            'steps': 40}
+    data.update(overrides)
+    return data
+
+
+def ndjson(*rows):
+    return '\n'.join(r if isinstance(r, str) else json.dumps(r)
+                     for r in rows).encode()
+
+
+class WriteBehindQueueTests(TestCase):
+    def test_flushes_when_full(self):
+        queue = WriteBehindQueue(WearableData, max_rows=3, max_delay_ms=60_000)
+        queue.extend([views.parse_reading(reading()) for _ in range(2)])
+        self.assertEqual(WearableData.objects.count(), 0)
+
+        queue.extend([views.parse_reading(reading())])
+        self.assertEqual(WearableData.objects.count(), 3)
+        self.assertEqual(queue.metrics()['flushes'], 1)
+
+
+class UploadStreamTests(TestCase):
+    def setUp(self):
+        # Keep the timer out of the test transaction; flush explicitly
+        patcher = mock.patch.object(views.write_queue, 'max_delay', 60)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(views.write_queue.flush)
+
+    def post(self, body):
+        return self.client.post('/api/metrics/upload/stream/', body,
+                                content_type='application/x-ndjson')
+
+    def test_accepts_valid_lines_and_reports_bad_ones(self):
+        body = ndjson(reading(timestamp='2026-01-01T10:00:00Z'),
+                      '{not json',
+                      reading(steps='many'),
+                      '',
+                      reading(heart_rate=None),
+                      reading())
+        response = self.post(body)
+
+        self.assertEqual(response.status_code, 202)
+        result = response.json()
+        self.assertEqual((result['accepted'], result['rejected']), (2, 3))
+        self.assertEqual([e['line'] for e in result['errors']], [2, 3, 5])
+
+        views.write_queue.flush()
+        self.assertEqual(WearableData.objects.count(), 2)
+        self.assertTrue(WearableData.objects.filter(
+            timestamp__year=2026, timestamp__month=1).exists())
+
+    def test_deeply_nested_line_is_a_line_error(self):
+        body = ndjson(reading(heart_rate=150), '[' * 100_000 + ']' * 100_000, reading())
+        with mock.patch.object(views, 'publish_reading') as publish:
+            response = self.post(body)
+
+        result = response.json()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((result['accepted'], result['rejected']), (2, 1))
+        self.assertEqual(result['errors'][0]['line'], 2)
+        self.assertEqual(publish.call_count, 2)
+
+    def test_readings_are_shared_only_once_queued(self):
+        latest_reading.clear()
+        self.addCleanup(latest_reading.clear)
+        with mock.patch.object(views.write_queue, 'extend', side_effect=RuntimeError), \
+                mock.patch.object(views, 'publish_reading') as publish:
+            with self.assertRaises(RuntimeError):
+                self.post(ndjson(reading()))
+        publish.assert_not_called()
+        self.assertIsNone(latest_reading.get())
+
+    def test_queue_metrics_endpoint(self):
+        self.post(ndjson(reading(), reading()))
+        body = self.client.get('/api/metrics/upload/queue/').json()
+        self.assertEqual(body['queued'], 2)
+        self.assertIn('rows_failed', body)
+
+    def test_all_rejected(self):
+        self.assertEqual(self.post(ndjson('[]', 'null')).status_code, 400)
+
+    def test_non_finite_and_fractional_counts_are_rejected(self):
+        response = self.post(ndjson('{"heart_rate": Infinity, "fatigue_level": 1, '
+                                    '"sleep_hours": 7, "steps": 1}',
+                                    reading(steps=7.9),
+                                    reading(sleep_hours='NaN'),
+                                    reading(heart_rate='80', steps=12.0)))
+        result = response.json()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual([e['line'] for e in result['errors']], [1, 2, 3])
+        self.assertIn('whole number', result['errors'][1]['error'])
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.now = datetime.datetime(2026, 3, 2, 12, 0, 30, tzinfo=datetime.timezone.utc)
+
+    def add(self, minutes_ago, heart_rate, steps=10):
+        WearableData.objects.create(
+            timestamp=self.now - datetime.timedelta(minutes=minutes_ago),
+            heart_rate=heart_rate, fatigue_level=1, sleep_hours=7, steps=steps)
+
+    def test_compacts_into_minute_and_hour_tiers(self):
+        # 11:00-11:59 (two readings per minute) plus three days-old readings
+        for minute in range(1, 61):
+            self.add(minute, heart_rate=60 + minute)
+            self.add(minute - 0.25, heart_rate=60 + minute)
+        self.add(3 * 24 * 60, heart_rate=100)
+
+        counts = rollups.compact(now=self.now)
+
+        hour = WearableRollup.objects.get(resolution=WearableRollup.HOUR,
+                                          bucket_start=self.now.replace(hour=11, minute=0, second=0))
+        self.assertEqual((hour.count, hour.steps_sum), (120, 1200))
+        self.assertEqual((hour.heart_rate_min, hour.heart_rate_max), (61, 120))
+        self.assertAlmostEqual(hour.heart_rate_mean, 90.5)
+        # The 3-day-old reading is rolled up before raw retention drops it
+        self.assertEqual(counts['raw_deleted'], 1)
+        self.assertEqual(WearableData.objects.count(), 120)
+
+        # Re-running is idempotent, and late readings are folded in
+        self.add(2, heart_rate=200)
+        rollups.compact(now=self.now)
+        hour.refresh_from_db()
+        self.assertEqual((hour.count, hour.heart_rate_max), (121, 200))
+
+    def test_reads_pick_the_coarsest_covering_tier(self):
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            day = datetime.timedelta(days=1)
+            self.assertEqual(rollups.choose_tier(self.now - day, self.now)[0], 'minute')
+            self.assertEqual(rollups.choose_tier(self.now - 30 * day, self.now)[0], 'hour')
+            self.assertEqual(rollups.choose_tier(self.now - datetime.timedelta(minutes=30),
+                                                 self.now)[0], 'raw')
+            # Raw no longer covers a week ago, even at a fine step
+            self.assertEqual(rollups.choose_tier(self.now - 7 * day, self.now - 6 * day,
+                                                 step=1)[0], 'minute')
+
+    def test_series_endpoint(self):
+        self.add(5, heart_rate=80)
+        rollups.compact(now=self.now)
+        response = self.client.get('/api/metrics/series/', {
+            'from': '2026-03-02T11:00:00Z', 'to': '2026-03-02T12:00:00Z', 'step': 60})
+        body = response.json()
+        self.assertIn(body['tier'], ('minute', 'hour'))
+        self.assertEqual(self.client.get('/api/metrics/series/', {'from': 'x'}).status_code, 400)
+        for step in ('abc', '-5', 'nan', '0', 'inf'):
+            response = self.client.get('/api/metrics/series/', {'step': step})
+            self.assertEqual(response.status_code, 400, step)
+
+    def test_uncompacted_tail_is_read_from_finer_tiers(self):
+        self.add(30, heart_rate=70)
+        rollups.compact(now=self.now)
+        # Arrives after the last compaction run
+        self.add(-0.5, heart_rate=150)
+
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            tier, _, points = rollups.read_series(
+                self.now - datetime.timedelta(hours=2),
+                self.now + datetime.timedelta(minutes=1), step=3600)
+        self.assertEqual(tier, 'hour')
+        self.assertEqual([p['heart_rate_mean'] for p in points], [70, 150])
+
+
+class LatestDataTests(TestCase):
+    def setUp(self):
+        latest_reading.clear()
+        self.addCleanup(latest_reading.clear)
+
+    def test_cold_slot_uses_newest_timestamp_then_serves_from_memory(self):
+        for day, heart_rate in ((3, 70), (1, 90), (2, 80)):
+            WearableData.objects.create(
+                timestamp=datetime.datetime(2026, 1, day, tzinfo=datetime.timezone.utc),
+                heart_rate=heart_rate, fatigue_level=1, sleep_hours=7, steps=10)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/metrics/latest/').json()['heart_rate'], 70)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/metrics/latest/').json()['heart_rate'], 70)
+
+    def test_uploads_update_the_slot(self):
+        self.client.post('/api/metrics/upload/', reading(heart_rate=101),
+                         content_type='application/json')
+        with mock.patch.object(views.write_queue, 'max_delay', 60):
+            self.client.post('/api/metrics/upload/stream/',
+                             ndjson(reading(heart_rate=102),
+                                    reading(heart_rate=50, timestamp='2020-01-01T00:00:00Z')),
+                             content_type='application/x-ndjson')
+            views.write_queue.flush()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/metrics/latest/').json()['heart_rate'], 102)
+
+    def test_uploaded_values_are_coerced_before_being_shared(self):
+        response = self.client.post('/api/metrics/upload/', reading(heart_rate='80', steps='120'),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(latest_reading.get().heart_rate, 80)
+        self.assertEqual(self.client.get('/api/metrics/latest/').json()['steps'], 120)
+
+        response = self.client.post('/api/metrics/upload/', reading(steps=7.9),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_slot_expires_so_other_workers_uploads_are_seen(self):
+        self.client.get('/api/metrics/latest/')
+        WearableData.objects.create(heart_rate=120, fatigue_level=1, sleep_hours=7, steps=10)
+        later = latest.time.monotonic() + latest_reading.ttl_seconds
+        with mock.patch.object(latest.time, 'monotonic', return_value=later):
+            self.assertEqual(self.client.get('/api/metrics/latest/').json()['heart_rate'], 120)
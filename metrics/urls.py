@@ -3,5 +3,8 @@ from . import views
 
 urlpatterns = [
     path('upload/', views.upload_data),
+    path('upload/stream/', views.upload_stream),
+    path('upload/queue/', views.queue_metrics),
     path('latest/', views.latest_data),
+    path('series/', views.series),
 ]
\ No newline at end of file
@@ -1,26 +1,108 @@
 from django.shortcuts import render
+from django.conf import settings
 from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from backend.tracker.events import bus
+from .latest import latest_reading
 from .models import WearableData
+from .rollups import read_series
+from .write_behind import WriteBehindQueue
+import atexit
 import json
+import math
+from datetime import timedelta
+
+# Readings from upload_stream are buffered and written in batches
+write_queue = WriteBehindQueue(
+    WearableData,
+    max_rows=getattr(settings, 'METRICS_FLUSH_ROWS', 500),
+    max_delay_ms=getattr(settings, 'METRICS_FLUSH_INTERVAL_MS', 1000),
+)
+atexit.register(write_queue.flush)
+
+# Required reading field -> type
+READING_FIELDS = {
+    'heart_rate': int,
+    'fatigue_level': int,
+    'sleep_hours': float,
+    'steps': int,
+}
+MAX_REPORTED_ERRORS = 100
+
+
+def _number(value, field, whole=False):
+    """Finite float, or int when ``whole``; 7.9 is not a step count."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"'{field}' must be a number")
+    if not math.isfinite(number):
+        raise ValueError(f"'{field}' must be a finite number")
+    if whole:
+        if not number.is_integer():
+            raise ValueError(f"'{field}' must be a whole number")
+        return int(number)
+    return number
+
+
+def parse_reading(data):
+    """Unsaved WearableData from one decoded reading. Raises ValueError."""
+    if not isinstance(data, dict):
+        raise ValueError('expected a JSON object')
+
+    values = {}
+    for field, cast in READING_FIELDS.items():
+        if data.get(field) is None:
+            raise ValueError(f"'{field}' is required")
+        values[field] = _number(data[field], field, whole=cast is int)
+
+    # Optional device timestamp, else time of receipt
+    if data.get('timestamp') is not None:
+        timestamp = parse_datetime(str(data['timestamp']))
+        if timestamp is None:
+            raise ValueError("'timestamp' must be an ISO 8601 date/time")
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+        values['timestamp'] = timestamp
+
+    return WearableData(**values)
+
+
+def publish_reading(reading):
+    """Push a "reading" event to /api/stream/ subscribers (not athlete-linked)."""
+    if bus.has_subscribers():
+        bus.publish('reading', {
+            'heart_rate': reading.heart_rate,
+            'fatigue_level': reading.fatigue_level,
+            'sleep_hours': reading.sleep_hours,
+            'steps': reading.steps,
+            'timestamp': reading.timestamp,
+        })
 
 @csrf_exempt
 def upload_data(request):
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
-            entry = WearableData.objects.create(
-                heart_rate=data['heart_rate'],
-                fatigue_level=data['fatigue_level'],
-                sleep_hours=data['sleep_hours'],
-                steps=data['steps']
-            )
+            # Coerced values, so the slot and the event carry numbers
+            entry = parse_reading(data)
+            entry.save()
+            latest_reading.offer(entry)
+            publish_reading(entry)
             return JsonResponse({'status': 'success', 'id': entry.id})
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=400)
 
 def latest_data(request):
-    latest = WearableData.objects.last()
+    # Served from this process's slot; one indexed lookup when it is cold
+    latest = latest_reading.get()
+    if latest is None:
+        latest = WearableData.objects.order_by('-timestamp', '-id').first()
+        if latest:
+            latest_reading.offer(latest)
     if latest:
         return JsonResponse({
             'heart_rate': latest.heart_rate,
@@ -30,3 +112,94 @@ def latest_data(request):
             'timestamp': latest.timestamp
         })
     return JsonResponse({'error': 'No data found'}, status=404)
+
+
+@csrf_exempt
+@require_POST
+def upload_stream(request):
+    """
+    NDJSON upload: one reading per line, parsed as the body streams in.
+    Valid readings go to the write-behind queue; bad lines are counted and
+    reported by line number. Returns 202 since rows are stored shortly after.
+    """
+    accepted, errors = 0, []
+    batch = []
+    for line_no, line in enumerate(request, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            reading = parse_reading(json.loads(line))
+        except RecursionError:
+            errors.append({'line': line_no, 'error': 'JSON nested too deeply'})
+            continue
+        except (TypeError, ValueError) as e:  # includes JSONDecodeError
+            errors.append({'line': line_no, 'error': str(e)})
+            continue
+        batch.append(reading)
+        if len(batch) >= write_queue.max_rows:
+            accepted += queue_readings(batch)
+            batch = []
+
+    accepted += queue_readings(batch)
+
+    return JsonResponse({
+        'accepted': accepted,
+        'rejected': len(errors),
+        'errors': errors[:MAX_REPORTED_ERRORS],
+    }, status=202 if accepted or not errors else 400)
+
+
+def queue_readings(readings):
+    """
+    Hand ``readings`` to the write-behind queue, then share them: the
+    latest slot and subscribers only see readings that were queued.
+    """
+    write_queue.extend(readings)
+    for reading in readings:
+        latest_reading.offer(reading)
+        publish_reading(reading)
+    return len(readings)
+
+
+@require_GET
+def queue_metrics(request):
+    """Write-behind queue counters, including rows dropped by failed flushes."""
+    return JsonResponse(write_queue.metrics())
+
+
+def series(request):
+    """
+    Heart rate / steps between ``from`` and ``to`` (ISO date/times; default
+    the last 24 hours) from the coarsest stored tier that resolves ``step``
+    seconds (default: about 300 points over the range).
+    """
+    try:
+        end = _parse_bound(request.GET.get('to')) or timezone.now()
+        start = _parse_bound(request.GET.get('from')) or end - timedelta(days=1)
+        step = float(request.GET['step']) if request.GET.get('step') else None
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    if step is not None and not (math.isfinite(step) and step > 0):
+        return JsonResponse({'error': "'step' must be a positive number of seconds"},
+                            status=400)
+    if start >= end:
+        return JsonResponse({'error': "'from' must be before 'to'"}, status=400)
+
+    tier, resolution, points = read_series(start, end, step)
+    return JsonResponse({
+        'tier': tier,
+        'resolution_seconds': resolution,
+        'from': start,
+        'to': end,
+        'points': points,
+    })
+
+
+def _parse_bound(value):
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(f"Invalid date/time: {value!r}")
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
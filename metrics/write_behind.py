@@ -0,0 +1,99 @@
+"""
+Write-behind buffer for high-rate inserts.
+
+Rows are queued in memory and written with one ``bulk_create`` when
+``max_rows`` are waiting (in the caller's thread) or ``max_delay_ms`` after
+the oldest queued row (from a worker thread), whichever comes first.
+Queued rows are acknowledged before they are stored, so a crash can lose
+up to one flush window of readings; rows lost to a failed flush are logged
+and counted in ``metrics()`` (served at /api/metrics/upload/queue/).
+"""
+import logging
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    def __init__(self, model, max_rows=500, max_delay_ms=1000):
+        self.model = model
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._pending = []
+        self._oldest = None  # monotonic time the oldest pending row arrived
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # one bulk_create at a time
+        self._worker = None
+
+        # Metrics
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+
+    def extend(self, instances):
+        """Queue unsaved model instances; flushes inline once the batch is full."""
+        if not instances:
+            return
+        with self._cond:
+            self._ensure_worker()
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.extend(instances)
+            full = len(self._pending) >= self.max_rows
+            self._cond.notify()
+        if full:
+            self.flush()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="metrics-write-behind", daemon=True)
+            self._worker.start()
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                self.model.objects.bulk_create(batch, batch_size=self.max_rows)
+            except Exception:
+                self.rows_failed += len(batch)
+                logger.exception(
+                    "Dropped %d acknowledged %s rows (%d dropped, %d written "
+                    "since start)", len(batch), self.model.__name__,
+                    self.rows_failed, self.rows_written)
+                return 0
+            self.flushes += 1
+            self.rows_written += len(batch)
+            return len(batch)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = self._oldest + self.max_delay
+                while self._pending and len(self._pending) < self.max_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self.flush()
+            close_old_connections()
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "max_rows": self.max_rows,
+                "max_delay_ms": self.max_delay * 1000,
+                "queued": len(self._pending),
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "rows_failed": self.rows_failed,
+            }
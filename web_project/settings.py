@@ -134,3 +134,55 @@ REST_FRAMEWORK = {
         'rest_framework.renderers.BrowsableAPIRenderer',
     ]
 }
+
+# Load and warm the injury model when a server starts (wsgi.py / asgi.py,
+# also used by runserver); never in management commands or tests
+INJURY_MODEL_WARMUP = True
+
+# "tensorflow" (injury_model.h5) or "numpy" (injury_model.npz, produced by
+# the export_numpy_model command)
+INJURY_MODEL_BACKEND = "tensorflow"
+
+# Micro-batching of concurrent /predict/ calls: flush after this many rows
+# or this many milliseconds, whichever comes first
+INJURY_BATCHING_ENABLED = True
+INJURY_BATCH_MAX_SIZE = 32
+INJURY_BATCH_WINDOW_MS = 2.0
+
+# Seconds a /predict/ caller waits for its micro-batch before a 503
+# (covers a cold model load on the batcher thread)
+INJURY_BATCH_TIMEOUT_SECONDS = 30
+
+# LRU cache of /predict/ results, keyed on rounded features + model and
+# workload versions
+INJURY_PREDICTION_CACHE_SIZE = 1024
+INJURY_PREDICTION_CACHE_TTL = 300  # seconds
+
+# Threads running inference for the async (ASGI) views
+INJURY_INFERENCE_WORKERS = 4
+
+# Write-behind batching of NDJSON wearable uploads (metrics app): flush
+# after this many rows or this many milliseconds, whichever comes first
+METRICS_FLUSH_ROWS = 500
+METRICS_FLUSH_INTERVAL_MS = 1000
+
+# WearableData retention (see metrics/rollups.py and compact_wearable_data):
+# raw readings and 1-minute buckets are dropped after these ages, hourly
+# buckets are kept. Late readings are folded in within the arrival window.
+METRICS_RAW_RETENTION_HOURS = 48
+METRICS_MINUTE_RETENTION_DAYS = 30
+METRICS_LATE_ARRIVAL_MINUTES = 10
+
+# Seconds /api/metrics/latest/ answers from the per-process slot before
+# re-reading the database (and seeing other workers' uploads)
+METRICS_LATEST_TTL_SECONDS = 2
+
+# Server-Sent Events (/api/stream/): events buffered per client before the
+# oldest are dropped, and seconds between keep-alive comments
+EVENT_STREAM_BUFFER = 100
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+
+# Injury model registry (see model_registry.py / publish_injury_model):
+# serving processes check the CURRENT pointer at most this often and
+# hot-swap to a newly activated version
+INJURY_MODEL_POLL_SECONDS = 5
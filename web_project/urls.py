@@ -21,4 +21,5 @@ urlpatterns = [
     path('admin/', admin.site.urls),
 
     path('api/', include('backend.tracker.urls')),
+    path('api/metrics/', include('metrics.urls')),
 ]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'web_project.settings')
 
 application = get_wsgi_application()
+
+# Load and warm the injury model before traffic arrives
+from backend.tracker.ml_predictor import warm_up  # noqa: E402
+
+warm_up()